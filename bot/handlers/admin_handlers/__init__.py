@@ -3,8 +3,10 @@ from aiogram import Router
 from .add_category import router as add_category_router
 from .add_product import router as add_product_router
 from .admin_access import router as access_router
+from .admin_broadcast import router as broadcast_router
 from .admin_catalog import router as catalog_router
 from .admin_common import router as admin_common_router
+from .admin_export import router as export_router
 from .admin_help import router as help_router
 from .admin_orders import router as orders_router
 from .admin_stats import router as stats_router
@@ -27,4 +29,6 @@ router.include_router(add_product_router)
 router.include_router(edit_product_router)
 router.include_router(delete_product_router)
 router.include_router(stats_router)
+router.include_router(export_router)
+router.include_router(broadcast_router)
 router.include_router(help_router)
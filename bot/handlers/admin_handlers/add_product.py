@@ -13,6 +13,7 @@ from bot.keyboards.admin.catalog_keyboards import (
 from bot.states.admin_states.product_states import AddProductStates
 from database.crud import create_product, get_category_by_name
 from database.models import Category
+from services.catalog_cache import invalidate_catalog
 
 from ...utils.admin_utils.catalog_utils import filter_or_change_pr_category
 from ...utils.common_utils import delete_request_and_user_message, format_price
@@ -246,6 +247,7 @@ async def confirm_create_product(callback: CallbackQuery, t, state: FSMContext,
         photo=data["photo"],
         is_active=True,
     )
+    invalidate_catalog()
     await callback.message.edit_text(
         t("add_product.messages.tovar-uspeshno-sozdan"),
         reply_markup=admin_ask_new_product(t),
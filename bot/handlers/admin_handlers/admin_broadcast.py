@@ -0,0 +1,89 @@
+from aiogram import F, Router
+from aiogram.fsm.context import FSMContext
+from aiogram.types import CallbackQuery, Message
+
+from bot.handlers.admin_handlers.admin_access import admin_only
+from bot.keyboards.admin.broadcast_kb import broadcast_confirm_kb, broadcast_progress_kb
+from bot.keyboards.admin.catalog_keyboards import back_menu
+from bot.states.admin_states.broadcast_states import BroadcastStates
+from bot.utils.common_utils import delete_request_and_user_message
+from database.crud import count_active_users
+from database.models import Broadcast
+from services.broadcast import broadcaster
+
+router = Router()
+
+
+@router.callback_query(F.data == "admin_broadcast")
+@admin_only
+async def start_broadcast(callback: CallbackQuery, state: FSMContext, t, **_):
+    """
+    Starts the FSM for a new broadcast: asks for the message text.
+    """
+    msg = await callback.message.edit_text(
+        t("broadcast.enter_text"), reply_markup=back_menu(t)
+    )
+    await state.update_data(main_message_id=msg.message_id)
+    await state.set_state(BroadcastStates.waiting_text)
+    await callback.answer()
+
+
+@router.message(BroadcastStates.waiting_text)
+@admin_only
+async def broadcast_text(message: Message, state: FSMContext, t, **_):
+    """
+    Saves the broadcast text and shows a preview with the number of recipients.
+    """
+    await delete_request_and_user_message(message, state)
+    if not message.text:
+        msg = await message.answer(t("broadcast.empty_text"), reply_markup=back_menu(t))
+        await state.update_data(main_message_id=msg.message_id)
+        return
+    text = message.html_text
+    count = await count_active_users()
+    msg = await message.answer(
+        t("broadcast.confirm").format(count=count, text=text),
+        reply_markup=broadcast_confirm_kb(t),
+    )
+    await state.update_data(main_message_id=msg.message_id, broadcast_text=text)
+    await state.set_state(BroadcastStates.confirming)
+
+
+@router.callback_query(F.data == "admin_broadcast_send", BroadcastStates.confirming)
+@admin_only
+async def broadcast_send(callback: CallbackQuery, state: FSMContext, t, loc, **_):
+    """
+    Creates the broadcast and starts sending in the background.
+    The preview message turns into a live progress report.
+    """
+    data = await state.get_data()
+    await state.clear()
+    broadcast = await Broadcast.create(
+        text=data["broadcast_text"],
+        admin_id=callback.from_user.id,
+        locale=loc,
+        report_chat_id=callback.message.chat.id,
+        report_message_id=callback.message.message_id,
+        total=await count_active_users(),
+    )
+    await callback.message.edit_text(
+        t("broadcast.started").format(id=broadcast.id, total=broadcast.total),
+        reply_markup=broadcast_progress_kb(broadcast.id, t),
+    )
+    broadcaster.start(broadcast.id)
+    await callback.answer()
+
+
+@router.callback_query(F.data.startswith("admin_broadcast_stop:"))
+@admin_only
+async def broadcast_stop(callback: CallbackQuery, t, **_):
+    """
+    Stops a running broadcast after the current batch.
+    """
+    broadcast_id = int(callback.data.split(":")[1])
+    stopped = await Broadcast.filter(id=broadcast_id, status="running").update(
+        status="cancelled"
+    )
+    await callback.answer(
+        t("broadcast.stopped") if stopped else t("broadcast.already_finished")
+    )
@@ -0,0 +1,175 @@
+from datetime import datetime, timedelta
+from tempfile import SpooledTemporaryFile
+
+from aiogram import F, Router
+from aiogram.fsm.context import FSMContext
+from aiogram.types import CallbackQuery, Message
+from tortoise.timezone import now
+
+from bot.handlers.admin_handlers.admin_access import admin_only
+from bot.keyboards.admin.catalog_keyboards import back_menu
+from bot.keyboards.admin.stats_kb import (
+    STATS_PERIODS,
+    export_datasets_kb,
+    export_formats_kb,
+    export_periods_kb,
+)
+from bot.states.admin_states.export_states import ExportStates
+from bot.utils.admin_utils.export_utils import (
+    EXPORT_DATASETS,
+    EXPORT_FORMATS,
+    EXPORT_GZIP_THRESHOLD,
+    EXPORT_MEMORY_LIMIT,
+    SpooledInputFile,
+    gzip_spooled,
+    write_export,
+)
+from bot.utils.common_utils import (
+    RANGE_DATE_FORMAT,
+    delete_request_and_user_message,
+    parse_date_range,
+)
+
+router = Router()
+
+
+async def send_export(
+    message: Message,
+    dataset_key: str,
+    format_key: str,
+    date_from: datetime,
+    date_to: datetime,
+    t,
+) -> None:
+    """
+    Writes the export into a spooled temporary file and sends it as a document.
+    Large files are gzipped before sending.
+
+    :param date_to: End of the period (exclusive).
+    """
+    dataset = EXPORT_DATASETS[dataset_key]
+    export_format = EXPORT_FORMATS[format_key]
+    last_day = date_to - timedelta(microseconds=1)
+    file_name = (
+        f"{dataset_key}_{date_from:%Y%m%d}_{last_day:%Y%m%d}.{export_format.extension}"
+    )
+    with SpooledTemporaryFile(max_size=EXPORT_MEMORY_LIMIT) as file:
+        count = await write_export(file, dataset, export_format, date_from, date_to)
+        if not count:
+            await message.answer(t("export.empty"), reply_markup=back_menu(t))
+            return
+        caption = t("export.caption").format(
+            dataset=t(dataset.title_key),
+            count=count,
+            date_from=date_from.strftime(RANGE_DATE_FORMAT),
+            date_to=last_day.strftime(RANGE_DATE_FORMAT),
+        )
+        if file.tell() > EXPORT_GZIP_THRESHOLD:
+            with gzip_spooled(file) as compressed:
+                await message.answer_document(
+                    SpooledInputFile(compressed, filename=f"{file_name}.gz"),
+                    caption=caption,
+                )
+        else:
+            await message.answer_document(
+                SpooledInputFile(file, filename=file_name), caption=caption
+            )
+
+
+@router.callback_query(F.data == "admin_export_orders_csv")
+@admin_only
+async def export_orders_csv(callback: CallbackQuery, t, **_):
+    """
+    Quick export: orders for the last 30 days to CSV.
+    """
+    date_to = now()
+    await send_export(
+        callback.message,
+        "orders",
+        "csv",
+        date_to - timedelta(days=30),
+        date_to,
+        t,
+    )
+    await callback.answer()
+
+
+@router.callback_query(F.data == "admin_export")
+@admin_only
+async def export_menu(callback: CallbackQuery, state: FSMContext, t, **_):
+    """
+    Export step 1: choose what to export.
+    """
+    await state.clear()
+    await callback.message.edit_text(
+        t("export.choose_dataset"), reply_markup=export_datasets_kb(EXPORT_DATASETS, t)
+    )
+    await callback.answer()
+
+
+@router.callback_query(F.data.startswith("admin_export:"))
+@admin_only
+async def export_step(callback: CallbackQuery, state: FSMContext, t, **_):
+    """
+    Export steps 2-4: format, period and sending the file.
+    callback_data: admin_export:<dataset>[:<format>[:<days>|custom]].
+    """
+    parts = callback.data.split(":")[1:]
+    dataset_key = parts[0]
+    format_key = parts[1] if len(parts) > 1 else None
+    period = parts[2] if len(parts) > 2 else None
+    if dataset_key not in EXPORT_DATASETS or (
+        format_key is not None and format_key not in EXPORT_FORMATS
+    ):
+        await callback.answer()
+        return
+    if format_key is None:
+        await callback.message.edit_text(
+            t("export.choose_format"),
+            reply_markup=export_formats_kb(dataset_key, EXPORT_FORMATS, t),
+        )
+    elif period is None:
+        await callback.message.edit_text(
+            t("export.choose_period"),
+            reply_markup=export_periods_kb(dataset_key, format_key, t),
+        )
+    elif period == "custom":
+        msg = await callback.message.edit_text(
+            t("export.enter_range"), reply_markup=back_menu(t)
+        )
+        await state.update_data(
+            main_message_id=msg.message_id,
+            export_dataset=dataset_key,
+            export_format=format_key,
+        )
+        await state.set_state(ExportStates.waiting_range)
+    elif period.isdigit() and int(period) in STATS_PERIODS:
+        date_to = now()
+        await send_export(
+            callback.message,
+            dataset_key,
+            format_key,
+            date_to - timedelta(days=int(period)),
+            date_to,
+            t,
+        )
+    await callback.answer()
+
+
+@router.message(ExportStates.waiting_range)
+@admin_only
+async def export_custom_range(message: Message, state: FSMContext, t, **_):
+    """
+    Export with a custom date range entered by the admin.
+    """
+    await delete_request_and_user_message(message, state)
+    date_range = parse_date_range(message.text or "")
+    if date_range is None:
+        msg = await message.answer(t("export.bad_range"), reply_markup=back_menu(t))
+        await state.update_data(main_message_id=msg.message_id)
+        return
+    data = await state.get_data()
+    await state.clear()
+    await send_export(
+        message, data["export_dataset"], data["export_format"], *date_range, t
+    )
@@ -1,13 +1,18 @@
 from aiogram import F, Router
 from aiogram.fsm.context import FSMContext
+from aiogram.methods import SendMessage
 from aiogram.types import CallbackQuery
 
 from bot.keyboards.admin.order_keyboards import status_keyboard
-from database.crud import get_order_by_id
+from database.crud import get_order_by_id, update_order_status
 from database.models import Order
+from services.outbound import outbound
 
 from ...utils.admin_utils.order_utils import admin_show_order_summary, show_orders
-from ...utils.common_utils import get_order_status_label
+from ...utils.common_utils import (
+    get_cancelled_status_labels,
+    get_order_status_label,
+)
 from .admin_access import admin_only
 
 router = Router()
@@ -79,9 +84,12 @@ async def change_order_status_menu(callback: CallbackQuery, state: FSMContext, t
 
 @router.callback_query(F.data.startswith("admin_order_set_status:"))
 @admin_only
-async def set_order_status(callback: CallbackQuery, t, state: FSMContext, **_):
+async def set_order_status(
+    callback: CallbackQuery, t, state: FSMContext, translator, **_
+):
     """
     Saves the selected order status, notifies the customer, and returns to the order details.
+    Cancelling an order removes it from the daily sales rollup, un-cancelling returns it.
     """
     _, order_id, new_status = callback.data.split(":")
     order_id = int(order_id)
@@ -92,13 +100,17 @@ async def set_order_status(callback: CallbackQuery, t, state: FSMContext, **_):
         )
         return
     status_label = get_order_status_label(new_status, t)
-    await order.update_from_dict({"status": status_label}).save()
-    try:
-        text = t("admin_orders.misc.soobschenie-dlya-polzovatelya-vash").format(
-            id=order.id, status_label=status_label
-        )
-        await callback.bot.send_message(chat_id=order.user.id, text=text)
-    except Exception as e:
-        print(f"[OrderNotify] Не удалось отправить клиенту: {e}")
+    was_cancelled = order.status in get_cancelled_status_labels(translator)
+    is_cancelled = new_status == "cancelled"
+    rollup_sign = 0
+    if is_cancelled and not was_cancelled:
+        rollup_sign = -1
+    elif was_cancelled and not is_cancelled:
+        rollup_sign = 1
+    await update_order_status(order, status_label, rollup_sign)
+    text = t("admin_orders.misc.soobschenie-dlya-polzovatelya-vash").format(
+        id=order.id, status_label=status_label
+    )
+    outbound.submit_nowait(SendMessage(chat_id=order.user.id, text=text))
     await admin_show_order_summary(callback, state, order, order_id, t)
     await callback.answer(t("admin_orders.messages.status-zakaza-izmenen-klient"))
@@ -9,6 +9,7 @@ from bot.keyboards.admin.catalog_keyboards import (
 )
 from bot.utils.common_utils import delete_request_and_user_message
 from database.models import Product
+from services.catalog_cache import invalidate_catalog
 
 router = Router()
 
@@ -37,6 +38,7 @@ async def delete_product_execute(callback: CallbackQuery, t, **_):
     """
     product_id = int(callback.data.split(":")[1])
     await Product.filter(id=product_id).update(is_active=False)
+    invalidate_catalog()
     await callback.message.edit_text(
         t("delete_product.messages.tovar-udalen"),
         reply_markup=admin_catalog_menu_keyboard(t),
@@ -53,4 +55,5 @@ async def restore_product_confirm(callback: CallbackQuery, t, **_):
     product_id = int(callback.data.split(":")[1])
     await callback.answer(t("product.restored"), show_alert=True)
     await Product.filter(id=product_id).update(is_active=True)
+    invalidate_catalog()
     await callback.answer()
@@ -4,6 +4,7 @@ from aiogram.types import CallbackQuery, Message
 
 from database.crud import update_category
 from database.models import Category, Product
+from services.catalog_cache import invalidate_catalog
 
 from ...keyboards.admin.catalog_keyboards import (
     back_menu,
@@ -72,6 +73,7 @@ async def rename_category_process(message: Message, t, state: FSMContext, **_):
         await state.update_data(main_message_id=msg.message_id)
         return
     await update_category(cat_id, new_name)
+    invalidate_catalog()
     msg = await message.answer(
         t("edit_category.rename-category").format(new_name=new_name),
         reply_markup=back_menu(t),
@@ -109,6 +111,7 @@ async def delete_category_execute(callback: CallbackQuery, t, **_):
     """
     cat_id = int(callback.data.split(":")[1])
     await Category.filter(id=cat_id).delete()
+    invalidate_catalog()
     await callback.message.edit_text(
         t("edit_category.messages.kategoriya-udalena"), reply_markup=back_menu(t)
     )
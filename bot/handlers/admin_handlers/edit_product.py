@@ -10,6 +10,7 @@ from bot.keyboards.admin.catalog_keyboards import (
 )
 from database.crud import get_all_categories, get_product_by_id, update_product
 from database.models import Category
+from services.catalog_cache import invalidate_catalog
 
 from ...states.admin_states.product_states import EditProductStates
 from ...utils.common_utils import delete_request_and_user_message, format_price
@@ -193,6 +194,7 @@ async def save_product_edits(callback: CallbackQuery, t, state: FSMContext, **_)
         edit_fields["category"] = category_obj
         del edit_fields["category_id"]
     await update_product(product_id, **edit_fields)
+    invalidate_catalog()
     msg = await callback.message.answer(
         t("edit_product.messages.izmeneniya-uspeshno-sohraneny"),
         reply_markup=admin_catalog_menu_keyboard(t),
@@ -6,12 +6,17 @@ from bot.handlers.admin_handlers.admin_access import admin_only
 from bot.keyboards.admin.catalog_keyboards import back_menu
 from bot.keyboards.admin.order_keyboards import show_orders_for_search
 from bot.states.admin_states.order_states import OrderSearchStates
-from bot.utils.admin_utils.order_utils import admin_show_order_summary
+from bot.utils.admin_utils.order_utils import (
+    admin_show_order_summary,
+    parse_order_query,
+)
 from bot.utils.common_utils import delete_request_and_user_message
-from database.models import Order, User
+from database.crud import search_orders
 
 router = Router()
 
+SEARCH_PAGE_SIZE = 10
+
 
 @router.callback_query(F.data == "admin_search_order")
 @admin_only
@@ -31,40 +36,66 @@ async def start_search_order(callback: CallbackQuery, state: FSMContext, t, **_)
 @admin_only
 async def search_order_query(message: Message, state: FSMContext, t, **_):
     """
-    Searches for an order by ID, name, or phone number.
+    Searches for orders by ID, name or phone from the order and/or a date range.
     """
     await delete_request_and_user_message(message, state)
-    query = message.text.strip()
-    orders = []
-    if query.isdigit():
-        order = await Order.get_or_none(id=int(query))
-        if order:
-            orders = [order]
-    if not orders:
-        users = await User.filter(full_name__icontains=query).all()
-        if users:
-            user_ids = [u.id for u in users]
-            orders = await Order.filter(user_id__in=user_ids).all()
-    if not orders and query.replace("+", "").isdigit():
-        users = await User.filter(phone__icontains=query).all()
-        if users:
-            user_ids = [u.id for u in users]
-            orders = await Order.filter(user_id__in=user_ids).all()
+    query = (message.text or "").strip()
+    criteria = parse_order_query(query)
+    orders, total = (
+        await search_orders(**criteria, page_size=SEARCH_PAGE_SIZE)
+        if criteria
+        else ([], 0)
+    )
     if not orders:
         await message.answer(
-            t('search_product.messages.nichego-ne-najdeno-poprobujte"'),
+            t("search_product.messages.nichego-ne-najdeno-poprobujte"),
             reply_markup=back_menu(t),
         )
         await state.clear()
         return
-    if len(orders) == 1:
+    if total == 1:
         order = orders[0]
         await admin_show_order_summary(message, state, order, order.id, t)
         await state.clear()
     else:
         msg = await message.answer(
-            t("search_order.naydeno-zakazov").format(orders=len(orders)),
-            reply_markup=show_orders_for_search(orders, t),
+            t("search_order.naydeno-zakazov").format(orders=total),
+            reply_markup=show_orders_for_search(
+                orders, t, has_next=total > SEARCH_PAGE_SIZE
+            ),
         )
-        await state.update_data(main_message_id=msg.message_id)
         await state.clear()
+        # запрос нужен для перелистывания страниц результатов
+        await state.update_data(main_message_id=msg.message_id, order_query=query)
+
+
+@router.callback_query(F.data.startswith("admin_order_search_page:"))
+@admin_only
+async def search_order_page(callback: CallbackQuery, state: FSMContext, t, **_):
+    """
+    Paginates through order search results.
+    """
+    page = int(callback.data.split(":")[1])
+    criteria = parse_order_query((await state.get_data()).get("order_query") or "")
+    orders, total = (
+        await search_orders(**criteria, page=page, page_size=SEARCH_PAGE_SIZE)
+        if criteria
+        else ([], 0)
+    )
+    if not orders:
+        await callback.answer(
+            t("search_product.messages.nichego-ne-najdeno-poprobujte"),
+            show_alert=True,
+        )
+        return
+    await callback.message.edit_text(
+        t("search_order.naydeno-zakazov").format(orders=total),
+        reply_markup=show_orders_for_search(
+            orders,
+            t,
+            page=page,
+            has_next=page * SEARCH_PAGE_SIZE < total,
+            has_prev=page > 1,
+        ),
+    )
+    await callback.answer()
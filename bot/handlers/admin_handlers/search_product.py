@@ -2,6 +2,7 @@ from aiogram import F, Router
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, Message
 
+from database.crud import search_products
 from database.models import Product
 
 from ...keyboards.admin.catalog_keyboards import (
@@ -16,6 +17,8 @@ from .admin_access import admin_only
 
 router = Router()
 
+SEARCH_PAGE_SIZE = 10
+
 
 @router.callback_query(F.data == "admin_search_product")
 @admin_only
@@ -41,8 +44,9 @@ async def search_product_query(message: Message, t, state: FSMContext, **_):
     query = message.text.strip()
     if query.isdigit():
         products = await Product.filter(id=int(query)).all()
+        total = len(products)
     else:
-        products = await Product.filter(name__icontains=query).all()
+        products, total = await search_products(query, 1, SEARCH_PAGE_SIZE)
     if not products:
         msg = await message.answer(
             t("search_product.messages.nichego-ne-najdeno-poprobujte"),
@@ -51,7 +55,7 @@ async def search_product_query(message: Message, t, state: FSMContext, **_):
         await state.update_data(main_message_id=msg.message_id)
         await state.clear()
         return
-    if len(products) == 1:
+    if total == 1:
         product = products[0]
         await product.fetch_related("category")
         product_name = product.name
@@ -82,7 +86,41 @@ async def search_product_query(message: Message, t, state: FSMContext, **_):
         await state.clear()
     else:
         await message.answer(
-            t("search_order.naydeno-tovarov").format(products=len(products)),
-            reply_markup=show_products_for_search(products, t),
+            t("search_order.naydeno-tovarov").format(products=total),
+            reply_markup=show_products_for_search(
+                products, t, has_next=total > SEARCH_PAGE_SIZE
+            ),
         )
         await state.clear()
+        # запрос нужен для перелистывания страниц результатов
+        await state.update_data(search_query=query)
+
+
+@router.callback_query(F.data.startswith("admin_search_page:"))
+@admin_only
+async def search_product_page(callback: CallbackQuery, t, state: FSMContext, **_):
+    """
+    Paginates through product search results.
+    """
+    page = int(callback.data.split(":")[1])
+    query = (await state.get_data()).get("search_query")
+    products, total = (
+        await search_products(query, page, SEARCH_PAGE_SIZE) if query else ([], 0)
+    )
+    if not products:
+        await callback.answer(
+            t("search_product.messages.nichego-ne-najdeno-poprobujte"),
+            show_alert=True,
+        )
+        return
+    await callback.message.edit_text(
+        t("search_order.naydeno-tovarov").format(products=total),
+        reply_markup=show_products_for_search(
+            products,
+            t,
+            page=page,
+            has_next=page * SEARCH_PAGE_SIZE < total,
+            has_prev=page > 1,
+        ),
+    )
+    await callback.answer()
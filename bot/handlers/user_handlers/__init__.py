@@ -8,10 +8,12 @@ from .user_help import router as help_router
 from .user_menu import router as menu_router
 from .user_orders import router as orders_router
 from .user_profile import router as profile_router
+from .user_search import router as search_router
 
 router = Router()
 router.include_router(common_router)
 router.include_router(catalog_router)
+router.include_router(search_router)
 router.include_router(cart_router)
 router.include_router(orders_router)
 router.include_router(checkout_router)
@@ -1,5 +1,3 @@
-import asyncio
-
 from aiogram import F, Router
 from aiogram.exceptions import TelegramBadRequest
 from aiogram.fsm.context import FSMContext
@@ -10,13 +8,8 @@ from bot.keyboards.user.user_main_menu import main_menu
 from bot.utils.common_utils import delete_request_and_user_message
 from bot.utils.user_utils.user_cart_utils import build_cart_view
 from config_data.bot_instance import bot
-from database.crud import (
-    add_to_cart,
-    clear_cart,
-    get_all_products,
-    get_cart,
-    remove_from_cart,
-)
+from database.crud import add_to_cart_atomic, clear_cart, get_cart, remove_from_cart
+from services.ephemeral import send_ephemeral
 
 router = Router()
 
@@ -72,17 +65,14 @@ async def add_to_cart_handler(callback: CallbackQuery, t, **_) -> None:
     """
     user_id = callback.from_user.id
     product_id = int(callback.data.split("_")[1])
-    products = await get_all_products()
-    product = next((p for p in products if p.id == product_id), None)
-    if not product:
-        await callback.answer(t("user_cart.messages.tovar-ne-najden"), show_alert=True)
+    if not await add_to_cart_atomic(user_id, product_id, 1):
+        await callback.answer(
+            t("user_cart.messages.tovar-nedostupen-ili-zakonchilsya"), show_alert=True
+        )
         return
-    await add_to_cart(user_id, product_id, 1)
-    sent_message = await bot.send_message(
-        user_id, t("user_cart.messages.tovar-dobavlen-v-korzinu")
-    )
-    await asyncio.sleep(1)
-    await bot.delete_message(user_id, sent_message.message_id)
+    text = t("user_cart.messages.tovar-dobavlen-v-korzinu")
+    await callback.answer(text)
+    send_ephemeral(user_id, text)
 
 
 @router.callback_query(F.data.startswith("removefromcart_"))
@@ -107,11 +97,9 @@ async def remove_from_cart_handler(callback: CallbackQuery, t, **_) -> None:
             pass
         else:
             raise
-    sent_message = await bot.send_message(
-        user_id, t("user_cart.messages.tovar-udalen-iz-korziny")
-    )
-    await asyncio.sleep(1)
-    await bot.delete_message(user_id, sent_message.message_id)
+    text = t("user_cart.messages.tovar-udalen-iz-korziny")
+    await callback.answer(text)
+    send_ephemeral(user_id, text)
 
 
 @router.callback_query(F.data == "clear_cart")
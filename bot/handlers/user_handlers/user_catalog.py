@@ -8,13 +8,10 @@ from bot.keyboards.user.user_catalog_keyboards import (
     show_product_info_kb,
 )
 from bot.keyboards.user.user_main_menu import main_menu
-from bot.utils.common_utils import (
-    delete_request_and_user_message,
-    format_price,
-    paginate,
-)
-from database.crud import get_all_products
+from bot.utils.common_utils import delete_request_and_user_message, format_price
+from database.crud import get_products_by_category_keyset
 from database.models import Product
+from services.catalog_cache import get_catalog, get_category_count
 
 router = Router()
 PAGE_SIZE = 5
@@ -24,8 +21,8 @@ async def show_categories(callback: CallbackQuery, t, **_) -> None:
     """
     Displays the list of product categories.
     """
-    products = await get_all_products()
-    categories = sorted({p.category.name for p in products if p.category is not None})
+    catalog = await get_catalog()
+    categories = catalog.categories
     if not categories:
         await callback.message.answer(
             t("user_catalog.messages.kategorii-ne-najdeny"), reply_markup=main_menu(t)
@@ -42,29 +39,49 @@ async def show_products_in_category(
     callback: CallbackQuery, t, state: FSMContext, **_
 ) -> None:
     """
-    Displays products of the selected category with pagination.
+    Displays products of the selected category with keyset pagination.
+    callback_data: category_<category_id>[_<page>[_<cursor>]].
     """
     await delete_request_and_user_message(callback.message, state)
-    data = callback.data.split("_", 2)
-    category_name = data[1]
-    page = int(data[2]) if len(data) > 2 else 0
-    all_products = await get_all_products()
-    category_products = [
-        p for p in all_products if p.category and p.category.name == category_name
-    ]
-    if not category_products:
+    data = callback.data.split("_")
+    try:
+        category_id = int(data[1])
+        page = int(data[2]) if len(data) > 2 else 0
+        cursor = data[3] if len(data) > 3 else ""
+        cursor_id = int(cursor[1:]) if cursor else None
+    except ValueError:
+        await callback.answer(
+            t("user_catalog.messages.nekorrektnyj-tovar"), show_alert=True
+        )
+        return
+    catalog = await get_catalog()
+    category = catalog.category_by_id.get(category_id)
+    total = await get_category_count(category_id) if category else 0
+    page_products = []
+    if total:
+        page_products = await get_products_by_category_keyset(
+            category_id,
+            after_id=cursor_id if cursor.startswith("a") else None,
+            before_id=cursor_id if cursor.startswith("b") else None,
+            page_size=PAGE_SIZE,
+        )
+        if page and len(page_products) < PAGE_SIZE and cursor.startswith("b"):
+            # каталог изменился между нажатиями — начинаем с первой страницы
+            page_products = []
+        if not page_products and page:
+            page = 0
+            page_products = await get_products_by_category_keyset(
+                category_id, page_size=PAGE_SIZE
+            )
+    if not page_products:
         await callback.message.edit_text(
             t("user_catalog.messages.v-etoj-kategorii-poka"), reply_markup=main_menu(t)
         )
         await callback.answer()
         return
-    page_products, total_pages, current_page = paginate(
-        category_products, page, PAGE_SIZE
-    )
-    text = t("category.header").format(category_name=category_name)
-    markup = products_keyboard(
-        page_products, category_name, current_page, total_pages, t
-    )
+    total_pages = (total + PAGE_SIZE - 1) // PAGE_SIZE
+    text = t("category.header").format(category_name=category.name)
+    markup = products_keyboard(page_products, category_id, page, total_pages, t)
     msg = await callback.message.answer(text, reply_markup=markup)
     await state.update_data(main_message_id=msg.message_id)
     await callback.answer()
@@ -80,8 +97,9 @@ async def show_product_info(callback: CallbackQuery, t, **_):
         parts = callback.data.split("_")
         product_id = int(parts[1])
         source = parts[2]
-        category_name = parts[3] if len(parts) > 3 else None
+        category_id = parts[3] if len(parts) > 3 else None
         page = parts[4] if len(parts) > 4 else 0
+        cursor = parts[5] if len(parts) > 5 else None
     except (IndexError, ValueError):
         await callback.answer(
             t("user_catalog.messages.nekorrektnyj-tovar"), show_alert=True
@@ -102,7 +120,7 @@ async def show_product_info(callback: CallbackQuery, t, **_):
         currency=t("currency"),
         description=product.description or t("product.card.no_description"),
     )
-    kb = show_product_info_kb(product.id, source, t, category_name, page)
+    kb = show_product_info_kb(product.id, source, t, category_id, page, cursor)
 
     if product.photo:
         await callback.message.delete()
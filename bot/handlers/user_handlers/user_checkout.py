@@ -32,12 +32,18 @@ from bot.utils.user_utils.user_common_utils import (
     send_step_and_cleanup,
     start_manual_checkout,
 )
-from bot.utils.user_utils.user_orders_utils import show_order_summary
+from bot.utils.user_utils.user_orders_utils import (
+    format_stock_error,
+    show_order_summary,
+)
+from config_data.env import STOCK_RESERVATION_MINUTES
 from database.crud import (
+    InsufficientStockError,
     create_order,
     create_user_profile,
     get_cart,
     get_or_create_user_profile,
+    release_reservations,
 )
 
 router = Router()
@@ -457,17 +463,26 @@ async def order_confirm_handler(callback: CallbackQuery, t, state: FSMContext, *
     user_id = callback.from_user.id
     data = await state.get_data()
     bot = callback.bot
-    order = await create_order(
-        user_id=user_id,
-        name=data.get("name"),
-        phone=data.get("phone"),
-        status=t("order.status.in_progress"),
-        payment_method=data.get("payment_method"),
-        delivery_method=data.get("delivery_method"),
-        address=data.get("address"),
-        comment=data.get("comment"),
-    )
-    await notify_admin_about_new_order(bot, order, t)
+    try:
+        order = await create_order(
+            user_id=user_id,
+            name=data.get("name"),
+            phone=data.get("phone"),
+            status=t("order.status.in_progress"),
+            payment_method=data.get("payment_method"),
+            delivery_method=data.get("delivery_method"),
+            address=data.get("address"),
+            comment=data.get("comment"),
+        )
+    except InsufficientStockError as e:
+        await callback.message.answer(
+            format_stock_error(e, t), reply_markup=cart_back_menu(t)
+        )
+        await state.clear()
+        await callback.answer()
+        return
+    if order:
+        await notify_admin_about_new_order(bot, order, t)
     user = await get_or_create_user_profile(user_id)
     if not user:
         await create_user_profile(
@@ -495,8 +510,10 @@ async def order_confirm_handler(callback: CallbackQuery, t, state: FSMContext, *
 async def cancel_order(callback: CallbackQuery, t, state: FSMContext, **_):
     """
     Handles order cancellation.
-    Clears the FSM state and notifies the user.
+    Releases stock reservations, clears the FSM state and notifies the user.
     """
+    if STOCK_RESERVATION_MINUTES > 0:
+        await release_reservations(callback.from_user.id)
     await callback.message.edit_text(
         t("user_checkout.messages.oformlenie-zakaza-otmeneno"),
         reply_markup=cart_back_menu(t),
@@ -1,8 +1,10 @@
 from aiogram import F, Router
+from aiogram.enums import ChatMemberStatus
 from aiogram.fsm.context import FSMContext
-from aiogram.types import Message
+from aiogram.types import ChatMemberUpdated, Message
 
 from bot.keyboards.user.user_main_menu import main_menu
+from database.crud import activate_user, deactivate_users
 
 router = Router()
 
@@ -13,7 +15,21 @@ async def start_cmd(message: Message, t, state: FSMContext, **_):
     Handler for the /start command — displays the inline main menu.
     """
     await state.clear()
+    await activate_user(message.from_user.id)
     await message.answer(
         t("user_common.messages.b-dobro-pozhalovat-v-magazin-b"),
         reply_markup=main_menu(t),
     )
+
+
+@router.my_chat_member(F.chat.type == "private")
+async def bot_blocked_or_unblocked(event: ChatMemberUpdated, **_):
+    """
+    Tracks users who block (kicked) and unblock (member) the bot,
+    so broadcasts skip only those who block it right now.
+    """
+    status = event.new_chat_member.status
+    if status == ChatMemberStatus.KICKED:
+        await deactivate_users([event.from_user.id])
+    elif status == ChatMemberStatus.MEMBER:
+        await activate_user(event.from_user.id)
@@ -0,0 +1,173 @@
+import html
+
+from aiogram import F, Router
+from aiogram.filters import CommandObject, CommandStart
+from aiogram.fsm.context import FSMContext
+from aiogram.types import (
+    CallbackQuery,
+    InlineQuery,
+    InlineQueryResultArticle,
+    InputTextMessageContent,
+    Message,
+)
+from aiogram.utils.deep_linking import create_start_link
+
+from bot.keyboards.user.user_catalog_keyboards import (
+    inline_product_kb,
+    search_results_keyboard,
+    show_product_info_kb,
+)
+from bot.keyboards.user.user_main_menu import main_menu
+from bot.states.user_states.search_states import SearchStates
+from bot.utils.common_utils import delete_request_and_user_message, format_price
+from database.crud import activate_user
+from services.catalog_cache import get_catalog
+from services.product_index import search_catalog
+
+router = Router()
+PAGE_SIZE = 5
+INLINE_PAGE_SIZE = 20
+# Результаты зависят от языка пользователя, поэтому is_personal=True;
+# после правок каталога клиенты увидят изменения не позже чем через столько секунд
+INLINE_CACHE_TIME = 30
+
+
+def product_caption(product, t) -> str:
+    return t("product.card.caption").format(
+        name=product.name,
+        price=format_price(product.price),
+        currency=t("currency"),
+        description=product.description or t("product.card.no_description"),
+    )
+
+
+@router.callback_query(F.data == "user_search")
+async def start_search(callback: CallbackQuery, t, state: FSMContext, **_):
+    """
+    Starts the FSM for customer product search.
+    """
+    msg = await callback.message.answer(t("user_search.messages.vvedite-zapros"))
+    await state.update_data(main_message_id=msg.message_id)
+    await state.set_state(SearchStates.waiting_query)
+    await callback.answer()
+
+
+async def show_search_page(message: Message, query: str, offset: int, t, edit: bool):
+    products, next_offset, total = await search_catalog(query, offset, PAGE_SIZE)
+    if not products:
+        return None
+    # сообщения уходят с parse_mode=HTML — текст пользователя экранируем
+    text = t("user_search.messages.najdeno").format(
+        query=html.escape(query), count=total
+    )
+    markup = search_results_keyboard(products, offset, next_offset, PAGE_SIZE, t)
+    if edit:
+        return await message.edit_text(text, reply_markup=markup)
+    return await message.answer(text, reply_markup=markup)
+
+
+@router.message(SearchStates.waiting_query)
+async def search_query(message: Message, t, state: FSMContext, **_):
+    """
+    Shows the first page of search results for the entered text.
+    """
+    await delete_request_and_user_message(message, state)
+    query = (message.text or "").strip()
+    msg = await show_search_page(message, query, 0, t, edit=False) if query else None
+    if msg is None:
+        msg = await message.answer(
+            t("user_search.messages.nichego-ne-najdeno"), reply_markup=main_menu(t)
+        )
+        await state.update_data(main_message_id=msg.message_id)
+        return
+    await state.set_state(None)
+    # запрос нужен для перелистывания страниц результатов
+    await state.update_data(main_message_id=msg.message_id, search_query=query)
+
+
+@router.callback_query(F.data.startswith("search_"))
+async def search_page(callback: CallbackQuery, t, state: FSMContext, **_):
+    """
+    Paginates through search results.
+    callback_data: search_<offset>.
+    """
+    offset = int(callback.data.split("_")[1])
+    query = (await state.get_data()).get("search_query")
+    msg = (
+        await show_search_page(callback.message, query, offset, t, edit=True)
+        if query
+        else None
+    )
+    if msg is None:
+        await callback.answer(
+            t("user_search.messages.nichego-ne-najdeno"), show_alert=True
+        )
+        return
+    await callback.answer()
+
+
+@router.inline_query()
+async def inline_search(inline_query: InlineQuery, t, **_):
+    """
+    Inline mode: @bot <query> in any chat. Results are paged with next_offset.
+    """
+    try:
+        offset = int(inline_query.offset or 0)
+    except ValueError:
+        offset = 0
+    query = inline_query.query.strip()
+    products, next_offset, _ = (
+        await search_catalog(query, offset, INLINE_PAGE_SIZE)
+        if query
+        else ([], None, 0)
+    )
+    results = [
+        InlineQueryResultArticle(
+            id=str(product.id),
+            title=product.name,
+            description=f"{format_price(product.price)} {t('currency')}",
+            input_message_content=InputTextMessageContent(
+                message_text=product_caption(product, t)
+            ),
+            reply_markup=inline_product_kb(
+                await create_start_link(inline_query.bot, f"p{product.id}"), t
+            ),
+        )
+        for product in products
+    ]
+    await inline_query.answer(
+        results,
+        cache_time=INLINE_CACHE_TIME,
+        is_personal=True,
+        next_offset=str(next_offset) if next_offset is not None else "",
+    )
+
+
+@router.message(CommandStart(deep_link=True))
+async def open_product_link(
+    message: Message, command: CommandObject, t, state: FSMContext, **_
+):
+    """
+    Opens a product card from a deep link (/start p<product_id>),
+    e.g. from a product shared via inline mode.
+    """
+    await state.clear()
+    await activate_user(message.from_user.id)
+    payload = command.args or ""
+    product_id = (
+        int(payload[1:]) if payload.startswith("p") and payload[1:].isdigit() else None
+    )
+    catalog = await get_catalog()
+    product = catalog.products_by_id.get(product_id)
+    if product is None:
+        await message.answer(
+            t("admin_catalog.messages.tovar-ne-najden"), reply_markup=main_menu(t)
+        )
+        return
+    kb = show_product_info_kb(product.id, "catalog", t, product.category_id, 0)
+    if product.photo:
+        await message.answer_photo(
+            product.photo, caption=product_caption(product, t), reply_markup=kb
+        )
+    else:
+        await message.answer(product_caption(product, t), reply_markup=kb)
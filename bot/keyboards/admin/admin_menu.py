@@ -21,6 +21,12 @@ def admin_main_menu(t, **_):
                     callback_data="admin_stats",
                 )
             ],
+            [
+                InlineKeyboardButton(
+                    text=t("admin_menu.buttons.rassylka"),
+                    callback_data="admin_broadcast",
+                )
+            ],
             [
                 InlineKeyboardButton(
                     text=t("admin_menu.buttons.pomosch"), callback_data="admin_help"
@@ -0,0 +1,44 @@
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+
+def broadcast_confirm_kb(t, **_) -> InlineKeyboardMarkup:
+    """
+    Broadcast preview keyboard: send or cancel.
+
+    :return: InlineKeyboardMarkup.
+    """
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(
+                    text=t("broadcast_kb.buttons.otpravit"),
+                    callback_data="admin_broadcast_send",
+                )
+            ],
+            [
+                InlineKeyboardButton(
+                    text=t("catalog_keyboards.buttons.nazad"),
+                    callback_data="/start_admin",
+                )
+            ],
+        ]
+    )
+
+
+def broadcast_progress_kb(broadcast_id: int, t, **_) -> InlineKeyboardMarkup:
+    """
+    Keyboard under the progress report of a running broadcast.
+
+    :param broadcast_id: Broadcast ID.
+    :return: InlineKeyboardMarkup.
+    """
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(
+                    text=t("broadcast_kb.buttons.ostanovit"),
+                    callback_data=f"admin_broadcast_stop:{broadcast_id}",
+                )
+            ]
+        ]
+    )
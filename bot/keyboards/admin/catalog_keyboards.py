@@ -195,7 +195,9 @@ def products_list_keyboard(
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
-def show_products_for_search(products, t) -> InlineKeyboardMarkup:
+def show_products_for_search(
+    products, t, page: int = 1, has_next: bool = False, has_prev: bool = False
+) -> InlineKeyboardMarkup:
     keyboard = [
         [
             InlineKeyboardButton(
@@ -205,6 +207,23 @@ def show_products_for_search(products, t) -> InlineKeyboardMarkup:
         ]
         for p in products
     ]
+    nav = []
+    if has_prev:
+        nav.append(
+            InlineKeyboardButton(
+                text=t("catalog_keyboards.buttons.nazad"),
+                callback_data=f"admin_search_page:{page - 1}",
+            )
+        )
+    if has_next:
+        nav.append(
+            InlineKeyboardButton(
+                text=t("catalog_keyboards.buttons.vpered"),
+                callback_data=f"admin_search_page:{page + 1}",
+            )
+        )
+    if nav:
+        keyboard.append(nav)
 
     keyboard.append(
         [
@@ -67,24 +67,53 @@ def orders_list_keyboard(
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
-def show_orders_for_search(orders, t) -> InlineKeyboardMarkup:
+def show_orders_for_search(
+    orders, t, page: int = 1, has_next: bool = False, has_prev: bool = False
+) -> InlineKeyboardMarkup:
     """
     Creates an inline keyboard for searching and selecting an order from the list.
 
-    :param orders: list of orders (Order), each must have attributes id, user.full_name, total_price.
+    :param orders: list of orders (Order), each must have attributes id, name, total_price.
+    :param page: current page of the search results
+    :param has_next: whether there is a next page
+    :param has_prev: whether there is a previous page
     :return: InlineKeyboardMarkup — keyboard for displaying found orders.
     """
-    return InlineKeyboardMarkup(
-        inline_keyboard=[
-            [
-                InlineKeyboardButton(
-                    text=f'id_#{o.id} | {o.name} | {format_price(o.total_price)} {t("currency")}',
-                    callback_data=f"admin_order_detail:{o.id}",
-                )
-            ]
-            for o in orders
+    buttons = [
+        [
+            InlineKeyboardButton(
+                text=f'id_#{o.id} | {o.name} | {format_price(o.total_price)} {t("currency")}',
+                callback_data=f"admin_order_detail:{o.id}",
+            )
+        ]
+        for o in orders
+    ]
+    nav = []
+    if has_prev:
+        nav.append(
+            InlineKeyboardButton(
+                text=t("catalog_keyboards.buttons.nazad"),
+                callback_data=f"admin_order_search_page:{page - 1}",
+            )
+        )
+    if has_next:
+        nav.append(
+            InlineKeyboardButton(
+                text=t("catalog_keyboards.buttons.vpered"),
+                callback_data=f"admin_order_search_page:{page + 1}",
+            )
+        )
+    if nav:
+        buttons.append(nav)
+    buttons.append(
+        [
+            InlineKeyboardButton(
+                text=t("order_keyboards.buttons.poisk-zakaza"),
+                callback_data="admin_search_order",
+            )
         ]
     )
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
 def change_order_status(t, **_):
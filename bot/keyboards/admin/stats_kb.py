@@ -1,15 +1,38 @@
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
+STATS_PERIODS = (7, 30, 90)
 
-def stats_actions(t, **_) -> InlineKeyboardMarkup:
+
+def stats_actions(t, days: int = 30, **_) -> InlineKeyboardMarkup:
+    """
+    Statistics keyboard: period selection and exports.
+
+    :param days: Currently selected period in days.
+    :return: InlineKeyboardMarkup.
+    """
+    periods_row = [
+        InlineKeyboardButton(
+            text=("• " if period == days else "")
+            + t("stats_kb.buttons.period").format(days=period),
+            callback_data=f"admin_stats:{period}",
+        )
+        for period in STATS_PERIODS
+    ]
     return InlineKeyboardMarkup(
         inline_keyboard=[
+            periods_row,
             [
                 InlineKeyboardButton(
                     text=t("stats_kb.buttons.vygruzit-zakazy-csv"),
                     callback_data="admin_export_orders_csv",
                 )
             ],
+            [
+                InlineKeyboardButton(
+                    text=t("stats_kb.buttons.eksport"),
+                    callback_data="admin_export",
+                )
+            ],
             [
                 InlineKeyboardButton(
                     text=t("catalog_keyboards.buttons.nazad"),
@@ -18,3 +41,76 @@ def stats_actions(t, **_) -> InlineKeyboardMarkup:
             ],
         ]
     )
+
+
+def _back_row(t, callback_data: str) -> list:
+    return [
+        InlineKeyboardButton(
+            text=t("catalog_keyboards.buttons.nazad"), callback_data=callback_data
+        )
+    ]
+
+
+def export_datasets_kb(datasets: dict, t, **_) -> InlineKeyboardMarkup:
+    """
+    Export step 1: dataset selection.
+
+    :param datasets: Dataset key -> ExportDataset.
+    :return: InlineKeyboardMarkup.
+    """
+    rows = [
+        [
+            InlineKeyboardButton(
+                text=t(dataset.title_key), callback_data=f"admin_export:{key}"
+            )
+        ]
+        for key, dataset in datasets.items()
+    ]
+    rows.append(_back_row(t, "admin_stats"))
+    return InlineKeyboardMarkup(inline_keyboard=rows)
+
+
+def export_formats_kb(dataset: str, formats: dict, t, **_) -> InlineKeyboardMarkup:
+    """
+    Export step 2: file format selection.
+
+    :param dataset: Selected dataset key.
+    :param formats: Format key -> format.
+    :return: InlineKeyboardMarkup.
+    """
+    row = [
+        InlineKeyboardButton(
+            text=key.upper(), callback_data=f"admin_export:{dataset}:{key}"
+        )
+        for key in formats
+    ]
+    return InlineKeyboardMarkup(inline_keyboard=[row, _back_row(t, "admin_export")])
+
+
+def export_periods_kb(dataset: str, fmt: str, t, **_) -> InlineKeyboardMarkup:
+    """
+    Export step 3: period selection (presets or a custom date range).
+
+    :param dataset: Selected dataset key.
+    :param fmt: Selected format key.
+    :return: InlineKeyboardMarkup.
+    """
+    prefix = f"admin_export:{dataset}:{fmt}"
+    row = [
+        InlineKeyboardButton(
+            text=t("stats_kb.buttons.period").format(days=period),
+            callback_data=f"{prefix}:{period}",
+        )
+        for period in STATS_PERIODS
+    ]
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            row,
+            [
+                InlineKeyboardButton(
+                    text=t("export.period_custom"), callback_data=f"{prefix}:custom"
+                )
+            ],
+            _back_row(t, f"admin_export:{dataset}"),
+        ]
+    )
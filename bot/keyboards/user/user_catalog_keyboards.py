@@ -3,17 +3,29 @@ from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from bot.utils.common_utils import format_price, format_product_name
 
 
-def show_categories_keyboard(categories: list[str], t, **_) -> InlineKeyboardMarkup:
+def show_categories_keyboard(categories: list, t, **_) -> InlineKeyboardMarkup:
     """
     Builds a keyboard for selecting a product category.
 
-    :param categories: List of category names.
+    :param categories: List of Category objects.
     :return: InlineKeyboardMarkup with a button for each category and a “Main Menu” button.
     """
     keyboard = [
-        [InlineKeyboardButton(text=cat, callback_data=f"category_{cat}")]
+        [InlineKeyboardButton(text=cat.name, callback_data=f"category_{cat.id}")]
         for cat in categories
     ]
+    keyboard.append(
+        [
+            InlineKeyboardButton(
+                text=t("user_catalog_keyboards.buttons.poisk"),
+                callback_data="user_search",
+            ),
+            InlineKeyboardButton(
+                text=t("user_catalog_keyboards.buttons.poisk-inline"),
+                switch_inline_query_current_chat="",
+            ),
+        ]
+    )
     keyboard.append(
         [
             InlineKeyboardButton(
@@ -26,19 +38,28 @@ def show_categories_keyboard(categories: list[str], t, **_) -> InlineKeyboardMar
 
 
 def show_product_info_kb(
-    product_id: int, source: str, t, category_name: str = None, page: int = None, **_
+    product_id: int,
+    source: str,
+    t,
+    category_id: int = None,
+    page: int = None,
+    cursor: str = None,
+    **_,
 ) -> InlineKeyboardMarkup:
     """
     Builds an inline keyboard for product details.
 
     :param product_id: Product ID.
     :param source: Source from which the product card was opened ('catalog' or 'cart').
-    :param category_name: Category name for return.
+    :param category_id: Category ID for return.
     :param page: Page number for return.
+    :param cursor: Keyset cursor of the page for return.
     :return: InlineKeyboardMarkup.
     """
     if source == "catalog":
-        back_callback = f"category_{category_name}_{page}"
+        back_callback = f"category_{category_id}_{page}"
+        if cursor:
+            back_callback += f"_{cursor}"
         kb = InlineKeyboardMarkup(
             inline_keyboard=[
                 [
@@ -77,13 +98,15 @@ def show_product_info_kb(
 
 
 def products_keyboard(
-    products: list[dict], category: str, page: int, total_pages: int, t, **_
+    products: list, category_id: int, page: int, total_pages: int, t, **_
 ) -> InlineKeyboardMarkup:
     """
-    Creates an inline keyboard for displaying products with pagination.
+    Creates an inline keyboard for displaying products with keyset pagination.
+    Navigation buttons carry a cursor: "a<id>" — products with id below <id>,
+    "b<id>" — products with id above <id>.
 
-    :param products: List of products on the current page.
-    :param category: Current category.
+    :param products: List of products on the current page (ordered by -id).
+    :param category_id: Current category ID.
     :param page: Current page number (from 0).
     :param total_pages: Total number of pages.
     :return: InlineKeyboardMarkup with products and navigation.
@@ -96,7 +119,8 @@ def products_keyboard(
     if page > 0:
         nav_row.append(
             InlineKeyboardButton(
-                text="⬅️", callback_data=f"category_{category}_{page - 1}"
+                text="⬅️",
+                callback_data=f"category_{category_id}_{page - 1}_b{products[0].id}",
             )
         )
 
@@ -105,15 +129,19 @@ def products_keyboard(
     if page < total_pages - 1:
         nav_row.append(
             InlineKeyboardButton(
-                text="➡️", callback_data=f"category_{category}_{page + 1}"
+                text="➡️",
+                callback_data=f"category_{category_id}_{page + 1}_a{products[-1].id}",
             )
         )
 
+    page_cursor = f"a{products[0].id + 1}" if products else ""
     rows = [
         [
             InlineKeyboardButton(
                 text=f"{format_product_name(product.name, 70)}",
-                callback_data=f"product_{product.id}_catalog_{category}_{page}",
+                callback_data=(
+                    f"product_{product.id}_catalog_{category_id}_{page}_{page_cursor}"
+                ),
             ),
             InlineKeyboardButton(
                 text=f"{format_price(product.price)} {t("currency")}",
@@ -153,3 +181,81 @@ def products_keyboard(
     rows.append(nav_row)
 
     return InlineKeyboardMarkup(inline_keyboard=rows)
+
+
+def search_results_keyboard(
+    products: list, offset: int, next_offset: int, page_size: int, t, **_
+) -> InlineKeyboardMarkup:
+    """
+    Creates an inline keyboard with customer search results.
+    Navigation buttons carry the offset of the page: search_<offset>.
+
+    :param products: Products on the current page in rank order.
+    :param offset: Offset of the current page.
+    :param next_offset: Offset of the next page or None on the last page.
+    :param page_size: Number of products per page.
+    :return: InlineKeyboardMarkup with products and navigation.
+    """
+    rows = [
+        [
+            InlineKeyboardButton(
+                text=f"{format_product_name(product.name, 70)}",
+                callback_data=f"product_{product.id}_catalog_{product.category_id}_0",
+            ),
+            InlineKeyboardButton(
+                text=f"{format_price(product.price)} {t("currency")}",
+                callback_data="noop",
+            ),
+            InlineKeyboardButton(
+                text=t("user_catalog_keyboards.buttons.v-korzinu"),
+                callback_data=f"addtocart_{product.id}",
+            ),
+        ]
+        for product in products
+    ]
+    nav_row = []
+    if offset > 0:
+        nav_row.append(
+            InlineKeyboardButton(
+                text="⬅️", callback_data=f"search_{max(offset - page_size, 0)}"
+            )
+        )
+    if next_offset is not None:
+        nav_row.append(
+            InlineKeyboardButton(text="➡️", callback_data=f"search_{next_offset}")
+        )
+    if nav_row:
+        rows.append(nav_row)
+    rows.append(
+        [
+            InlineKeyboardButton(
+                text=t("user_catalog_keyboards.buttons.poisk"),
+                callback_data="user_search",
+            )
+        ]
+    )
+    rows.append(
+        [
+            InlineKeyboardButton(
+                text=t("catalog_keyboards.buttons.nazad"), callback_data="menu_catalog"
+            )
+        ]
+    )
+    return InlineKeyboardMarkup(inline_keyboard=rows)
+
+
+def inline_product_kb(link: str, t, **_) -> InlineKeyboardMarkup:
+    """
+    Keyboard under a product sent via inline mode: opens the product in the bot.
+
+    :param link: Deep link to the bot (t.me/<bot>?start=p<id>).
+    """
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(
+                    text=t("user_catalog_keyboards.buttons.otkryt-v-bote"), url=link
+                )
+            ]
+        ]
+    )
@@ -0,0 +1,6 @@
+from aiogram.fsm.state import State, StatesGroup
+
+
+class BroadcastStates(StatesGroup):
+    waiting_text = State()
+    confirming = State()
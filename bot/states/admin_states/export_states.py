@@ -0,0 +1,5 @@
+from aiogram.fsm.state import State, StatesGroup
+
+
+class ExportStates(StatesGroup):
+    waiting_range = State()
@@ -0,0 +1,232 @@
+import csv
+import gzip
+import io
+import json
+import shutil
+from datetime import datetime
+from tempfile import SpooledTemporaryFile
+from typing import AsyncGenerator, AsyncIterator, BinaryIO, Callable, NamedTuple
+
+from aiogram import Bot
+from aiogram.types.input_file import DEFAULT_CHUNK_SIZE, InputFile
+
+from database.crud import iter_order_items, iter_orders, iter_products
+
+# Сколько байт выгрузки держать в памяти, дальше SpooledTemporaryFile пишет на диск
+EXPORT_MEMORY_LIMIT = 4 * 1024 * 1024
+# Выгрузки больше этого размера отправляются в gzip
+EXPORT_GZIP_THRESHOLD = 5 * 1024 * 1024
+
+
+class SpooledInputFile(InputFile):
+    """
+    Uploads an already written (spooled) file object in chunks.
+    The caller owns the file and closes it after sending.
+    """
+
+    def __init__(
+        self, file: BinaryIO, filename: str, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ):
+        super().__init__(filename=filename, chunk_size=chunk_size)
+        self.file = file
+
+    async def read(self, bot: Bot) -> AsyncGenerator[bytes, None]:
+        self.file.seek(0)
+        while chunk := self.file.read(self.chunk_size):
+            yield chunk
+
+
+# -------- FORMATS --------
+
+
+class DelimitedFormat:
+    """
+    CSV-like format: a header line and one delimited line per row.
+    """
+
+    def __init__(self, extension: str, delimiter: str):
+        self.extension = extension
+        self.delimiter = delimiter
+
+    def _lines(self, rows) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer, delimiter=self.delimiter).writerows(rows)
+        return buffer.getvalue()
+
+    def header(self, columns: tuple) -> str:
+        return self._lines([columns])
+
+    def rows(self, columns: tuple, rows: list) -> str:
+        return self._lines(rows)
+
+
+class JsonLinesFormat:
+    """
+    JSON Lines: one JSON object per row, no header.
+    """
+
+    extension = "jsonl"
+
+    def header(self, columns: tuple) -> str:
+        return ""
+
+    def rows(self, columns: tuple, rows: list) -> str:
+        return "".join(
+            json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n"
+            for row in rows
+        )
+
+
+EXPORT_FORMATS = {
+    "csv": DelimitedFormat("csv", ","),
+    "tsv": DelimitedFormat("tsv", "\t"),
+    "jsonl": JsonLinesFormat(),
+}
+
+
+# -------- DATASETS --------
+
+
+def _dt(value: datetime) -> str:
+    return value.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _money(value) -> str:
+    return f"{value:.2f}"
+
+
+class ExportDataset(NamedTuple):
+    """
+    Exportable data set.
+
+    :param title_key: Translation key of the dataset name.
+    :param columns: Column names (CSV/TSV header and JSON keys).
+    :param chunks: (date_from, date_to) -> async iterator of model chunks.
+    :param row: Model -> tuple of column values.
+    """
+
+    title_key: str
+    columns: tuple
+    chunks: Callable[[datetime, datetime], AsyncIterator[list]]
+    row: Callable[[object], tuple]
+
+
+EXPORT_DATASETS = {
+    "orders": ExportDataset(
+        title_key="export.dataset.orders",
+        columns=(
+            "id",
+            "created_at",
+            "customer",
+            "phone",
+            "total",
+            "status",
+            "payment_method",
+            "delivery_method",
+            "address",
+            "comment",
+        ),
+        chunks=iter_orders,
+        row=lambda o: (
+            o.id,
+            _dt(o.created_at),
+            o.name or getattr(o.user, "full_name", "-"),
+            o.phone or getattr(o.user, "phone", "-"),
+            _money(o.total_price),
+            o.status,
+            o.payment_method,
+            o.delivery_method,
+            o.address,
+            o.comment,
+        ),
+    ),
+    "lines": ExportDataset(
+        title_key="export.dataset.lines",
+        columns=(
+            "order_id",
+            "created_at",
+            "status",
+            "product_id",
+            "product",
+            "category",
+            "quantity",
+            "price_at_order",
+            "line_total",
+        ),
+        chunks=iter_order_items,
+        row=lambda i: (
+            i.order_id,
+            _dt(i.order.created_at),
+            i.order.status,
+            i.product_id,
+            i.product.name,
+            i.product.category.name if i.product.category else "",
+            i.quantity,
+            _money(i.price_at_order),
+            _money(i.price_at_order * i.quantity),
+        ),
+    ),
+    "products": ExportDataset(
+        title_key="export.dataset.products",
+        columns=(
+            "id",
+            "name",
+            "category",
+            "price",
+            "stock",
+            "is_active",
+            "created_at",
+            "description",
+        ),
+        chunks=iter_products,
+        row=lambda p: (
+            p.id,
+            p.name,
+            p.category.name if p.category else "",
+            _money(p.price),
+            p.stock,
+            p.is_active,
+            _dt(p.created_at),
+            p.description or "",
+        ),
+    ),
+}
+
+
+async def write_export(
+    file: BinaryIO,
+    dataset: ExportDataset,
+    export_format,
+    date_from: datetime,
+    date_to: datetime = None,
+) -> int:
+    """
+    Streams a dataset for [date_from, date_to) into a binary file as UTF-8,
+    one DB chunk at a time.
+
+    :param file: Binary file object to write to.
+    :param dataset: ExportDataset.
+    :param export_format: One of EXPORT_FORMATS.
+    :param date_from: Start of the period.
+    :param date_to: End of the period (exclusive), None — up to now.
+    :return: Number of exported rows.
+    """
+    file.write(export_format.header(dataset.columns).encode("utf-8"))
+    count = 0
+    async for chunk in dataset.chunks(date_from, date_to):
+        rows = [dataset.row(obj) for obj in chunk]
+        file.write(export_format.rows(dataset.columns, rows).encode("utf-8"))
+        count += len(rows)
+    return count
+
+
+def gzip_spooled(file: BinaryIO) -> SpooledTemporaryFile:
+    """
+    Compresses a written file into a new spooled file chunk by chunk.
+    The caller closes both files.
+    """
+    compressed = SpooledTemporaryFile(max_size=EXPORT_MEMORY_LIMIT)
+    file.seek(0)
+    with gzip.GzipFile(fileobj=compressed, mode="wb") as gz:
+        shutil.copyfileobj(file, gz, DEFAULT_CHUNK_SIZE)
+    return compressed
@@ -1,3 +1,6 @@
+import re
+from typing import Any, Dict, Optional
+
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery
 
@@ -5,7 +8,7 @@ from bot.keyboards.admin.order_keyboards import (
     change_order_status,
     orders_list_keyboard,
 )
-from bot.utils.common_utils import format_price
+from bot.utils.common_utils import format_price, parse_date_range
 from database.crud import get_order_items, get_orders_page
 from database.models import Order
 
@@ -86,3 +89,40 @@ async def admin_show_order_summary(
     else:
         msg = await event.answer(text=text, reply_markup=change_order_status(t))
         await state.update_data(main_message_id=msg.message_id)
+
+
+_DATE_RANGE_RE = re.compile(r"\d{2}\.\d{2}\.\d{4}(?:\s*-\s*\d{2}\.\d{2}\.\d{4})?")
+_PHONE_RE = re.compile(r"^\+?[\d\s()-]+$")
+# Числа длиннее считаем телефоном, а не ID заказа
+MAX_ORDER_ID_DIGITS = 9
+
+
+def parse_order_query(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Parses an admin order search query into search_orders() arguments.
+    Accepted: "#123" (ID), digits (ID or the last digits of a phone),
+    a phone in any format, the beginning of a name; a date or a range
+    "ДД.ММ.ГГГГ-ДД.ММ.ГГГГ" can be added to any of them or used alone.
+
+    :return: Keyword arguments for search_orders() or None if the query is empty
+        or the date range is invalid.
+    """
+    criteria: Dict[str, Any] = {}
+    match = _DATE_RANGE_RE.search(text)
+    if match:
+        date_range = parse_date_range(match.group())
+        if date_range is None:
+            return None
+        criteria["date_from"], criteria["date_to"] = date_range
+        text = text[: match.start()] + text[match.end() :]
+    text = text.strip()
+    if text.startswith("#") and text[1:].isdigit():
+        criteria["order_id"] = int(text[1:])
+    elif text and _PHONE_RE.match(text):
+        digits = re.sub(r"\D", "", text)
+        if len(digits) <= MAX_ORDER_ID_DIGITS:
+            criteria["order_id"] = int(digits)
+        criteria["phone"] = digits
+    elif text:
+        criteria["name"] = text
+    return criteria or None
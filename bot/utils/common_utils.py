@@ -1,11 +1,15 @@
+from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import List, Tuple
 
 from aiogram.fsm.context import FSMContext
 from aiogram.types import Message
+from tortoise.timezone import make_aware
 
 from bot.constants import ORDER_STATUSES
 
+RANGE_DATE_FORMAT = "%d.%m.%Y"
+
 
 def paginate(items: List, page: int, page_size: int) -> Tuple[List, int, int]:
     """
@@ -32,7 +36,9 @@ def format_product_name(name: str, max_len: int = 20) -> str:
 
 
 def format_price(price) -> str:
-    return f"{Decimal(price):,.0f}".replace(",", " ")
+    if not isinstance(price, Decimal):
+        price = Decimal(str(price))
+    return f"{price:,.0f}".replace(",", " ")
 
 
 async def delete_request_and_user_message(
@@ -63,3 +69,32 @@ async def delete_request_and_user_message(
 def get_order_status_label(status: str, t) -> str:
     mapping = dict((key, t(label_key)) for key, label_key in ORDER_STATUSES)
     return mapping.get(status, status)
+
+
+def get_cancelled_status_labels(translator) -> set[str]:
+    """
+    Returns the "cancelled" status label in every supported locale
+    (orders store the translated label).
+    """
+    return {
+        translator.translate("order.status.canceled", loc)
+        for loc in translator.supported
+    }
+
+
+def parse_date_range(text: str):
+    """
+    Parses "ДД.ММ.ГГГГ-ДД.ММ.ГГГГ" (or a single date) into an aware
+    [date_from, date_to) pair, where date_to is the day after the last date.
+
+    :return: (date_from, date_to) or None if the text is not a valid range.
+    """
+    first, _, last = text.strip().partition("-")
+    try:
+        date_from = datetime.strptime(first.strip(), RANGE_DATE_FORMAT)
+        date_to = datetime.strptime((last or first).strip(), RANGE_DATE_FORMAT)
+    except ValueError:
+        return None
+    if date_to < date_from:
+        return None
+    return make_aware(date_from), make_aware(date_to + timedelta(days=1))
@@ -22,7 +22,8 @@ from bot.utils.user_utils.validators import (
     validate_name,
     validate_phone,
 )
-from database.crud import create_user_profile
+from config_data.env import STOCK_RESERVATION_MINUTES
+from database.crud import create_user_profile, release_reservations
 
 router = Router()
 
@@ -115,6 +116,9 @@ async def universal_exit(callback: CallbackQuery, t, state: FSMContext, **_):
     :param state: FSM context.
     """
     await delete_request_and_user_message(callback.message, state)
+    state_name = await state.get_state()
+    if STOCK_RESERVATION_MINUTES > 0 and state_name == OrderStates.confirm.state:
+        await release_reservations(callback.from_user.id)
     if callback.data == "menu_catalog":
         await show_categories(callback, t)
     elif callback.data == "menu_main":
@@ -27,12 +27,11 @@ async def build_cart_view(
         products = await Product.filter(id__in=product_ids).all()
         products_dict = {p.id: p for p in products}
         cart_pairs = []
-        total = 0
+        total = Decimal("0")
         for item in cart_items:
             product = products_dict.get(item.product_id)
             if product:
-                amount = item.quantity * Decimal(product.price)
-                total += amount
+                total += product.price * item.quantity
                 cart_pairs.append((item, product))
         total_items = len(cart_pairs)
         total_pages = max(1, (total_items + PAGE_SIZE - 1) // PAGE_SIZE)
@@ -18,6 +18,7 @@ from bot.utils.user_utils.validators import (
     validate_phone,
 )
 from config_data.env import ADMIN_IDS
+from services.admin_notifier import admin_notifier
 
 
 async def editing_name(message: Message, state: FSMContext, t):
@@ -122,7 +123,8 @@ async def editing_payment(callback: CallbackQuery, t, state: FSMContext, **_):
 
 async def notify_admin_about_new_order(bot: Bot, order, t):
     """
-    Sends an admin notification about a new order.
+    Queues admin notifications about a new order; they are delivered
+    in the background, so checkout does not wait for Telegram.
     """
     text = t("user_checkout_utils.misc.soobschenie-dlya-administratora").format(
         id=order.id,
@@ -132,8 +134,5 @@ async def notify_admin_about_new_order(bot: Bot, order, t):
         currency=t("currency"),
         order_status=order.status,
     )
-    for admin_id in ADMIN_IDS:
-        try:
-            await bot.send_message(chat_id=int(admin_id), text=text)
-        except Exception as e:
-            print(f"Ошибка отправки уведомления админу: {e}")
+    # доставка идёт в фоне, статус по каждому админу пишется в AdminNotification
+    await admin_notifier.notify(order, text, ADMIN_IDS)
@@ -9,6 +9,7 @@ from bot.keyboards.user.order_keyboards import (
     order_details_keyboard,
     show_orders_keyboard,
 )
+from bot.keyboards.user.user_common_keyboards import cart_back_menu
 from bot.keyboards.user.user_profile_keyboards import profile_orders_keyboard
 from bot.states.user_states.order_states import OrderStates
 from bot.utils.common_utils import (
@@ -16,7 +17,28 @@ from bot.utils.common_utils import (
     format_price,
     format_product_name,
 )
-from database.crud import get_cart, get_order_by_id, get_order_items, get_orders
+from config_data.env import STOCK_RESERVATION_MINUTES
+from database.crud import (
+    InsufficientStockError,
+    get_cart,
+    get_order_by_id,
+    get_order_items,
+    get_orders,
+    reserve_cart_stock,
+)
+
+
+def format_stock_error(error: InsufficientStockError, t) -> str:
+    """
+    Builds a message listing the cart lines that are out of stock.
+    """
+    lines = "".join(
+        t("user_checkout.stock_line").format(
+            name=product.name, requested=requested, available=available
+        )
+        for product, requested, available in error.lines
+    )
+    return t("user_checkout.messages.nedostatochno-tovara").format(items=lines)
 
 
 async def show_orders_menu(
@@ -82,10 +104,12 @@ async def get_order_details(order_id: int, t, **_) -> Dict:
             "keyboard": order_details_keyboard(t, order_id),
         }
     order_items = await get_order_items(order)
-    total = sum([item.quantity * float(item.product.price) for item in order_items])
+    total = sum(
+        (item.price_at_order * item.quantity for item in order_items), Decimal("0")
+    )
     items_text = "\n".join(
         [
-            f'• {format_product_name(item.product.name)} — {item.quantity} x {format_price(item.product.price)} {t("currency")} = {format_price(item.quantity * float(item.product.price))} {t("currency")}'
+            f'• {format_product_name(item.product.name)} — {item.quantity} x {format_price(item.price_at_order)} {t("currency")} = {format_price(item.price_at_order * item.quantity)} {t("currency")}'
             for item in order_items
         ]
     )
@@ -110,9 +134,24 @@ async def show_order_summary(message_or_callback, state: FSMContext, t) -> None:
     """
     Displays the order summary to the user with all entered data (supports Cart ORM and dict).
     Provides options to confirm the order or edit the data.
+    Reserves the cart stock for STOCK_RESERVATION_MINUTES if enabled.
     """
     await delete_request_and_user_message(message_or_callback, state)
     user_id = message_or_callback.from_user.id
+    target = (
+        message_or_callback
+        if hasattr(message_or_callback, "edit_text")
+        else message_or_callback.message
+    )
+    if STOCK_RESERVATION_MINUTES > 0:
+        try:
+            await reserve_cart_stock(user_id, STOCK_RESERVATION_MINUTES)
+        except InsufficientStockError as e:
+            await target.answer(
+                format_stock_error(e, t), reply_markup=cart_back_menu(t)
+            )
+            await state.clear()
+            return
     data = await state.get_data()
     cart_items = await get_cart(user_id)
     client = data.get("name") or "-"
@@ -135,8 +174,7 @@ async def show_order_summary(message_or_callback, state: FSMContext, t) -> None:
     for item in cart_items:
         name = format_product_name(item.product.name)
         qty = item.quantity
-        price = Decimal(item.product.price)
-        pr_sum = price * qty
+        pr_sum = item.product.price * qty
         total += pr_sum
         summary += t("checkout.summary.item_line").format(
             name=name, qty=qty, line_total=format_price(pr_sum), currency=t("currency")
@@ -148,12 +186,5 @@ async def show_order_summary(message_or_callback, state: FSMContext, t) -> None:
 
     summary += t("checkout.summary.hint")
 
-    if hasattr(message_or_callback, "edit_text"):
-        await message_or_callback.answer(
-            summary, reply_markup=order_confirm_keyboard(t)
-        )
-    else:
-        await message_or_callback.message.answer(
-            summary, reply_markup=order_confirm_keyboard(t)
-        )
+    await target.answer(summary, reply_markup=order_confirm_keyboard(t))
     await state.set_state(OrderStates.confirm)
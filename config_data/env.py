@@ -9,3 +9,39 @@ TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 ADMIN_IDS = os.getenv("ADMIN_IDS")
 
 ADMIN_IDS = [int(x) for x in ADMIN_IDS.split(",") if x.strip().isdigit()]
+
+# Сколько минут держать резерв товара на шаге подтверждения заказа (0 — без резерва)
+STOCK_RESERVATION_MINUTES = int(os.getenv("STOCK_RESERVATION_MINUTES", "10"))
+
+# Кэш локалей пользователей: размер, время жизни в памяти (сек.) и второй уровень в Redis
+LOCALE_CACHE_SIZE = int(os.getenv("LOCALE_CACHE_SIZE", "10000"))
+LOCALE_CACHE_TTL = int(os.getenv("LOCALE_CACHE_TTL", "300"))
+LOCALE_CACHE_REDIS = os.getenv("LOCALE_CACHE_REDIS", "1") == "1"
+
+# Подхватывать правки services/locales/*.json без перезапуска (интервал опроса в сек., 0 — выключено)
+LOCALE_RELOAD_INTERVAL = float(os.getenv("LOCALE_RELOAD_INTERVAL", "2"))
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# Режим получения апдейтов: polling или webhook (за балансировщиком)
+BOT_MODE = os.getenv("BOT_MODE", "polling").lower()
+WEBHOOK_BASE_URL = os.getenv("WEBHOOK_BASE_URL", "").rstrip("/")
+WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "/webhook")
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET") or None
+WEBAPP_HOST = os.getenv("WEBAPP_HOST", "0.0.0.0")
+WEBAPP_PORT = int(os.getenv("WEBAPP_PORT", "8080"))
+# Сколько одновременных соединений Telegram открывает к вебхуку (1–100)
+WEBHOOK_MAX_CONNECTIONS = int(os.getenv("WEBHOOK_MAX_CONNECTIONS", "40"))
+# Сколько апдейтов процесс обрабатывает одновременно (0 — без ограничения)
+UPDATE_CONCURRENCY = int(os.getenv("UPDATE_CONCURRENCY", "100"))
+# Количество процессов-воркеров в режиме вебхука (SO_REUSEPORT, только Linux/BSD)
+WEB_WORKERS = int(os.getenv("WEB_WORKERS", "1"))
+# Рассылать сброс кэшей (каталог, локали) другим процессам через Redis pub/sub
+CACHE_BUS = os.getenv("CACHE_BUS", "1") == "1"
+# Очередь апдейтов в Redis Streams между приёмом вебхука и обработчиками
+UPDATE_QUEUE = os.getenv("UPDATE_QUEUE", "0") == "1"
+UPDATE_QUEUE_PARTITIONS = int(os.getenv("UPDATE_QUEUE_PARTITIONS", "16"))
+UPDATE_QUEUE_MAX_LEN = int(os.getenv("UPDATE_QUEUE_MAX_LEN", "10000"))
+# Лимиты исходящих сообщений Telegram: всего в секунду (делится между воркерами) и на один чат
+OUTBOUND_GLOBAL_RATE = float(os.getenv("OUTBOUND_GLOBAL_RATE", "30"))
+OUTBOUND_CHAT_RATE = float(os.getenv("OUTBOUND_CHAT_RATE", "1"))
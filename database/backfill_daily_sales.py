@@ -0,0 +1,37 @@
+"""
+Rebuilds the DailySales rollup from existing orders.
+
+Usage: python -m database.backfill_daily_sales
+"""
+
+import asyncio
+from pathlib import Path
+
+from database.crud import backfill_daily_sales
+from database.init_db import close_db, init_db
+from services.i18n.translations import Translator
+
+LOCALES_DIR = Path(__file__).resolve().parent.parent / "services" / "locales"
+
+
+async def main() -> None:
+    """
+    Connects to the database and rebuilds the rollup, skipping cancelled orders.
+    """
+    await init_db()
+    translator = Translator(
+        locales_dir=LOCALES_DIR, default_locale="ru", supported=("ru", "en")
+    )
+    cancelled = [
+        translator.translate("order.status.canceled", loc)
+        for loc in translator.supported
+    ]
+    try:
+        rows = await backfill_daily_sales(cancelled)
+        print(f"DailySales rebuilt: {rows} rows")
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
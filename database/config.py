@@ -1,8 +1,20 @@
 # config.py
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite://shop.db")
+# Размер пула соединений на один процесс (воркер); для SQLite не используется
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "0"))
+
+if DB_POOL_SIZE and not DATABASE_URL.startswith("sqlite://"):
+    DATABASE_URL += ("&" if "?" in DATABASE_URL else "?") + f"maxsize={DB_POOL_SIZE}"
 
 TORTOISE_ORM = {
     "connections": {
-        "default": "sqlite://shop.db",  # можно вынести в .env
+        "default": DATABASE_URL,
     },
     "apps": {
         "models": {
@@ -1,7 +1,60 @@
+import asyncio
+import difflib
+import re
+from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Any, List, Optional, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from tortoise import BaseDBAsyncClient, Tortoise
+from tortoise.exceptions import IntegrityError
+from tortoise.expressions import F, Q, Subquery
+from tortoise.functions import Sum
+from tortoise.queryset import QuerySet
+from tortoise.timezone import now
+from tortoise.transactions import in_transaction
+
+from database.fields import to_minor_units
+from database.models import (
+    Cart,
+    Category,
+    DailySales,
+    Order,
+    OrderItem,
+    OrderNameWord,
+    Product,
+    StockReservation,
+    User,
+)
+
+
+class InsufficientStockError(Exception):
+    """
+    Raised when some cart lines cannot be fulfilled from the current stock.
+
+    :param lines: List of (product, requested quantity, available quantity).
+    """
+
+    def __init__(self, lines: List[Tuple[Product, int, int]]):
+        self.lines = lines
+        super().__init__(
+            ", ".join(f"{p.name}: {req} > {avail}" for p, req, avail in lines)
+        )
+
+
+def _sql(query: str) -> str:
+    """
+    Adapts a raw SQL query written with "?" placeholders to the dialect
+    of the default connection (asyncpg expects $1, $2, ...).
+    :param query: SQL with "?" placeholders.
+    :return: SQL for the current connection.
+    """
+    if Tortoise.get_connection("default").capabilities.dialect != "postgres":
+        return query
+    parts = query.split("?")
+    return "".join(
+        part + (f"${i}" if i < len(parts) else "") for i, part in enumerate(parts, 1)
+    )
 
-from database.models import Cart, Category, Order, OrderItem, Product, User
 
 # -------- USERS --------
 
@@ -67,6 +120,44 @@ async def create_user_profile(
     return user
 
 
+async def count_active_users() -> int:
+    """
+    Returns the number of users who have not blocked the bot.
+    """
+    return await User.filter(is_active=True).count()
+
+
+async def get_active_user_ids(after_id: int, limit: int) -> List[int]:
+    """
+    Returns the next batch of active user IDs (keyset pagination by ID).
+    :param after_id: Last ID of the previous batch (0 — from the start).
+    :param limit: Batch size.
+    :return: List of user IDs in ascending order.
+    """
+    return await (
+        User.filter(is_active=True, id__gt=after_id)
+        .order_by("id")
+        .limit(limit)
+        .values_list("id", flat=True)
+    )
+
+
+async def deactivate_users(user_ids: List[int]) -> None:
+    """
+    Marks users who blocked the bot as inactive.
+    """
+    if user_ids:
+        await User.filter(id__in=user_ids).update(is_active=False)
+
+
+async def activate_user(user_id: int) -> None:
+    """
+    Marks a user as active again (e.g. after unblocking the bot),
+    so later broadcasts reach them.
+    """
+    await User.filter(id=user_id, is_active=False).update(is_active=True)
+
+
 # -------- CATEGORIES --------
 
 
@@ -198,6 +289,39 @@ async def get_products_page_by_category(
     return products, has_next, has_prev
 
 
+async def count_products_in_category(category_id: int) -> int:
+    """
+    Returns the number of active products in a category.
+    :param category_id: Category ID.
+    :return: Number of products.
+    """
+    return await Product.filter(category_id=category_id, is_active=True).count()
+
+
+async def get_products_by_category_keyset(
+    category_id: int,
+    after_id: Optional[int] = None,
+    before_id: Optional[int] = None,
+    page_size: int = 10,
+) -> List[Product]:
+    """
+    Retrieves a page of active products of a category ordered by -id
+    using keyset (seek) pagination.
+    :param category_id: Category ID.
+    :param after_id: Return products with id < after_id (next page).
+    :param before_id: Return products with id > before_id (previous page).
+    :param page_size: Number of products per page.
+    :return: List of products ordered by -id.
+    """
+    query = Product.filter(category_id=category_id, is_active=True)
+    if before_id is not None:
+        products = await query.filter(id__gt=before_id).order_by("id").limit(page_size)
+        return list(reversed(products))
+    if after_id is not None:
+        query = query.filter(id__lt=after_id)
+    return await query.order_by("-id").limit(page_size)
+
+
 async def get_product_by_id(product_id: int) -> Optional[Product]:
     """
     Returns a product by its ID.
@@ -224,26 +348,179 @@ async def get_products_page(
     return products, has_next, has_prev
 
 
+# Не больше стольких результатов поиска (10 страниц по 10)
+SEARCH_MAX_RESULTS = 100
+
+_SQLITE_SEARCH_SQL = """
+SELECT rowid FROM "product_fts" WHERE "product_fts" MATCH ?
+ORDER BY bm25("product_fts", 10.0, 1.0), rowid DESC
+LIMIT ? OFFSET ?
+"""
+
+# Кандидаты для исправления опечатки: слова на ту же букву и похожей длины
+_SQLITE_VOCAB_SQL = """
+SELECT "term" FROM "product_fts_vocab"
+WHERE "term" >= ? AND "term" < ? AND length("term") BETWEEN ? AND ?
+"""
+
+_SQLITE_SEARCH_COUNT_SQL = """
+SELECT count(*) FROM (
+    SELECT rowid FROM "product_fts" WHERE "product_fts" MATCH ? LIMIT ?
+)
+"""
+
+# Выражения совпадают с индексами из миграции 6_..._product_search
+_PG_DOCUMENT = """to_tsvector('simple', coalesce("name", '') || ' ' || coalesce("description", ''))"""
+
+_PG_SEARCH_SQL = f"""
+SELECT "id" FROM "product"
+WHERE {_PG_DOCUMENT} @@ to_tsquery('simple', ?) OR ? <% lower("name")
+ORDER BY greatest(
+    ts_rank({_PG_DOCUMENT}, to_tsquery('simple', ?)),
+    word_similarity(?, lower("name"))
+) DESC, "id" DESC
+LIMIT ? OFFSET ?
+"""
+
+_PG_SEARCH_COUNT_SQL = f"""
+SELECT count(*) FROM (
+    SELECT 1 FROM "product"
+    WHERE {_PG_DOCUMENT} @@ to_tsquery('simple', ?) OR ? <% lower("name")
+    LIMIT ?
+) AS found
+"""
+
+
+def _search_terms(query: str) -> List[str]:
+    """
+    Splits a search query into lowercase words; punctuation is dropped,
+    so the words are safe to put into an FTS query.
+    """
+    return re.findall(r"\w+", query.lower())
+
+
+async def _sqlite_search(
+    conn: BaseDBAsyncClient, terms: List[str], limit: int, offset: int
+) -> Tuple[List[int], int]:
+    match = " ".join(f'"{term}"*' for term in terms)
+    _, rows = await conn.execute_query(
+        _SQLITE_SEARCH_COUNT_SQL, [match, SEARCH_MAX_RESULTS]
+    )
+    total = rows[0][0]
+    if not total:
+        return [], 0
+    _, rows = await conn.execute_query(_SQLITE_SEARCH_SQL, [match, limit, offset])
+    return [row[0] for row in rows], total
+
+
+async def _sqlite_correct_terms(conn: BaseDBAsyncClient, terms: List[str]) -> List[str]:
+    """
+    Replaces misspelled words with the closest words from the index vocabulary.
+    Used only when the exact query found nothing. Candidates are narrowed in SQL
+    (same first letter, similar length); matching runs in a thread.
+    """
+    corrected = []
+    for term in terms:
+        # при cutoff=0.75 слова длиннее/короче в 5/3 раза похожими не бывают
+        _, rows = await conn.execute_query(
+            _SQLITE_VOCAB_SQL,
+            [term[0], chr(ord(term[0]) + 1), len(term) * 3 // 5, len(term) * 5 // 3],
+        )
+        candidates = [row[0] for row in rows]
+        matches = await asyncio.to_thread(
+            difflib.get_close_matches, term, candidates, 1, 0.75
+        )
+        corrected.append(matches[0] if matches else term)
+    return corrected
+
+
+async def search_products(
+    query: str, page: int = 1, page_size: int = 10
+) -> Tuple[List[Product], int]:
+    """
+    Full-text product search by name and description.
+    SQLite uses the FTS5 index (prefix match, bm25 ranking, name weighs more,
+    misspelled words are corrected from the index vocabulary);
+    Postgres uses the tsvector and trigram indexes.
+    :param query: Search text.
+    :param page: Page number (from 1).
+    :param page_size: Products per page.
+    :return: Products of the page in rank order and the total number found
+        (at most SEARCH_MAX_RESULTS).
+    """
+    terms = _search_terms(query)
+    if not terms:
+        return [], 0
+    offset = (page - 1) * page_size
+    limit = max(min(page_size, SEARCH_MAX_RESULTS - offset), 0)
+    conn = Tortoise.get_connection("default")
+    dialect = conn.capabilities.dialect
+    if dialect == "sqlite":
+        ids, total = await _sqlite_search(conn, terms, limit, offset)
+        if not total:
+            corrected = await _sqlite_correct_terms(conn, terms)
+            if corrected != terms:
+                ids, total = await _sqlite_search(conn, corrected, limit, offset)
+    elif dialect == "postgres":
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        text = " ".join(terms)
+        _, rows = await conn.execute_query(
+            _sql(_PG_SEARCH_COUNT_SQL), [tsquery, text, SEARCH_MAX_RESULTS]
+        )
+        total = rows[0][0]
+        _, rows = await conn.execute_query(
+            _sql(_PG_SEARCH_SQL), [tsquery, text, tsquery, text, limit, offset]
+        )
+        ids = [row[0] for row in rows]
+    else:
+        found = Product.filter(name__icontains=query.strip())
+        total = min(await found.count(), SEARCH_MAX_RESULTS)
+        ids = (
+            await found.order_by("-id")
+            .offset(offset)
+            .limit(limit)
+            .values_list("id", flat=True)
+        )
+    if not ids:
+        return [], total
+    by_id = {p.id: p for p in await Product.filter(id__in=ids)}
+    return [by_id[i] for i in ids if i in by_id], total
+
+
 # -------- CART --------
 
 
-async def add_to_cart(user_id: int, product_id: int, quantity: int) -> Cart:
+_ADD_TO_CART_SQL = """
+INSERT INTO "cart" ("user_id", "product_id", "quantity")
+SELECT ?, "id", ? FROM "product"
+WHERE "id" = ? AND "is_active" = ? AND "stock" >= ?
+ON CONFLICT ("user_id", "product_id") DO UPDATE
+SET "quantity" = "cart"."quantity" + excluded."quantity"
+WHERE "cart"."quantity" + excluded."quantity" <= (
+    SELECT "stock" FROM "product" WHERE "id" = excluded."product_id"
+)
+"""
+
+
+async def add_to_cart_atomic(user_id: int, product_id: int, quantity: int = 1) -> bool:
     """
-    Adds a product to the user's cart or increases the quantity if it already exists.
+    Adds a product to the user's cart in a single statement: the product must be
+    active and have enough stock for the resulting cart quantity, the cart line
+    is inserted or its quantity increased.
     :param user_id: User ID.
     :param product_id: Product ID.
-    :param quantity: Quantity.
-    :return: Cart object (cart item).
+    :param quantity: Quantity to add.
+    :return: True if the cart was changed, False if the product is unavailable.
     """
-    user = await get_or_create_user_profile(user_id)
-    product = await Product.get(id=product_id)
-    cart_item = await Cart.get_or_none(user=user, product=product)
-    if cart_item:
-        cart_item.quantity += quantity
-        await cart_item.save()
-    else:
-        cart_item = await Cart.create(user=user, product=product, quantity=quantity)
-    return cart_item
+    conn = Tortoise.get_connection("default")
+    values = [user_id, quantity, product_id, True, quantity]
+    try:
+        rows, _ = await conn.execute_query(_sql(_ADD_TO_CART_SQL), values)
+    except IntegrityError:
+        # профиль ещё не создан — создаём и повторяем
+        await get_or_create_user_profile(user_id)
+        rows, _ = await conn.execute_query(_sql(_ADD_TO_CART_SQL), values)
+    return rows > 0
 
 
 async def get_cart(user_id: int) -> List[Cart]:
@@ -277,8 +554,177 @@ async def clear_cart(user_id: int) -> None:
     await Cart.filter(user=user).delete()
 
 
+# -------- STOCK --------
+
+
+async def _take_stock(product_id: int, quantity: int) -> bool:
+    """
+    Atomically decrements the product stock if enough is available:
+    UPDATE product SET stock = stock - q WHERE id = ? AND stock >= q.
+    :return: True if the stock was decremented.
+    """
+    updated = await Product.filter(
+        id=product_id, is_active=True, stock__gte=quantity
+    ).update(stock=F("stock") - quantity)
+    return updated > 0
+
+
+async def _return_stock(product_id: int, quantity: int) -> None:
+    """
+    Returns previously taken stock to the product.
+    """
+    await Product.filter(id=product_id).update(stock=F("stock") + quantity)
+
+
+async def _take_cart_stock(
+    cart_items: List[Cart], held: Dict[int, int]
+) -> List[Tuple[Product, int, int]]:
+    """
+    Takes stock for every cart line, counting quantities already held
+    by the user's reservations. Must be called inside a transaction.
+    :param cart_items: Cart lines with prefetched products.
+    :param held: Product ID -> quantity already taken by reservations.
+    :return: Lines that could not be fulfilled (product, requested, available).
+    """
+    failed = []
+    for item in cart_items:
+        extra = item.quantity - held.pop(item.product_id, 0)
+        if extra > 0 and not await _take_stock(item.product_id, extra):
+            failed.append(item)
+        elif extra < 0:
+            await _return_stock(item.product_id, -extra)
+    for product_id, quantity in held.items():
+        await _return_stock(product_id, quantity)
+    if not failed:
+        return []
+    fresh = dict(
+        await Product.filter(
+            id__in=[item.product_id for item in failed], is_active=True
+        ).values_list("id", "stock")
+    )
+    return [
+        (item.product, item.quantity, fresh.get(item.product_id, 0)) for item in failed
+    ]
+
+
+async def _pop_reservations(user_id: int) -> Dict[int, int]:
+    """
+    Removes the user's reservations and returns the quantities they hold.
+    Must be called inside a transaction.
+    :return: Product ID -> reserved quantity.
+    """
+    reservations = await StockReservation.filter(user_id=user_id).select_for_update()
+    held: Dict[int, int] = {}
+    for reservation in reservations:
+        held[reservation.product_id] = (
+            held.get(reservation.product_id, 0) + reservation.quantity
+        )
+    if reservations:
+        await StockReservation.filter(id__in=[r.id for r in reservations]).delete()
+    return held
+
+
+async def reserve_cart_stock(user_id: int, minutes: int) -> None:
+    """
+    Reserves stock for the whole user's cart for the given number of minutes,
+    replacing the user's previous reservations.
+    :param user_id: User ID.
+    :param minutes: Reservation lifetime.
+    :raises InsufficientStockError: if some lines cannot be reserved.
+    """
+    async with in_transaction():
+        held = await _pop_reservations(user_id)
+        cart_items = await Cart.filter(user_id=user_id).prefetch_related("product")
+        failed = await _take_cart_stock(cart_items, held)
+        if failed:
+            raise InsufficientStockError(failed)
+        expires_at = now() + timedelta(minutes=minutes)
+        await StockReservation.bulk_create(
+            [
+                StockReservation(
+                    user_id=user_id,
+                    product_id=item.product_id,
+                    quantity=item.quantity,
+                    expires_at=expires_at,
+                )
+                for item in cart_items
+            ]
+        )
+
+
+async def release_reservations(user_id: int) -> None:
+    """
+    Cancels the user's reservations and returns the stock.
+    :param user_id: User ID.
+    """
+    async with in_transaction():
+        held = await _pop_reservations(user_id)
+        for product_id, quantity in held.items():
+            await _return_stock(product_id, quantity)
+
+
+async def release_expired_reservations() -> int:
+    """
+    Returns the stock of all expired reservations.
+    :return: Number of released reservations.
+    """
+    async with in_transaction():
+        expired = await StockReservation.filter(
+            expires_at__lte=now()
+        ).select_for_update()
+        if not expired:
+            return 0
+        await StockReservation.filter(id__in=[r.id for r in expired]).delete()
+        for reservation in expired:
+            await _return_stock(reservation.product_id, reservation.quantity)
+    return len(expired)
+
+
 # -------- ORDERS --------
 
+# Не больше стольких результатов поиска заказов
+ORDER_SEARCH_MAX_RESULTS = 100
+# Верхняя граница для поиска по префиксу через сравнение строк (SQLite)
+_PREFIX_END = "\U0010ffff"
+# Столько первых слов имени заказа попадает в индекс
+ORDER_NAME_MAX_WORDS = 8
+
+
+def normalize_phone(phone: Optional[str]) -> str:
+    """
+    Keeps only the digits of a phone; a Russian 8XXXXXXXXXX becomes 7XXXXXXXXXX.
+    """
+    digits = re.sub(r"\D", "", phone or "")
+    if len(digits) == 11 and digits.startswith("8"):
+        digits = "7" + digits[1:]
+    return digits
+
+
+def order_phone_key(phone: Optional[str]) -> Optional[str]:
+    """
+    Builds Order.phone_search: phone digits in reverse order.
+    """
+    return normalize_phone(phone)[::-1][:20] or None
+
+
+def order_name_words(name: Optional[str]) -> List[str]:
+    """
+    Splits a name into normalized words (lowercase, ё -> е) for OrderNameWord.
+    """
+    words = re.findall(r"\w+", (name or "").lower().replace("ё", "е"))
+    return list(dict.fromkeys(word[:64] for word in words))[:ORDER_NAME_MAX_WORDS]
+
+
+def _prefix_filter(field: str, key: str) -> Q:
+    """
+    Prefix match that can use an index. SQLite compares strings bytewise, so
+    a range works; on Postgres the range depends on the collation, so LIKE
+    'key%' is used with a varchar_pattern_ops index (migration 11).
+    """
+    if Tortoise.get_connection("default").capabilities.dialect == "postgres":
+        return Q(**{f"{field}__startswith": key})
+    return Q(**{f"{field}__gte": key, f"{field}__lt": key + _PREFIX_END})
+
 
 async def create_order(
     user_id: int,
@@ -291,7 +737,10 @@ async def create_order(
     comment: str = "-",
 ) -> Optional[Order]:
     """
-    Creates an order from the user's cart.
+    Creates an order from the user's cart in a single transaction:
+    stock is decremented for every line (reservations of the user are
+    counted as already taken), then the order, all its items (bulk insert)
+    are written and the cart lines are removed.
     :param user_id: User ID.
     :param name: User full name.
     :param phone: User phone number.
@@ -301,37 +750,126 @@ async def create_order(
     :param address: Delivery address.
     :param comment: Comment.
     :return: Order object or None if the cart is empty.
+    :raises InsufficientStockError: if some lines are out of stock (nothing is written).
     """
-    user = await get_or_create_user_profile(user_id)
-    cart_items = await Cart.filter(user=user).prefetch_related("product")
-    if not cart_items:
-        return None
-    order = await Order.create(
-        user=user,
-        name=name,
-        phone=phone,
-        status=status,
-        total_price=0,
-        payment_method=payment_method,
-        delivery_method=delivery_method,
-        address=address,
-        comment=comment,
-    )
-    total = 0
-    for item in cart_items:
-        await OrderItem.create(
-            order=order,
-            product=item.product,
-            quantity=item.quantity,
-            price_at_order=item.product.price,
+    async with in_transaction() as conn:
+        cart_items = await Cart.filter(user_id=user_id).prefetch_related("product")
+        if not cart_items:
+            return None
+        held = await _pop_reservations(user_id)
+        failed = await _take_cart_stock(cart_items, held)
+        if failed:
+            raise InsufficientStockError(failed)
+        total = sum(
+            (item.product.price * item.quantity for item in cart_items), Decimal("0")
+        )
+        order = await Order.create(
+            user_id=user_id,
+            name=name,
+            phone=phone,
+            status=status,
+            total_price=total,
+            payment_method=payment_method,
+            delivery_method=delivery_method,
+            address=address,
+            comment=comment,
+            phone_search=order_phone_key(phone),
+        )
+        await OrderNameWord.bulk_create(
+            [OrderNameWord(order=order, word=word) for word in order_name_words(name)]
         )
-        total += Decimal(item.product.price) * item.quantity
-    order.total_price = total
-    await order.save()
-    await clear_cart(user_id)
+        items = [
+            OrderItem(
+                order=order,
+                product_id=item.product_id,
+                quantity=item.quantity,
+                price_at_order=item.product.price,
+            )
+            for item in cart_items
+        ]
+        await OrderItem.bulk_create(items)
+        await Cart.filter(id__in=[item.id for item in cart_items]).delete()
+        await _record_daily_sales(conn, order, items, 1)
     return order
 
 
+async def _iter_chunks(query: QuerySet, chunk_size: int) -> AsyncIterator[list]:
+    """
+    Iterates a queryset in id-ordered chunks using keyset pagination on id.
+    :param query: Filtered queryset (with select_related if needed).
+    :param chunk_size: Number of rows per chunk.
+    :return: Async iterator of model lists.
+    """
+    last_id = 0
+    while True:
+        chunk = await query.filter(id__gt=last_id).order_by("id").limit(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1].id
+
+
+def _period_filter(prefix: str, date_from: datetime, date_to: Optional[datetime]):
+    """
+    Builds created_at filter kwargs for the [date_from, date_to) period.
+    """
+    fields = {f"{prefix}created_at__gte": date_from}
+    if date_to is not None:
+        fields[f"{prefix}created_at__lt"] = date_to
+    return fields
+
+
+def iter_orders(
+    date_from: datetime, date_to: datetime = None, chunk_size: int = 500
+) -> AsyncIterator[List[Order]]:
+    """
+    Iterates orders created in [date_from, date_to) in id-ordered chunks,
+    with users joined in the same query.
+    :param date_from: Start of the period.
+    :param date_to: End of the period (exclusive), None — up to now.
+    :param chunk_size: Number of orders per chunk.
+    :return: Async iterator of order lists.
+    """
+    query = Order.filter(**_period_filter("", date_from, date_to)).select_related(
+        "user"
+    )
+    return _iter_chunks(query, chunk_size)
+
+
+def iter_order_items(
+    date_from: datetime, date_to: datetime = None, chunk_size: int = 500
+) -> AsyncIterator[List[OrderItem]]:
+    """
+    Iterates order lines of orders created in [date_from, date_to) in id-ordered
+    chunks, with order, product and category joined in the same query.
+    :param date_from: Start of the period.
+    :param date_to: End of the period (exclusive), None — up to now.
+    :param chunk_size: Number of lines per chunk.
+    :return: Async iterator of order item lists.
+    """
+    query = OrderItem.filter(
+        **_period_filter("order__", date_from, date_to)
+    ).select_related("order", "product__category")
+    return _iter_chunks(query, chunk_size)
+
+
+def iter_products(
+    date_from: datetime, date_to: datetime = None, chunk_size: int = 500
+) -> AsyncIterator[List[Product]]:
+    """
+    Iterates products (active and archived) added in [date_from, date_to)
+    in id-ordered chunks, with categories joined in the same query.
+    :param date_from: Start of the period.
+    :param date_to: End of the period (exclusive), None — up to now.
+    :param chunk_size: Number of products per chunk.
+    :return: Async iterator of product lists.
+    """
+    query = Product.filter(**_period_filter("", date_from, date_to)).select_related(
+        "category"
+    )
+    return _iter_chunks(query, chunk_size)
+
+
 async def get_orders(user_id: int = None) -> List[Order]:
     """
     Returns the list of user orders.
@@ -375,3 +913,203 @@ async def get_orders_page(
     has_prev = page > 1
     has_next = page < total_pages
     return orders, has_next, has_prev
+
+
+async def search_orders(
+    order_id: Optional[int] = None,
+    phone: Optional[str] = None,
+    name: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    page: int = 1,
+    page_size: int = 10,
+) -> Tuple[List[Order], int]:
+    """
+    Searches orders in a single indexed query.
+    ID, phone and name are alternatives (OR); the date range narrows them (AND).
+    Phone matches by its last digits; name matches if every word of it is
+    the beginning of some word of the name (case-insensitive), so "Петров"
+    and "ив пет" both find "Иван Петров".
+    :param order_id: Exact order ID.
+    :param phone: Phone or its last digits (at least 4).
+    :param name: Words (or their beginnings) of the name from the order.
+    :param date_from: Start of the period.
+    :param date_to: End of the period (exclusive).
+    :param page: Page number (from 1).
+    :param page_size: Orders per page.
+    :return: Orders of the page (newest first) and the total number found
+        (at most ORDER_SEARCH_MAX_RESULTS).
+    """
+    query = Order.all()
+    if date_from is not None:
+        query = query.filter(created_at__gte=date_from)
+    if date_to is not None:
+        query = query.filter(created_at__lt=date_to)
+    matches = []
+    if order_id is not None:
+        matches.append(Q(id=order_id))
+    phone_key = order_phone_key(phone)
+    if phone_key and len(phone_key) >= 4:
+        matches.append(_prefix_filter("phone_search", phone_key))
+    words = order_name_words(name)
+    if words:
+        # каждое слово запроса — начало какого-то слова имени
+        found = [
+            OrderNameWord.filter(_prefix_filter("word", word)).values("order_id")
+            for word in words
+        ]
+        matches.append(Q(*(Q(id__in=Subquery(ids)) for ids in found)))
+    if matches:
+        query = query.filter(Q(*matches, join_type="OR"))
+    elif date_from is None and date_to is None:
+        return [], 0
+    total = await query.limit(ORDER_SEARCH_MAX_RESULTS).count()
+    offset = (page - 1) * page_size
+    limit = max(min(page_size, ORDER_SEARCH_MAX_RESULTS - offset), 0)
+    if not total or not limit:
+        return [], total
+    orders = await query.order_by("-id").offset(offset).limit(limit)
+    return orders, total
+
+
+# -------- STATS --------
+
+_DAILY_SALES_UPSERT_SQL = """
+INSERT INTO "dailysales" ("date", "product_id", "quantity", "revenue", "order_count")
+VALUES {values}
+ON CONFLICT ("date", "product_id") DO UPDATE
+SET "quantity" = "dailysales"."quantity" + excluded."quantity",
+    "revenue" = "dailysales"."revenue" + excluded."revenue",
+    "order_count" = "dailysales"."order_count" + excluded."order_count"
+"""
+
+_DAILY_SALES_BACKFILL_SQL = """
+INSERT INTO "dailysales" ("date", "product_id", "quantity", "revenue", "order_count")
+SELECT DATE("o"."created_at"), {product}, SUM("i"."quantity"),
+       SUM("i"."quantity" * "i"."price_at_order"), COUNT(DISTINCT "o"."id")
+FROM "orderitem" AS "i" JOIN "order" AS "o" ON "o"."id" = "i"."order_id"
+{where}
+GROUP BY DATE("o"."created_at"){group_by}
+"""
+
+
+async def _record_daily_sales(
+    conn: BaseDBAsyncClient, order: Order, items: List[OrderItem], sign: int
+) -> None:
+    """
+    Adds (sign=1) or removes (sign=-1) an order to/from the daily sales rollup
+    with one upsert statement: a row per product and the day total row.
+    :param conn: Connection of the current transaction.
+    :param order: Order object.
+    :param items: Order items.
+    :param sign: 1 or -1.
+    """
+    if not items:
+        return
+    day = order.created_at.date()
+    # выручка считается в копейках — так же она хранится в dailysales.revenue
+    per_product: Dict[int, Tuple[int, int]] = {}
+    for item in items:
+        qty, revenue = per_product.get(item.product_id, (0, 0))
+        per_product[item.product_id] = (
+            qty + item.quantity,
+            revenue + to_minor_units(item.price_at_order) * item.quantity,
+        )
+    per_product[0] = (
+        sum(qty for qty, _ in per_product.values()),
+        sum(revenue for _, revenue in per_product.values()),
+    )
+    values = []
+    for product_id, (qty, revenue) in per_product.items():
+        values += [day, product_id, sign * qty, sign * revenue, sign]
+    query = _DAILY_SALES_UPSERT_SQL.format(
+        values=", ".join(["(?, ?, ?, ?, ?)"] * len(per_product))
+    )
+    await conn.execute_query(_sql(query), values)
+
+
+async def update_order_status(order: Order, status: str, rollup_sign: int = 0) -> None:
+    """
+    Saves a new order status. With rollup_sign=-1 the order is removed from
+    the daily sales rollup (cancellation), with 1 it is returned there.
+    :param order: Order object.
+    :param status: New status label.
+    :param rollup_sign: -1, 0 or 1.
+    """
+    async with in_transaction() as conn:
+        await order.update_from_dict({"status": status}).save()
+        if rollup_sign:
+            items = await OrderItem.filter(order_id=order.id)
+            await _record_daily_sales(conn, order, items, rollup_sign)
+
+
+async def backfill_daily_sales(excluded_statuses: List[str] = ()) -> int:
+    """
+    Rebuilds the daily sales rollup from existing orders.
+    :param excluded_statuses: Order statuses that are not counted (cancelled).
+    :return: Number of rollup rows.
+    """
+    where, params = "", []
+    if excluded_statuses:
+        where = 'WHERE "o"."status" NOT IN ({})'.format(
+            ", ".join("?" * len(excluded_statuses))
+        )
+        params = list(excluded_statuses)
+    async with in_transaction() as conn:
+        await DailySales.all().delete()
+        for product, group_by in (
+            ('"i"."product_id"', ', "i"."product_id"'),
+            ("0", ""),
+        ):
+            query = _DAILY_SALES_BACKFILL_SQL.format(
+                product=product, where=where, group_by=group_by
+            )
+            await conn.execute_query(_sql(query), params)
+    return await DailySales.all().count()
+
+
+async def get_sales_summary(date_from: datetime) -> Tuple[int, Decimal]:
+    """
+    Returns the number of orders and their total amount since a date
+    from the day total rows of the daily sales rollup.
+    :param date_from: Start of the period.
+    :return: (orders count, total amount)
+    """
+    rows = (
+        await DailySales.filter(date__gte=date_from.date(), product_id=0)
+        .annotate(orders_count=Sum("order_count"), total=Sum("revenue"))
+        .values("orders_count", "total")
+    )
+    row = rows[0] if rows else {}
+    return int(row.get("orders_count") or 0), row.get("total") or Decimal("0")
+
+
+async def get_top_products(
+    date_from: datetime, limit: int = 5
+) -> List[Tuple[str, int]]:
+    """
+    Returns the best-selling products since a date from the daily sales rollup:
+    SUM(quantity) GROUP BY product ORDER BY SUM(quantity) DESC LIMIT n.
+    :param date_from: Start of the period.
+    :param limit: Number of products.
+    :return: List of (product name, sold quantity).
+    """
+    rows = (
+        await DailySales.filter(date__gte=date_from.date(), product_id__gt=0)
+        .annotate(qty=Sum("quantity"))
+        .group_by("product_id")
+        .filter(qty__gt=0)
+        .order_by("-qty")
+        .limit(limit)
+        .values("product_id", "qty")
+    )
+    names = dict(
+        await Product.filter(id__in=[row["product_id"] for row in rows]).values_list(
+            "id", "name"
+        )
+    )
+    return [
+        (names[row["product_id"]], int(row["qty"]))
+        for row in rows
+        if row["product_id"] in names
+    ]
@@ -0,0 +1,56 @@
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Optional, Type, Union
+
+from tortoise.fields import Field
+from tortoise.models import Model
+
+# Копейки: два знака после запятой
+MINOR_UNITS = 2
+_QUANT = Decimal(1).scaleb(-MINOR_UNITS)
+
+
+def to_minor_units(value: Union[Decimal, int, float, str]) -> int:
+    """
+    Converts an amount of money to an integer number of minor units (kopecks),
+    rounding half up: Decimal("10.505") -> 1051.
+    """
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    return int(value.quantize(_QUANT, ROUND_HALF_UP).scaleb(MINOR_UNITS))
+
+
+def from_minor_units(value: int) -> Decimal:
+    """
+    Converts an integer number of minor units back to a Decimal amount.
+    """
+    return Decimal(value).scaleb(-MINOR_UNITS)
+
+
+class MoneyField(Field[Decimal], Decimal):
+    """
+    Money stored as BIGINT minor units, so SUM, ORDER BY and range filters
+    run in the database on every backend. In Python the value is a Decimal
+    with two decimal places; Decimal, str and float are accepted on write.
+
+    An int is taken as minor units (that is what the database returns),
+    so amounts must not be assigned as bare ints.
+    """
+
+    SQL_TYPE = "BIGINT"
+    field_type = Decimal
+
+    def to_db_value(
+        self, value: Any, instance: "Union[Type[Model], Model]"
+    ) -> Optional[int]:
+        if value is None:
+            return None
+        if isinstance(value, int):
+            return value
+        return to_minor_units(value)
+
+    def to_python_value(self, value: Any) -> Optional[Decimal]:
+        if value is None or isinstance(value, Decimal):
+            return value
+        if isinstance(value, int):
+            return from_minor_units(value)
+        return Decimal(str(value)).quantize(_QUANT, ROUND_HALF_UP)
@@ -42,14 +42,21 @@ def backup_sqlite_db(db_url: str) -> None:
         shutil.copy2(db_path, backup_dir / f"shop_backup_{ts}.db")
 
 
-async def init_db() -> None:
+async def init_db(migrate: bool = True) -> None:
     """
     Initialize the database properly:
     1. Backup SQLite file if it exists.
     2. If migrations exist — run `aerich upgrade`.
     3. If no migrations and database does not exist — run `generate_schemas()` once.
     4. If database exists but no migrations — just connect and continue.
+
+    Args:
+        migrate (bool): False — only open this process's connection pool;
+            used by worker processes after the supervisor has migrated once.
     """
+    if not migrate:
+        await Tortoise.init(config=TORTOISE_ORM)
+        return
     db_url = TORTOISE_ORM["connections"]["default"]
     db_path = _sqlite_file_from_url(db_url)
     db_exists = bool(db_path and db_path.exists())
@@ -59,7 +66,7 @@ async def init_db() -> None:
 
     migrations_root = Path("migrations")
 
-    if migrations_root.exists() and any(migrations_root.glob("**/*.json")):
+    if migrations_root.exists() and any(migrations_root.glob("**/*.py")):
         cmd = Command(
             tortoise_config=TORTOISE_ORM, app="models", location=str(migrations_root)
         )
@@ -1,6 +1,8 @@
 from tortoise import fields
 from tortoise.models import Model
 
+from database.fields import MoneyField
+
 
 class User(Model):
     """
@@ -17,7 +19,7 @@ class User(Model):
     id = fields.BigIntField(pk=True)
     username = fields.CharField(max_length=64, null=True)
     full_name = fields.CharField(max_length=128)
-    phone = fields.CharField(max_length=20, null=True)
+    phone = fields.CharField(max_length=20, null=True, index=True)
     address = fields.CharField(max_length=128)
     created_at = fields.DatetimeField(auto_now_add=True)
     is_active = fields.BooleanField(default=True)
@@ -51,7 +53,7 @@ class Product(Model):
     id = fields.IntField(pk=True)
     name = fields.CharField(max_length=128)
     description = fields.TextField(null=True)
-    price = fields.DecimalField(max_digits=10, decimal_places=2)
+    price = MoneyField()
     stock = fields.IntField()
     is_active = fields.BooleanField(default=True)
     photo = fields.CharField(max_length=256, null=True, default=None)
@@ -60,6 +62,10 @@ class Product(Model):
         "models.Category", related_name="products", null=True
     )
 
+    class Meta:
+        # страницы категории: WHERE category_id = ? AND is_active ORDER BY id
+        indexes = (("category", "is_active", "id"),)
+
     @property
     def status_key(self) -> str:
         return "product.status.active" if self.is_active else "product.status.archived"
@@ -95,20 +101,46 @@ class Order(Model):
     :param delivery_method: Delivery method.
     :param address: Delivery address.
     :param comment: User comment on the order.
+    :param phone_search: Phone digits in reverse order: a prefix search on it
+        finds phones by their last digits.
     """
 
     id = fields.IntField(pk=True)
     user = fields.ForeignKeyField("models.User", related_name="orders")
     name = fields.CharField(max_length=128, null=True)
     phone = fields.CharField(max_length=20, null=True)
-    created_at = fields.DatetimeField(auto_now_add=True)
+    phone_search = fields.CharField(max_length=20, null=True, index=True)
+    created_at = fields.DatetimeField(auto_now_add=True, index=True)
     status = fields.CharField(max_length=32, default="In progress")
-    total_price = fields.DecimalField(max_digits=10, decimal_places=2, default=0)
+    total_price = MoneyField(default=0)
     payment_method = fields.CharField(max_length=64, null=True)
     delivery_method = fields.CharField(max_length=64, null=True)
     address = fields.CharField(max_length=255, null=True)
     comment = fields.TextField(null=True)
 
+    class Meta:
+        # заказы пользователя от новых к старым
+        indexes = (("user", "created_at"),)
+
+
+class OrderNameWord(Model):
+    """
+    One word of the name from an order (first name, surname...),
+    so an order can be found by the beginning of any word of the name.
+
+    :param id: Row ID.
+    :param order: Order (relation to Order).
+    :param word: Normalized word (see crud.order_name_words).
+    """
+
+    id = fields.IntField(pk=True)
+    order = fields.ForeignKeyField("models.Order", related_name="name_words")
+    word = fields.CharField(max_length=64)
+
+    class Meta:
+        # поиск по префиксу слова сразу отдаёт order_id из индекса
+        unique_together = (("word", "order"),)
+
 
 class OrderItem(Model):
     """
@@ -125,7 +157,10 @@ class OrderItem(Model):
     order = fields.ForeignKeyField("models.Order", related_name="items")
     product = fields.ForeignKeyField("models.Product", related_name="order_items")
     quantity = fields.IntField()
-    price_at_order = fields.DecimalField(max_digits=10, decimal_places=2)
+    price_at_order = MoneyField()
+
+    class Meta:
+        indexes = (("order",), ("product",))
 
 
 class Cart(Model):
@@ -142,3 +177,121 @@ class Cart(Model):
     user = fields.ForeignKeyField("models.User", related_name="cart")
     product = fields.ForeignKeyField("models.Product", related_name="+")
     quantity = fields.IntField()
+
+    class Meta:
+        unique_together = (("user", "product"),)
+
+
+class StockReservation(Model):
+    """
+    Short-lived stock reservation made when the user reaches order confirmation.
+    The reserved quantity is already subtracted from Product.stock.
+
+    :param id: Reservation ID.
+    :param user: User (relation to User).
+    :param product: Product (relation to Product).
+    :param quantity: Reserved quantity.
+    :param expires_at: Moment after which the stock is returned.
+    """
+
+    id = fields.IntField(pk=True)
+    user = fields.ForeignKeyField("models.User", related_name="reservations")
+    product = fields.ForeignKeyField("models.Product", related_name="reservations")
+    quantity = fields.IntField()
+    expires_at = fields.DatetimeField(index=True)
+
+    class Meta:
+        indexes = (("user",),)
+
+
+class DailySales(Model):
+    """
+    Daily sales rollup, maintained incrementally on order creation and cancellation.
+    Rows with product_id = 0 hold the totals of the whole day.
+
+    :param id: Row ID.
+    :param date: Sales date.
+    :param product_id: Product ID (0 — all products of the day).
+    :param quantity: Sold quantity.
+    :param revenue: Revenue.
+    :param order_count: Number of orders.
+    """
+
+    id = fields.IntField(pk=True)
+    date = fields.DateField()
+    product_id = fields.IntField()
+    quantity = fields.IntField(default=0)
+    revenue = MoneyField(default=0)
+    order_count = fields.IntField(default=0)
+
+    class Meta:
+        unique_together = (("date", "product_id"),)
+
+
+class AdminNotification(Model):
+    """
+    Delivery of a new-order notification to one admin.
+
+    :param id: Row ID.
+    :param order: Order (relation to Order).
+    :param admin_id: Admin Telegram ID.
+    :param text: Notification text.
+    :param status: pending / sent / failed.
+    :param attempts: Number of delivery attempts.
+    :param error: Last delivery error.
+    :param updated_at: Time of the last attempt.
+    """
+
+    id = fields.IntField(pk=True)
+    order = fields.ForeignKeyField("models.Order", related_name="notifications")
+    admin_id = fields.BigIntField()
+    text = fields.TextField()
+    status = fields.CharField(max_length=16, default="pending", index=True)
+    attempts = fields.IntField(default=0)
+    error = fields.CharField(max_length=255, null=True)
+    created_at = fields.DatetimeField(auto_now_add=True)
+    updated_at = fields.DatetimeField(auto_now=True)
+
+    class Meta:
+        unique_together = (("order", "admin_id"),)
+
+
+class Broadcast(Model):
+    """
+    Admin broadcast to all active users. Progress is checkpointed after every
+    batch, so an interrupted broadcast continues from last_user_id.
+    Only the process holding the lease sends it; the lease is renewed at every
+    checkpoint, and an expired lease is taken over by another worker.
+
+    :param id: Broadcast ID.
+    :param text: Message text (HTML).
+    :param status: running / done / cancelled.
+    :param admin_id: Admin who started the broadcast.
+    :param locale: Admin locale for progress reports.
+    :param report_chat_id: Chat with the progress message.
+    :param report_message_id: Progress message ID.
+    :param last_user_id: Last processed user ID (checkpoint).
+    :param total: Number of active users at start.
+    :param sent: Delivered messages.
+    :param failed: Failed deliveries.
+    :param blocked: Users who blocked the bot (marked inactive).
+    :param owner: Worker currently sending the broadcast (host:pid).
+    :param lease_until: Owner's lease expiry; after it another worker may take over.
+    """
+
+    id = fields.IntField(pk=True)
+    text = fields.TextField()
+    status = fields.CharField(max_length=16, default="running", index=True)
+    admin_id = fields.BigIntField()
+    locale = fields.CharField(max_length=8, default="ru")
+    report_chat_id = fields.BigIntField()
+    report_message_id = fields.IntField(null=True)
+    last_user_id = fields.BigIntField(default=0)
+    total = fields.IntField(default=0)
+    sent = fields.IntField(default=0)
+    failed = fields.IntField(default=0)
+    blocked = fields.IntField(default=0)
+    owner = fields.CharField(max_length=64, null=True)
+    lease_until = fields.DatetimeField(null=True)
+    created_at = fields.DatetimeField(auto_now_add=True)
+    finished_at = fields.DatetimeField(null=True)
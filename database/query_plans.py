@@ -0,0 +1,242 @@
+"""
+Query plan benchmark for the hot crud paths (SQLite).
+
+Builds a throwaway database with generated data, then runs every read
+function twice: without the indexes of the hot-path migration and with
+them. For each SQL statement a function issues it prints EXPLAIN QUERY PLAN
+and the average execution time before and after.
+
+    python -m database.query_plans [--users 2000] [--orders 20000]
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import logging
+import random
+import tempfile
+import time
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Awaitable, Callable, List, Tuple
+
+from tortoise import Tortoise
+from tortoise.timezone import now
+
+from database import crud
+from database.models import (
+    Cart,
+    Category,
+    Order,
+    OrderItem,
+    Product,
+    StockReservation,
+    User,
+)
+
+MIGRATION_GLOB = "8_*_hot_path_indexes.py"
+REPEAT = 20
+
+
+class _SqlCollector(logging.Handler):
+    """
+    Collects SELECT statements from the tortoise.db_client debug log.
+    """
+
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.statements: List[Tuple[str, list]] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if isinstance(record.args, tuple) and len(record.args) == 2:
+            query, values = record.args
+            if isinstance(query, str) and query.lstrip().upper().startswith("SELECT"):
+                self.statements.append((query, list(values or [])))
+
+
+def _load_migration():
+    migrations = Path(__file__).resolve().parent.parent / "migrations" / "models"
+    path = next(migrations.glob(MIGRATION_GLOB))
+    spec = importlib.util.spec_from_file_location("hot_path_indexes", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+async def _seed(users: int, orders: int) -> None:
+    rnd = random.Random(42)
+    await Category.bulk_create([Category(name=f"Категория {i}") for i in range(20)])
+    category_ids = await Category.all().values_list("id", flat=True)
+    await User.bulk_create(
+        [
+            User(id=i, full_name=f"User {i}", phone=f"7900{i:07d}", address="-")
+            for i in range(1, users + 1)
+        ],
+        batch_size=1000,
+    )
+    await Product.bulk_create(
+        [
+            Product(
+                name=f"Товар {i}",
+                price=Decimal(rnd.randint(100, 5000)),
+                stock=rnd.randint(0, 50),
+                is_active=rnd.random() > 0.2,
+                category_id=rnd.choice(category_ids),
+            )
+            for i in range(users * 2)
+        ],
+        batch_size=1000,
+    )
+    product_ids = await Product.all().values_list("id", flat=True)
+    await Order.bulk_create(
+        [
+            Order(
+                user_id=rnd.randint(1, users),
+                name=f"User {i}",
+                total_price=Decimal(1000),
+            )
+            for i in range(orders)
+        ],
+        batch_size=1000,
+    )
+    order_ids = await Order.all().values_list("id", flat=True)
+    await OrderItem.bulk_create(
+        [
+            OrderItem(
+                order_id=order_id,
+                product_id=rnd.choice(product_ids),
+                quantity=rnd.randint(1, 3),
+                price_at_order=Decimal(500),
+            )
+            for order_id in order_ids
+            for _ in range(3)
+        ],
+        batch_size=1000,
+    )
+    await Cart.bulk_create(
+        [
+            Cart(user_id=user_id, product_id=product_id, quantity=1)
+            for user_id in range(1, users + 1, 3)
+            for product_id in rnd.sample(product_ids, 3)
+        ],
+        batch_size=1000,
+    )
+    await StockReservation.bulk_create(
+        [
+            StockReservation(
+                user_id=user_id,
+                product_id=rnd.choice(product_ids),
+                quantity=1,
+                expires_at=now(),
+            )
+            for user_id in range(1, users + 1, 5)
+        ],
+        batch_size=1000,
+    )
+    # auto_now_add ставит всем заказам текущее время — разносим их на год назад
+    conn = Tortoise.get_connection("default")
+    await conn.execute_query(
+        "UPDATE \"order\" SET \"created_at\" = datetime('now', '-' || (\"id\" % 365) || ' days')"
+    )
+
+
+def _scenarios(users: int) -> List[Tuple[str, Callable[[], Awaitable]]]:
+    user_id = users // 2
+    since = now() - timedelta(days=30)
+
+    async def first_chunk(iterator):
+        async for chunk in iterator:
+            return chunk
+
+    async def order_items():
+        order = await Order.filter(user_id=user_id).first()
+        return await crud.get_order_items(order)
+
+    return [
+        ("get_cart", lambda: crud.get_cart(user_id)),
+        ("get_orders", lambda: crud.get_orders(user_id)),
+        ("get_order_items", order_items),
+        ("count_products_in_category", lambda: crud.count_products_in_category(5)),
+        (
+            "get_products_by_category_keyset",
+            lambda: crud.get_products_by_category_keyset(5),
+        ),
+        (
+            "get_products_page_by_category",
+            lambda: crud.get_products_page_by_category(5, 3),
+        ),
+        ("search_orders (30 days)", lambda: crud.search_orders(date_from=since)),
+        (
+            "iter_order_items (30 days)",
+            lambda: first_chunk(crud.iter_order_items(since)),
+        ),
+        ("_pop_reservations", lambda: StockReservation.filter(user_id=user_id)),
+        ("user by phone", lambda: User.filter(phone=f"7900{user_id:07d}").first()),
+    ]
+
+
+async def _measure(scenarios, collector: _SqlCollector) -> dict:
+    conn = Tortoise.get_connection("default")
+    await conn.execute_query("ANALYZE")
+    results = {}
+    for name, call in scenarios:
+        collector.statements.clear()
+        await call()
+        # замеры ниже тоже попадают в лог — берём только запросы самой функции
+        statements = list(collector.statements)
+        report = []
+        for query, values in statements:
+            _, rows = await conn.execute_query(f"EXPLAIN QUERY PLAN {query}", values)
+            plan = [row[3] for row in rows]
+            started = time.perf_counter()
+            for _ in range(REPEAT):
+                await conn.execute_query(query, values)
+            elapsed = (time.perf_counter() - started) / REPEAT * 1000
+            report.append((query, plan, elapsed))
+        results[name] = report
+    return results
+
+
+def _print(before: dict, after: dict) -> None:
+    for name in after:
+        print(f"\n=== {name}")
+        for (query, plan_before, ms_before), (_, plan_after, ms_after) in zip(
+            before[name], after[name]
+        ):
+            print(f"  {query.strip()[:110]}")
+            print(f"    before {ms_before:8.3f} ms: {' | '.join(plan_before)}")
+            print(f"    after  {ms_after:8.3f} ms: {' | '.join(plan_after)}")
+
+
+async def main(users: int, orders: int) -> None:
+    migration = _load_migration()
+    with tempfile.TemporaryDirectory() as tmp:
+        await Tortoise.init(
+            db_url=f"sqlite://{tmp}/plans.db", modules={"models": ["database.models"]}
+        )
+        try:
+            await Tortoise.generate_schemas()
+            await _seed(users, orders)
+            conn = Tortoise.get_connection("default")
+            collector = _SqlCollector()
+            db_logger = logging.getLogger("tortoise.db_client")
+            db_logger.addHandler(collector)
+            db_logger.setLevel(logging.DEBUG)
+            scenarios = _scenarios(users)
+            await conn.execute_script(await migration.downgrade(conn))
+            before = await _measure(scenarios, collector)
+            await conn.execute_script(await migration.upgrade(conn))
+            after = await _measure(scenarios, collector)
+            db_logger.removeHandler(collector)
+            _print(before, after)
+        finally:
+            await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--orders", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.orders))
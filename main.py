@@ -4,41 +4,221 @@ from pathlib import Path
 
 from aiogram import Dispatcher
 from aiogram.fsm.storage.redis import RedisStorage
+from aiohttp import web
 
 from bot.handlers.admin_handlers import router as admin_router
 from bot.handlers.user_handlers import router as user_router
 from config_data.bot_instance import bot
+from config_data.env import (
+    BOT_MODE,
+    CACHE_BUS,
+    LOCALE_CACHE_REDIS,
+    LOCALE_CACHE_SIZE,
+    LOCALE_CACHE_TTL,
+    LOCALE_RELOAD_INTERVAL,
+    OUTBOUND_CHAT_RATE,
+    OUTBOUND_GLOBAL_RATE,
+    REDIS_URL,
+    STOCK_RESERVATION_MINUTES,
+    UPDATE_CONCURRENCY,
+    UPDATE_QUEUE,
+    UPDATE_QUEUE_MAX_LEN,
+    UPDATE_QUEUE_PARTITIONS,
+    WEB_WORKERS,
+    WEBAPP_HOST,
+    WEBAPP_PORT,
+    WEBHOOK_BASE_URL,
+    WEBHOOK_MAX_CONNECTIONS,
+    WEBHOOK_PATH,
+    WEBHOOK_SECRET,
+)
 from database.init_db import close_db, init_db
+from services.admin_notifier import admin_notifier
+from services.broadcast import broadcaster
+from services.cache_bus import setup_cache_bus
+from services.catalog_cache import catalog_cache
+from services.ephemeral import ephemeral
+from services.i18n.hot_reload import run_locale_watcher
 from services.i18n.middleware import LocaleMiddleware
 from services.i18n.translations import Translator
-from services.locale_repo import LocaleRepo
+from services.locale_repo import CachedLocaleRepo
+from services.outbound import outbound
+from services.reservation_sweeper import run_reservation_sweeper
+from services.supervisor import run_supervisor
+from services.update_queue import UpdateQueue
+from services.webhook import build_webhook_app
 
 
-async def main():
+def create_dispatcher(
+    worker_id: int = 0, migrate: bool = True, use_queue: bool = False
+) -> Dispatcher:
     """
-    Main entry point of the bot: initializes the database, starts the bot,
-    and properly closes connections.
-    """
-    storage = RedisStorage.from_url("redis://localhost:6379/0")
-    logging.basicConfig(level=logging.INFO)
-    await init_db()
+    Builds the dispatcher: storage, i18n, routers and startup/shutdown hooks.
+    The hooks run in both polling and webhook modes.
 
+    :param worker_id: Worker number; singleton background jobs run only in worker 0.
+    :param migrate: Apply migrations on startup (False in supervised workers).
+    :param use_queue: Create the Redis update queue (dp["update_queue"])
+        and consume the partitions this process holds leases on.
+    """
+    storage = RedisStorage.from_url(REDIS_URL)
     translator = Translator(
-        locales_dir=Path("/Users/stsaw/PycharmProjects/Demo_Shop_Bot/services/locales"),
+        locales_dir=Path(__file__).resolve().parent / "services" / "locales",
         default_locale="ru",
         supported=("ru", "en"),
     )
-    locale_repo = LocaleRepo()
+    translator.compile()
+    for problem in translator.self_test():
+        logging.warning("i18n: %s", problem)
+    locale_repo = CachedLocaleRepo(
+        max_size=LOCALE_CACHE_SIZE,
+        ttl=LOCALE_CACHE_TTL,
+        redis=storage.redis if LOCALE_CACHE_REDIS else None,
+    )
     dp = Dispatcher(storage=storage)
     dp.update.middleware.register(LocaleMiddleware(translator, locale_repo))
     dp.include_router(admin_router)
     dp.include_router(user_router)
-    print("Bot started!")
-    try:
-        await dp.start_polling(bot)
-    finally:
+    tasks: list[asyncio.Task] = []
+    queue = None
+    if use_queue:
+        queue = dp["update_queue"] = UpdateQueue(
+            storage.redis,
+            partitions=UPDATE_QUEUE_PARTITIONS,
+            max_len=UPDATE_QUEUE_MAX_LEN,
+        )
+
+    @dp.startup()
+    async def on_startup() -> None:
+        await init_db(migrate=migrate)
+        ephemeral.configure(bot, storage.redis)
+        tasks.append(asyncio.create_task(ephemeral.run()))
+        outbound.configure(
+            bot,
+            global_rate=OUTBOUND_GLOBAL_RATE / max(WEB_WORKERS, 1),
+            chat_rate=OUTBOUND_CHAT_RATE,
+        )
+        tasks.append(asyncio.create_task(outbound.run()))
+        tasks.append(asyncio.create_task(admin_notifier.run()))
+        broadcaster.configure(bot, translator)
+        # каждый воркер подхватывает рассылки с истёкшей лизой
+        tasks.append(asyncio.create_task(broadcaster.run()))
+        if STOCK_RESERVATION_MINUTES > 0 and worker_id == 0:
+            tasks.append(asyncio.create_task(run_reservation_sweeper()))
+        if CACHE_BUS:
+            bus = setup_cache_bus(storage.redis)
+            bus.subscribe("catalog", lambda _: catalog_cache.invalidate())
+            bus.subscribe("locale", lambda uid: locale_repo.invalidate(int(uid)))
+            tasks.append(asyncio.create_task(bus.run()))
+        if queue is not None:
+            # свои партиции воркер берёт сразу, чужие — только если их владелец пропал
+            step = max(WEB_WORKERS, 1)
+            partitions = range(worker_id, UPDATE_QUEUE_PARTITIONS, step)
+            tasks.append(asyncio.create_task(queue.consume(dp, bot, partitions)))
+        if LOCALE_RELOAD_INTERVAL > 0:
+            tasks.append(
+                asyncio.create_task(
+                    run_locale_watcher(translator, LOCALE_RELOAD_INTERVAL)
+                )
+            )
+        print("Bot started!")
+
+    @dp.shutdown()
+    async def on_shutdown() -> None:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        logging.info("Locale cache: %s", locale_repo.stats())
+        logging.info("Outbound sender: %s", outbound.stats())
         await close_db()
 
+    return dp
+
+
+async def run_polling() -> None:
+    """
+    Polling mode: a single process fetches updates with getUpdates.
+    """
+    dp = create_dispatcher()
+    # активный вебхук не даёт работать getUpdates
+    await bot.delete_webhook()
+    await dp.start_polling(bot, tasks_concurrency_limit=UPDATE_CONCURRENCY or None)
+
+
+async def create_webhook_app(
+    worker_id: int = 0, migrate: bool = True
+) -> web.Application:
+    """
+    Webhook mode: an aiohttp application that can run in several instances
+    behind a load balancer. Worker 0 of every instance (re)sets the same webhook
+    on startup; nobody removes it on shutdown, so the others keep receiving updates.
+    """
+    if not WEBHOOK_BASE_URL:
+        raise RuntimeError("WEBHOOK_BASE_URL is required when BOT_MODE=webhook")
+    dp = create_dispatcher(worker_id, migrate, use_queue=UPDATE_QUEUE)
+
+    @dp.startup()
+    async def set_webhook() -> None:
+        if worker_id != 0:
+            return
+        await bot.set_webhook(
+            f"{WEBHOOK_BASE_URL}{WEBHOOK_PATH}",
+            secret_token=WEBHOOK_SECRET,
+            max_connections=WEBHOOK_MAX_CONNECTIONS,
+            allowed_updates=dp.resolve_used_update_types(),
+        )
+
+    return build_webhook_app(
+        dp,
+        bot,
+        path=WEBHOOK_PATH,
+        secret_token=WEBHOOK_SECRET,
+        concurrency=UPDATE_CONCURRENCY or None,
+        queue=dp.get("update_queue"),
+    )
+
+
+def run_webhook_worker(worker_id: int = 0) -> None:
+    """
+    Runs one webhook server process. With several workers every process binds
+    the same port with SO_REUSEPORT and the kernel balances connections.
+    """
+    logging.basicConfig(level=logging.INFO)
+    # run_app сам обрабатывает SIGINT/SIGTERM и дожидается on_shutdown
+    web.run_app(
+        create_webhook_app(worker_id, migrate=WEB_WORKERS <= 1),
+        host=WEBAPP_HOST,
+        port=WEBAPP_PORT,
+        reuse_port=WEB_WORKERS > 1 or None,
+        print=None,
+    )
+
+
+async def migrate_db() -> None:
+    """
+    Applies migrations once before worker processes are started.
+    """
+    await init_db()
+    await close_db()
+
+
+def main():
+    """
+    Main entry point of the bot: runs polling, a single webhook server or
+    a supervisor with WEB_WORKERS webhook processes, depending on BOT_MODE.
+    Database connections are closed on shutdown in every mode.
+    """
+    logging.basicConfig(level=logging.INFO)
+    if BOT_MODE == "webhook" and WEB_WORKERS > 1:
+        asyncio.run(migrate_db())
+        run_supervisor(run_webhook_worker, WEB_WORKERS)
+    elif BOT_MODE == "webhook":
+        run_webhook_worker()
+    else:
+        if WEB_WORKERS > 1:
+            logging.warning("WEB_WORKERS is ignored in polling mode")
+        asyncio.run(run_polling())
+
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()
@@ -0,0 +1,14 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    timestamp = "TIMESTAMPTZ" if db.capabilities.dialect == "postgres" else "TIMESTAMP"
+    return f"""
+        ALTER TABLE "broadcast" ADD "owner" VARCHAR(64);
+        ALTER TABLE "broadcast" ADD "lease_until" {timestamp};"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "broadcast" DROP COLUMN "owner";
+        ALTER TABLE "broadcast" DROP COLUMN "lease_until";"""
@@ -0,0 +1,67 @@
+import re
+
+from tortoise import BaseDBAsyncClient
+
+# Копия crud.order_name_words на момент миграции: код приложения может
+# поменяться, а миграция должна заполнять слова так же, как при создании заказа.
+
+
+def _name_words(name):
+    words = re.findall(r"\w+", (name or "").lower().replace("ё", "е"))
+    return list(dict.fromkeys(word[:64] for word in words))[:8]
+
+
+def _name_key(name):
+    if not name:
+        return None
+    return " ".join(name.lower().replace("ё", "е").split())[:128] or None
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    postgres = db.capabilities.dialect == "postgres"
+    pk = (
+        '"id" SERIAL NOT NULL PRIMARY KEY'
+        if postgres
+        else '"id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL'
+    )
+    await db.execute_script(f"""
+        CREATE TABLE IF NOT EXISTS "ordernameword" (
+    {pk},
+    "word" VARCHAR(64) NOT NULL,
+    "order_id" INT NOT NULL REFERENCES "order" ("id") ON DELETE CASCADE,
+    CONSTRAINT "uid_ordernamewo_word_685616" UNIQUE ("word", "order_id")
+);""")
+    _, rows = await db.execute_query('SELECT "id", "name" FROM "order"')
+    values = [[word, row[0]] for row in rows for word in _name_words(row[1])]
+    if values:
+        if postgres:
+            sql = 'INSERT INTO "ordernameword" ("word", "order_id") VALUES ($1, $2)'
+        else:
+            sql = 'INSERT INTO "ordernameword" ("word", "order_id") VALUES (?, ?)'
+        await db.execute_many(sql, values)
+    if postgres:
+        # LIKE 'key%' по индексу при любой сортировке базы (см. crud._prefix_filter)
+        return """
+        ALTER TABLE "order" DROP COLUMN "name_search";
+        CREATE INDEX IF NOT EXISTS "idx_ordernamewo_word_pattern" ON "ordernameword" ("word" varchar_pattern_ops, "order_id");
+        CREATE INDEX IF NOT EXISTS "idx_order_phone_s_pattern" ON "order" ("phone_search" varchar_pattern_ops);"""
+    return """
+        DROP INDEX IF EXISTS "idx_order_name_se_eca078";
+        ALTER TABLE "order" DROP COLUMN "name_search";"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    postgres = db.capabilities.dialect == "postgres"
+    await db.execute_script("""
+        DROP TABLE IF EXISTS "ordernameword";
+        DROP INDEX IF EXISTS "idx_order_phone_s_pattern";
+        ALTER TABLE "order" ADD "name_search" VARCHAR(128);""")
+    _, rows = await db.execute_query('SELECT "id", "name" FROM "order"')
+    if rows:
+        if postgres:
+            sql = 'UPDATE "order" SET "name_search" = $1 WHERE "id" = $2'
+        else:
+            sql = 'UPDATE "order" SET "name_search" = ? WHERE "id" = ?'
+        await db.execute_many(sql, [[_name_key(row[1]), row[0]] for row in rows])
+    return """
+        CREATE INDEX IF NOT EXISTS "idx_order_name_se_eca078" ON "order" ("name_search");"""
@@ -0,0 +1,20 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        UPDATE "cart" SET "quantity" = (
+    SELECT SUM("c2"."quantity") FROM "cart" AS "c2"
+    WHERE "c2"."user_id" = "cart"."user_id" AND "c2"."product_id" = "cart"."product_id"
+) WHERE "id" IN (
+    SELECT MIN("id") FROM "cart" GROUP BY "user_id", "product_id" HAVING COUNT(*) > 1
+);
+DELETE FROM "cart" WHERE "id" NOT IN (
+    SELECT MIN("id") FROM "cart" GROUP BY "user_id", "product_id"
+);
+CREATE UNIQUE INDEX IF NOT EXISTS "uid_cart_user_id_d2f7dd" ON "cart" ("user_id", "product_id");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "uid_cart_user_id_d2f7dd";"""
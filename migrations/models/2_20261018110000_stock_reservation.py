@@ -0,0 +1,18 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "stockreservation" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "quantity" INT NOT NULL,
+    "expires_at" TIMESTAMP NOT NULL,
+    "product_id" INT NOT NULL REFERENCES "product" ("id") ON DELETE CASCADE,
+    "user_id" BIGINT NOT NULL REFERENCES "user" ("id") ON DELETE CASCADE
+) /* Short-lived stock reservation made when the user reaches order confirmation. */;
+CREATE INDEX IF NOT EXISTS "idx_stockreserv_expires_31e28a" ON "stockreservation" ("expires_at");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "stockreservation";"""
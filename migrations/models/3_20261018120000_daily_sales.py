@@ -0,0 +1,19 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "dailysales" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "date" DATE NOT NULL,
+    "product_id" INT NOT NULL,
+    "quantity" INT NOT NULL,
+    "revenue" VARCHAR(40) NOT NULL,
+    "order_count" INT NOT NULL,
+    CONSTRAINT "uid_dailysales_date_dbeb24" UNIQUE ("date", "product_id")
+) /* Daily sales rollup, maintained incrementally on order creation and cancellation. */;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "dailysales";"""
@@ -0,0 +1,23 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "adminnotification" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "admin_id" BIGINT NOT NULL,
+    "text" TEXT NOT NULL,
+    "status" VARCHAR(16) NOT NULL,
+    "attempts" INT NOT NULL,
+    "error" VARCHAR(255),
+    "created_at" TIMESTAMP NOT NULL,
+    "updated_at" TIMESTAMP NOT NULL,
+    "order_id" INT NOT NULL REFERENCES "order" ("id") ON DELETE CASCADE,
+    CONSTRAINT "uid_adminnotifi_order_i_6a883e" UNIQUE ("order_id", "admin_id")
+) /* Delivery of a new-order notification to one admin. */;
+        CREATE INDEX IF NOT EXISTS "idx_adminnotifi_status_e1c5bd" ON "adminnotification" ("status");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "adminnotification";"""
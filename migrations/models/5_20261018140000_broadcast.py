@@ -0,0 +1,27 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "broadcast" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "text" TEXT NOT NULL,
+    "status" VARCHAR(16) NOT NULL,
+    "admin_id" BIGINT NOT NULL,
+    "locale" VARCHAR(8) NOT NULL,
+    "report_chat_id" BIGINT NOT NULL,
+    "report_message_id" INT,
+    "last_user_id" BIGINT NOT NULL,
+    "total" INT NOT NULL,
+    "sent" INT NOT NULL,
+    "failed" INT NOT NULL,
+    "blocked" INT NOT NULL,
+    "created_at" TIMESTAMP NOT NULL,
+    "finished_at" TIMESTAMP
+) /* Admin broadcast to all active users. Progress is checkpointed after every */;
+        CREATE INDEX IF NOT EXISTS "idx_broadcast_status_0a5d47" ON "broadcast" ("status");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "broadcast";"""
@@ -0,0 +1,59 @@
+from tortoise import BaseDBAsyncClient
+
+# SQLite: внешний FTS5-индекс над product, синхронизируется триггерами.
+# Обновление остатков/цены индекс не трогает — триггер только на name/description.
+SQLITE_UPGRADE = """
+        CREATE VIRTUAL TABLE IF NOT EXISTS "product_fts" USING fts5(
+    "name", "description",
+    content='product', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='2 3'
+);
+        CREATE VIRTUAL TABLE IF NOT EXISTS "product_fts_vocab" USING fts5vocab("product_fts", 'row');
+        CREATE TRIGGER IF NOT EXISTS "product_fts_ai" AFTER INSERT ON "product" BEGIN
+    INSERT INTO "product_fts" (rowid, "name", "description")
+    VALUES (new."id", new."name", new."description");
+END;
+        CREATE TRIGGER IF NOT EXISTS "product_fts_ad" AFTER DELETE ON "product" BEGIN
+    INSERT INTO "product_fts" ("product_fts", rowid, "name", "description")
+    VALUES ('delete', old."id", old."name", old."description");
+END;
+        CREATE TRIGGER IF NOT EXISTS "product_fts_au" AFTER UPDATE OF "name", "description" ON "product" BEGIN
+    INSERT INTO "product_fts" ("product_fts", rowid, "name", "description")
+    VALUES ('delete', old."id", old."name", old."description");
+    INSERT INTO "product_fts" (rowid, "name", "description")
+    VALUES (new."id", new."name", new."description");
+END;
+        INSERT INTO "product_fts" ("product_fts") VALUES ('rebuild');"""
+
+SQLITE_DOWNGRADE = """
+        DROP TRIGGER IF EXISTS "product_fts_au";
+        DROP TRIGGER IF EXISTS "product_fts_ad";
+        DROP TRIGGER IF EXISTS "product_fts_ai";
+        DROP TABLE IF EXISTS "product_fts_vocab";
+        DROP TABLE IF EXISTS "product_fts";"""
+
+# Postgres: индексы по выражениям, синхронизировать нечего.
+# Выражения должны совпадать с запросами в database/crud.py (search_products).
+POSTGRES_UPGRADE = """
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE INDEX IF NOT EXISTS "idx_product_search_tsv" ON "product" USING GIN (
+    to_tsvector('simple', coalesce("name", '') || ' ' || coalesce("description", ''))
+);
+        CREATE INDEX IF NOT EXISTS "idx_product_name_trgm" ON "product" USING GIN (lower("name") gin_trgm_ops);"""
+
+POSTGRES_DOWNGRADE = """
+        DROP INDEX IF EXISTS "idx_product_name_trgm";
+        DROP INDEX IF EXISTS "idx_product_search_tsv";"""
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "postgres":
+        return POSTGRES_UPGRADE
+    return SQLITE_UPGRADE
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "postgres":
+        return POSTGRES_DOWNGRADE
+    return SQLITE_DOWNGRADE
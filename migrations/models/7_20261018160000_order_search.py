@@ -0,0 +1,48 @@
+import re
+
+from tortoise import BaseDBAsyncClient
+
+# Копия crud.order_search_keys на момент миграции: код приложения может
+# поменяться, а миграция должна заполнять поля так же, как при создании заказа.
+
+
+def _name_key(name):
+    if not name:
+        return None
+    return " ".join(name.lower().replace("ё", "е").split())[:128] or None
+
+
+def _phone_key(phone):
+    digits = re.sub(r"\D", "", phone or "")
+    if len(digits) == 11 and digits.startswith("8"):
+        digits = "7" + digits[1:]
+    return digits[::-1][:20] or None
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    await db.execute_script("""
+        ALTER TABLE "order" ADD "name_search" VARCHAR(128);
+        ALTER TABLE "order" ADD "phone_search" VARCHAR(20);""")
+    _, rows = await db.execute_query('SELECT "id", "name", "phone" FROM "order"')
+    if rows:
+        if db.capabilities.dialect == "postgres":
+            sql = 'UPDATE "order" SET "name_search" = $1, "phone_search" = $2 WHERE "id" = $3'
+        else:
+            sql = 'UPDATE "order" SET "name_search" = ?, "phone_search" = ? WHERE "id" = ?'
+        await db.execute_many(
+            sql,
+            [[_name_key(row[1]), _phone_key(row[2]), row[0]] for row in rows],
+        )
+    return """
+        CREATE INDEX IF NOT EXISTS "idx_order_name_se_eca078" ON "order" ("name_search");
+        CREATE INDEX IF NOT EXISTS "idx_order_phone_s_6c9134" ON "order" ("phone_search");
+        CREATE INDEX IF NOT EXISTS "idx_order_created_a653c8" ON "order" ("created_at");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_order_created_a653c8";
+        DROP INDEX IF EXISTS "idx_order_phone_s_6c9134";
+        DROP INDEX IF EXISTS "idx_order_name_se_eca078";
+        ALTER TABLE "order" DROP COLUMN "phone_search";
+        ALTER TABLE "order" DROP COLUMN "name_search";"""
@@ -0,0 +1,24 @@
+from tortoise import BaseDBAsyncClient
+
+# cart.user_id покрыт уникальным индексом (user_id, product_id) из миграции 1,
+# order.created_at — индексом из миграции 7.
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE INDEX IF NOT EXISTS "idx_product_categor_edbd63" ON "product" ("category_id", "is_active", "id");
+        CREATE INDEX IF NOT EXISTS "idx_user_phone_4e3ecc" ON "user" ("phone");
+        CREATE INDEX IF NOT EXISTS "idx_order_user_id_0774cb" ON "order" ("user_id", "created_at");
+        CREATE INDEX IF NOT EXISTS "idx_orderitem_order_i_c64575" ON "orderitem" ("order_id");
+        CREATE INDEX IF NOT EXISTS "idx_orderitem_product_73a1e6" ON "orderitem" ("product_id");
+        CREATE INDEX IF NOT EXISTS "idx_stockreserv_user_id_21b09f" ON "stockreservation" ("user_id");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_stockreserv_user_id_21b09f";
+        DROP INDEX IF EXISTS "idx_orderitem_product_73a1e6";
+        DROP INDEX IF EXISTS "idx_orderitem_order_i_c64575";
+        DROP INDEX IF EXISTS "idx_order_user_id_0774cb";
+        DROP INDEX IF EXISTS "idx_user_phone_4e3ecc";
+        DROP INDEX IF EXISTS "idx_product_categor_edbd63";"""
@@ -0,0 +1,56 @@
+from tortoise import BaseDBAsyncClient
+
+# Денежные колонки переводятся в BIGINT с суммой в копейках.
+# (таблица, колонка, тип до миграции в Postgres)
+MONEY_COLUMNS = (
+    ("product", "price", "DECIMAL(10,2)"),
+    ("order", "total_price", "DECIMAL(10,2)"),
+    ("orderitem", "price_at_order", "DECIMAL(10,2)"),
+    ("dailysales", "revenue", "DECIMAL(12,2)"),
+)
+
+
+def _sqlite_swap(table: str, column: str, new_type: str, expression: str) -> str:
+    # SQLite не умеет ALTER COLUMN TYPE: новая колонка, перенос данных, замена
+    tmp = f"{column}_new"
+    return f"""
+        ALTER TABLE "{table}" ADD "{tmp}" {new_type};
+        UPDATE "{table}" SET "{tmp}" = {expression.format(column=f'"{column}"')};
+        ALTER TABLE "{table}" DROP COLUMN "{column}";
+        ALTER TABLE "{table}" RENAME COLUMN "{tmp}" TO "{column}";"""
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "postgres":
+        return "".join(
+            f"""
+        ALTER TABLE "{table}" ALTER COLUMN "{column}" TYPE BIGINT USING round("{column}"::numeric * 100)::bigint;"""
+            for table, column, _ in MONEY_COLUMNS
+        )
+    return "".join(
+        _sqlite_swap(
+            table,
+            column,
+            "BIGINT NOT NULL DEFAULT 0",
+            "CAST(ROUND(CAST({column} AS REAL) * 100) AS INTEGER)",
+        )
+        for table, column, _ in MONEY_COLUMNS
+    )
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "postgres":
+        return "".join(
+            f"""
+        ALTER TABLE "{table}" ALTER COLUMN "{column}" TYPE {old_type} USING "{column}" / 100.0;"""
+            for table, column, old_type in MONEY_COLUMNS
+        )
+    return "".join(
+        _sqlite_swap(
+            table,
+            column,
+            "VARCHAR(40) NOT NULL DEFAULT '0'",
+            "printf('%.2f', {column} / 100.0)",
+        )
+        for table, column, _ in MONEY_COLUMNS
+    )
@@ -0,0 +1,175 @@
+"""
+Background delivery of new-order notifications to admins.
+
+Checkout only stores one AdminNotification row per admin and returns.
+A small pool of workers delivers them through the rate-limited outbound
+queue, retries transient failures with exponential backoff and records
+the result (sent / failed) per admin.
+
+Every worker also sweeps the table periodically: rows left pending or
+sending by a crashed worker are claimed with a conditional UPDATE, so each
+of them is queued again by exactly one worker.
+"""
+
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Iterable
+
+from aiogram.exceptions import (
+    TelegramNetworkError,
+    TelegramRetryAfter,
+    TelegramServerError,
+)
+from aiogram.methods import SendMessage
+from tortoise.expressions import Q
+from tortoise.timezone import now
+
+from database.models import AdminNotification, Order
+from services.outbound import Priority, outbound
+
+logger = logging.getLogger(__name__)
+
+# временные ошибки — имеет смысл повторить
+TRANSIENT_ERRORS = (
+    TelegramNetworkError,
+    TelegramServerError,
+    TelegramRetryAfter,
+    asyncio.TimeoutError,
+)
+
+
+class AdminNotifier:
+    """
+    :param concurrency: Number of notifications delivered at once.
+    :param max_attempts: Attempts before a notification is marked as failed.
+    :param base_delay: Delay before the first retry in seconds (doubles each time).
+    :param stale_after: A pending or sending row not updated for this long is
+        considered abandoned (its worker died) and is claimed by the sweep.
+        Must exceed the longest retry delay.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 5,
+        max_attempts: int = 4,
+        base_delay: float = 2,
+        stale_after: timedelta = timedelta(minutes=2),
+    ):
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.stale_after = stale_after
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    async def notify(self, order: Order, text: str, admin_ids: Iterable[int]) -> None:
+        """
+        Records a pending notification for every admin and queues delivery.
+        """
+        rows = [
+            AdminNotification(order_id=order.id, admin_id=int(admin_id), text=text)
+            for admin_id in admin_ids
+        ]
+        if not rows:
+            return
+        await AdminNotification.bulk_create(rows, ignore_conflicts=True)
+        ids = await AdminNotification.filter(
+            order_id=order.id, status="pending"
+        ).values_list("id", flat=True)
+        for notification_id in ids:
+            self._queue.put_nowait(notification_id)
+
+    async def sweep(self) -> int:
+        """
+        Claims and queues notifications abandoned by any worker.
+        The claim bumps updated_at, so other workers skip the row.
+
+        :return: Number of claimed notifications.
+        """
+        stale = Q(
+            status__in=("pending", "sending"),
+            updated_at__lt=now() - self.stale_after,
+        )
+        claimed = 0
+        for notification_id in await AdminNotification.filter(stale).values_list(
+            "id", flat=True
+        ):
+            if await AdminNotification.filter(stale, id=notification_id).update(
+                status="pending", updated_at=now()
+            ):
+                self._queue.put_nowait(notification_id)
+                claimed += 1
+        if claimed:
+            logger.info("Claimed %s abandoned admin notifications", claimed)
+        return claimed
+
+    async def run(self, interval: float = 30) -> None:
+        """
+        Background task: delivery workers and the periodic sweep.
+
+        :param interval: Pause between sweeps in seconds.
+        """
+        await asyncio.gather(
+            self._sweeper(interval),
+            *(self._worker() for _ in range(self.concurrency)),
+        )
+
+    async def _sweeper(self, interval: float) -> None:
+        while True:
+            try:
+                await self.sweep()
+            except Exception:
+                logger.exception("Failed to sweep admin notifications")
+            await asyncio.sleep(interval)
+
+    async def _worker(self) -> None:
+        while True:
+            notification_id = await self._queue.get()
+            try:
+                await self._deliver(notification_id)
+            except Exception:
+                logger.exception("Admin notification %s failed", notification_id)
+
+    async def _deliver(self, notification_id: int) -> None:
+        # забираем запись себе: другой процесс её уже не отправит
+        claimed = await AdminNotification.filter(
+            id=notification_id, status="pending"
+        ).update(status="sending", updated_at=now())
+        if not claimed:
+            return
+        row = await AdminNotification.get(id=notification_id)
+        attempts = row.attempts + 1
+        try:
+            await outbound.submit(
+                SendMessage(chat_id=row.admin_id, text=row.text), Priority.ADMIN
+            )
+        except TRANSIENT_ERRORS as e:
+            if attempts < self.max_attempts:
+                await self._save(notification_id, "pending", attempts, e)
+                delay = self.base_delay * 2 ** (attempts - 1)
+                asyncio.get_running_loop().call_later(
+                    delay, self._queue.put_nowait, notification_id
+                )
+            else:
+                await self._save(notification_id, "failed", attempts, e)
+        except Exception as e:
+            # бот заблокирован, чат не найден и т.п. — повтор не поможет
+            await self._save(notification_id, "failed", attempts, e)
+        else:
+            await self._save(notification_id, "sent", attempts)
+
+    @staticmethod
+    async def _save(
+        notification_id: int, status: str, attempts: int, error: Exception = None
+    ) -> None:
+        await AdminNotification.filter(id=notification_id).update(
+            status=status,
+            attempts=attempts,
+            error=repr(error)[:255] if error else None,
+            updated_at=now(),
+        )
+        if status == "failed":
+            logger.warning("Admin notification %s failed: %r", notification_id, error)
+
+
+admin_notifier = AdminNotifier()
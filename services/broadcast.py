@@ -0,0 +1,238 @@
+"""
+Admin broadcasts to all active users.
+
+Users are read in keyset batches; every batch is sent through the
+rate-limited outbound queue (bulk lane, so customer and admin messages go
+first) and the progress is checkpointed in the Broadcast row.
+
+A broadcast is sent by one worker at a time: the worker claims a lease on
+the row with a conditional UPDATE and renews it at every checkpoint. Every
+worker periodically looks for running broadcasts with an expired lease
+(their owner crashed or was restarted) and takes them over from the last
+checkpoint: users of the interrupted batch may get the message twice,
+nobody is skipped.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError
+from aiogram.methods import EditMessageText, SendMessage
+from tortoise.expressions import Q
+from tortoise.timezone import now
+
+from bot.keyboards.admin.broadcast_kb import broadcast_progress_kb
+from database.crud import deactivate_users, get_active_user_ids
+from database.models import Broadcast
+from services.i18n.translations import Translator
+from services.outbound import Priority, outbound
+
+logger = logging.getLogger(__name__)
+
+
+class BroadcastRunner:
+    """
+    :param batch_size: Users per batch (and per checkpoint).
+    :param report_interval: Minimum pause between progress reports in seconds.
+    :param lease_seconds: How long a claimed broadcast stays with this worker
+        without a checkpoint; after that another worker may take it over.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 50,
+        report_interval: float = 5,
+        lease_seconds: float = 120,
+    ):
+        self.batch_size = batch_size
+        self.report_interval = report_interval
+        self.lease_seconds = lease_seconds
+        self.owner: Optional[str] = None
+        self.bot: Optional[Bot] = None
+        self.translator: Optional[Translator] = None
+        self._running: Dict[int, asyncio.Task] = {}
+
+    def configure(self, bot: Bot, translator: Translator) -> None:
+        self.bot = bot
+        self.translator = translator
+        # имя хоста и pid отличают воркеры всех инстансов бота
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+
+    def start(self, broadcast_id: int) -> None:
+        """
+        Starts (or resumes) a broadcast in the background.
+        """
+        if broadcast_id in self._running:
+            return
+        task = asyncio.create_task(self._run(broadcast_id))
+        self._running[broadcast_id] = task
+        task.add_done_callback(lambda _: self._running.pop(broadcast_id, None))
+
+    async def resume(self) -> None:
+        """
+        Starts running broadcasts that nobody holds a live lease on:
+        new ones and those whose owner stopped renewing the lease.
+        """
+        expired = Q(lease_until__isnull=True) | Q(lease_until__lt=now())
+        for broadcast_id in await Broadcast.filter(
+            expired, status="running"
+        ).values_list("id", flat=True):
+            if broadcast_id not in self._running:
+                logger.info("Resuming broadcast %s", broadcast_id)
+                self.start(broadcast_id)
+
+    async def run(self, interval: float = 30) -> None:
+        """
+        Background task: periodically takes over broadcasts with an expired lease.
+
+        :param interval: Pause between checks in seconds.
+        """
+        while True:
+            try:
+                await self.resume()
+            except Exception:
+                logger.exception("Failed to resume broadcasts")
+            await asyncio.sleep(interval)
+
+    def _lease(self) -> datetime:
+        return now() + timedelta(seconds=self.lease_seconds)
+
+    async def _claim(self, broadcast_id: int) -> bool:
+        """
+        Takes the lease on a running broadcast if nobody holds a live one.
+        Check and update are a single statement, so only one worker wins.
+        """
+        expired = Q(lease_until__isnull=True) | Q(lease_until__lt=now())
+        claimed = await Broadcast.filter(
+            expired, id=broadcast_id, status="running"
+        ).update(owner=self.owner, lease_until=self._lease())
+        return claimed > 0
+
+    async def _run(self, broadcast_id: int) -> None:
+        if not await self._claim(broadcast_id):
+            return
+        broadcast = await Broadcast.get(id=broadcast_id)
+        started = time.monotonic()
+        done_at_start = broadcast.sent + broadcast.failed + broadcast.blocked
+        last_report = 0.0
+        try:
+            while True:
+                row = (
+                    await Broadcast.filter(id=broadcast_id)
+                    .first()
+                    .values("status", "owner")
+                )
+                if row is None or row["owner"] != self.owner:
+                    logger.warning("Broadcast %s lease lost", broadcast_id)
+                    return
+                if row["status"] != "running":
+                    broadcast.status = row["status"]
+                    break
+                user_ids = await get_active_user_ids(
+                    broadcast.last_user_id, self.batch_size
+                )
+                if not user_ids:
+                    broadcast.status = "done"
+                    break
+                if not await self._send_batch(broadcast, user_ids):
+                    logger.warning("Broadcast %s lease lost", broadcast_id)
+                    return
+                if time.monotonic() - last_report >= self.report_interval:
+                    last_report = time.monotonic()
+                    await self._report(broadcast, started, done_at_start)
+            broadcast.finished_at = now()
+            await Broadcast.filter(id=broadcast_id, owner=self.owner).update(
+                status=broadcast.status,
+                finished_at=broadcast.finished_at,
+                lease_until=None,
+            )
+            await self._report(broadcast, started, done_at_start)
+        except asyncio.CancelledError:
+            # остановка процесса: статус остаётся running, после истечения
+            # лизы рассылку подхватит другой воркер
+            raise
+        except Exception:
+            logger.exception("Broadcast %s crashed", broadcast_id)
+
+    async def _send_batch(self, broadcast: Broadcast, user_ids: list) -> bool:
+        """
+        Sends one batch and checkpoints it, renewing the lease.
+        :return: False if the lease was taken over by another worker.
+        """
+        results = await asyncio.gather(
+            *(
+                outbound.submit(
+                    SendMessage(chat_id=user_id, text=broadcast.text), Priority.BULK
+                )
+                for user_id in user_ids
+            ),
+            return_exceptions=True,
+        )
+        blocked = []
+        for user_id, result in zip(user_ids, results):
+            if isinstance(result, TelegramForbiddenError):
+                blocked.append(user_id)
+            elif isinstance(result, Exception):
+                broadcast.failed += 1
+            else:
+                broadcast.sent += 1
+        broadcast.blocked += len(blocked)
+        broadcast.last_user_id = user_ids[-1]
+        await deactivate_users(blocked)
+        updated = await Broadcast.filter(id=broadcast.id, owner=self.owner).update(
+            last_user_id=broadcast.last_user_id,
+            sent=broadcast.sent,
+            failed=broadcast.failed,
+            blocked=broadcast.blocked,
+            lease_until=self._lease(),
+        )
+        return updated > 0
+
+    async def _report(
+        self, broadcast: Broadcast, started: float, done_at_start: int
+    ) -> None:
+        if not broadcast.report_message_id:
+            return
+        t = self.translator.for_locale(broadcast.locale)
+        done = broadcast.sent + broadcast.failed + broadcast.blocked
+        elapsed = time.monotonic() - started
+        rate = (done - done_at_start) / elapsed if elapsed > 0 else 0.0
+        remaining = max(broadcast.total - done, 0)
+        eta = timedelta(seconds=int(remaining / rate)) if rate else "—"
+        text = t("broadcast.progress").format(
+            id=broadcast.id,
+            status=t(f"broadcast.status.{broadcast.status}"),
+            sent=broadcast.sent,
+            total=broadcast.total,
+            failed=broadcast.failed,
+            blocked=broadcast.blocked,
+            rate=f"{rate:.1f}",
+            eta=eta,
+        )
+        markup = (
+            broadcast_progress_kb(broadcast.id, t)
+            if broadcast.status == "running"
+            else None
+        )
+        try:
+            await outbound.submit(
+                EditMessageText(
+                    chat_id=broadcast.report_chat_id,
+                    message_id=broadcast.report_message_id,
+                    text=text,
+                    reply_markup=markup,
+                ),
+                Priority.ADMIN,
+            )
+        except TelegramBadRequest as e:
+            if "message is not modified" not in str(e):
+                logger.warning("Broadcast %s report failed: %s", broadcast.id, e)
+
+
+broadcaster = BroadcastRunner()
@@ -0,0 +1,110 @@
+"""
+Cross-process cache invalidation over Redis pub/sub.
+
+Every process keeps its own in-memory caches (catalog snapshot, user locales).
+When one process changes data it invalidates its cache locally and publishes
+a message; the other processes receive it and drop their copies.
+"""
+
+import asyncio
+import json
+import logging
+import uuid
+from typing import Callable, Dict, Optional, Set
+
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "demo_shop:invalidate"
+
+
+class CacheBus:
+    """
+    :param redis: redis.asyncio client (e.g. RedisStorage.redis).
+    :param channel: Pub/sub channel shared by all processes.
+    """
+
+    def __init__(self, redis, channel: str = CHANNEL):
+        self.redis = redis
+        self.channel = channel
+        # свои сообщения не обрабатываем повторно
+        self.node_id = uuid.uuid4().hex
+        self._handlers: Dict[str, Callable[[str], None]] = {}
+        self._pending: Set[asyncio.Task] = set()
+
+    def subscribe(self, kind: str, handler: Callable[[str], None]) -> None:
+        """
+        Registers a local invalidation handler for a message kind.
+        The handler gets the message payload and must not publish again.
+        """
+        self._handlers[kind] = handler
+
+    def publish(self, kind: str, payload: str = "") -> None:
+        """
+        Publishes an invalidation message in the background (fire-and-forget),
+        so it can be called from synchronous code inside the event loop.
+        """
+        message = json.dumps({"node": self.node_id, "kind": kind, "payload": payload})
+        task = asyncio.get_running_loop().create_task(self._publish(message))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _publish(self, message: str) -> None:
+        try:
+            await self.redis.publish(self.channel, message)
+        except (RedisError, OSError):
+            logger.warning("Failed to publish cache invalidation: %s", message)
+
+    async def run(self, retry_delay: float = 1) -> None:
+        """
+        Background task: listens to the channel and calls local handlers.
+        Reconnects on Redis errors.
+        """
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._dispatch(message["data"])
+            except (RedisError, OSError):
+                logger.warning("Cache bus disconnected, reconnecting")
+                await asyncio.sleep(retry_delay)
+            finally:
+                await pubsub.aclose()
+
+    def _dispatch(self, data) -> None:
+        try:
+            message = json.loads(data)
+        except ValueError:
+            return
+        if message.get("node") == self.node_id:
+            return
+        handler = self._handlers.get(message.get("kind"))
+        if handler is None:
+            return
+        try:
+            handler(message.get("payload", ""))
+        except Exception:
+            logger.exception("Cache invalidation handler failed: %s", message)
+
+
+cache_bus: Optional[CacheBus] = None
+
+
+def setup_cache_bus(redis) -> CacheBus:
+    """
+    Creates the process-wide bus; publish_invalidation() is a no-op until then.
+    """
+    global cache_bus
+    cache_bus = CacheBus(redis)
+    return cache_bus
+
+
+def publish_invalidation(kind: str, payload: str = "") -> None:
+    """
+    Notifies other processes that a cache must be dropped.
+    """
+    if cache_bus is not None:
+        cache_bus.publish(kind, payload)
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+from types import MappingProxyType
+from typing import Dict, Mapping, NamedTuple, Optional, Tuple
+
+from database.crud import count_products_in_category
+from database.models import Category, Product
+from services.cache_bus import publish_invalidation
+
+
+class CatalogSnapshot(NamedTuple):
+    """
+    Immutable in-memory view of the active catalog.
+
+    :param version: Catalog version the snapshot was built for.
+    :param categories: Categories that have active products, ordered by name.
+    :param products_by_category: Category ID -> products ordered by ID.
+    :param products_by_id: Product ID -> product.
+    :param category_by_id: Category ID -> category.
+    """
+
+    version: int
+    categories: Tuple[Category, ...]
+    products_by_category: Mapping[int, Tuple[Product, ...]]
+    products_by_id: Mapping[int, Product]
+    category_by_id: Mapping[int, Category]
+
+
+class CatalogCache:
+    """
+    Keeps a single catalog snapshot in memory and rebuilds it lazily
+    after the catalog has been invalidated by an admin change.
+    """
+
+    def __init__(self):
+        self._version = 0
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._lock = asyncio.Lock()
+        self._counts: Dict[int, int] = {}
+        self._counts_version = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def invalidate(self) -> None:
+        """
+        Marks the current snapshot as stale. The next read rebuilds it.
+        """
+        self._version += 1
+
+    async def get(self) -> CatalogSnapshot:
+        """
+        Returns the current snapshot, rebuilding it if the catalog has changed.
+        Concurrent readers share a single rebuild.
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == self._version:
+            return snapshot
+        async with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.version == self._version:
+                return snapshot
+            version = self._version
+            snapshot = await self._build(version)
+            self._snapshot = snapshot
+            return snapshot
+
+    async def category_count(self, category_id: int) -> int:
+        """
+        Returns the cached number of active products in a category.
+        The cache is dropped together with the snapshot on invalidation.
+        """
+        if self._counts_version != self._version:
+            self._counts = {}
+            self._counts_version = self._version
+        count = self._counts.get(category_id)
+        if count is None:
+            version = self._version
+            count = await count_products_in_category(category_id)
+            if version == self._version:
+                self._counts[category_id] = count
+        return count
+
+    @staticmethod
+    async def _build(version: int) -> CatalogSnapshot:
+        products = (
+            await Product.filter(is_active=True, category_id__isnull=False)
+            .prefetch_related("category")
+            .order_by("id")
+        )
+        grouped: dict[int, list[Product]] = {}
+        categories: dict[int, Category] = {}
+        for product in products:
+            grouped.setdefault(product.category_id, []).append(product)
+            categories[product.category_id] = product.category
+        ordered_categories = tuple(sorted(categories.values(), key=lambda c: c.name))
+        return CatalogSnapshot(
+            version=version,
+            categories=ordered_categories,
+            products_by_category=MappingProxyType(
+                {cat_id: tuple(items) for cat_id, items in grouped.items()}
+            ),
+            products_by_id=MappingProxyType({p.id: p for p in products}),
+            category_by_id=MappingProxyType({c.id: c for c in ordered_categories}),
+        )
+
+
+catalog_cache = CatalogCache()
+
+
+async def get_catalog() -> CatalogSnapshot:
+    """
+    Returns the current catalog snapshot.
+    """
+    return await catalog_cache.get()
+
+
+async def get_category_count(category_id: int) -> int:
+    """
+    Returns the cached number of active products in a category.
+    """
+    return await catalog_cache.category_count(category_id)
+
+
+def invalidate_catalog() -> None:
+    """
+    Must be called after any change to products or categories.
+    Other worker processes are notified over the cache bus.
+    """
+    catalog_cache.invalidate()
+    publish_invalidation("catalog")
@@ -0,0 +1,148 @@
+"""
+Short-lived chat messages ("toasts") deleted after a timeout.
+
+Handlers call send_ephemeral() and return immediately. One background task
+keeps a timer heap of pending deletions, sleeps until the nearest one and
+deletes all due messages in batches (one deleteMessages call per chat).
+Pending deletions are mirrored in a Redis sorted set, so they survive a
+restart and are shared between worker processes.
+"""
+
+import asyncio
+import heapq
+import logging
+import time
+from collections import defaultdict
+from typing import List, Optional, Set, Tuple
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY = "demo_shop:ephemeral"
+
+
+class EphemeralMessages:
+    def __init__(self):
+        self.bot: Optional[Bot] = None
+        self.redis = None
+        self._heap: List[Tuple[float, int, int]] = []
+        self._wake = asyncio.Event()
+        self._pending: Set[asyncio.Task] = set()
+
+    def configure(self, bot: Bot, redis=None) -> None:
+        """
+        :param bot: Bot used to send and delete messages.
+        :param redis: Optional redis.asyncio client for persistence.
+        """
+        self.bot = bot
+        self.redis = redis
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def send(self, chat_id: int, text: str, ttl: float = 1) -> None:
+        """
+        Sends a message in the background and deletes it after ttl seconds.
+        """
+        self._spawn(self._send(chat_id, text, ttl))
+
+    async def _send(self, chat_id: int, text: str, ttl: float) -> None:
+        try:
+            message = await self.bot.send_message(chat_id, text)
+        except TelegramAPIError as e:
+            logger.debug("Ephemeral message to %s not sent: %s", chat_id, e)
+            return
+        self.schedule(chat_id, message.message_id, ttl)
+
+    def schedule(self, chat_id: int, message_id: int, ttl: float) -> None:
+        """
+        Schedules deletion of an already sent message.
+        """
+        due = time.time() + ttl
+        heapq.heappush(self._heap, (due, chat_id, message_id))
+        self._wake.set()
+        if self.redis is not None:
+            self._spawn(self._persist(due, chat_id, message_id))
+
+    async def _persist(self, due: float, chat_id: int, message_id: int) -> None:
+        try:
+            await self.redis.zadd(REDIS_KEY, {f"{chat_id}:{message_id}": due})
+        except (RedisError, OSError):
+            logger.warning(
+                "Ephemeral deletion not persisted: %s:%s", chat_id, message_id
+            )
+
+    async def _restore(self) -> None:
+        if self.redis is None:
+            return
+        try:
+            entries = await self.redis.zrange(REDIS_KEY, 0, -1, withscores=True)
+        except (RedisError, OSError):
+            logger.warning("Pending ephemeral deletions not restored")
+            return
+        for member, due in entries:
+            member = member.decode() if isinstance(member, bytes) else member
+            chat_id, _, message_id = member.partition(":")
+            heapq.heappush(self._heap, (due, int(chat_id), int(message_id)))
+
+    async def run(self) -> None:
+        """
+        Background task: deletes messages as their timers expire.
+        """
+        await self._restore()
+        while True:
+            now = time.time()
+            if self._heap and self._heap[0][0] <= now:
+                due = []
+                while self._heap and self._heap[0][0] <= now:
+                    _, chat_id, message_id = heapq.heappop(self._heap)
+                    due.append((chat_id, message_id))
+                await self._delete(due)
+                continue
+            self._wake.clear()
+            timeout = self._heap[0][0] - now if self._heap else None
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _claim(self, due: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        # после рестарта одну запись могут поднять несколько воркеров:
+        # удаляет тот, кто первым убрал её из Redis
+        if self.redis is None:
+            return due
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for chat_id, message_id in due:
+                    pipe.zrem(REDIS_KEY, f"{chat_id}:{message_id}")
+                removed = await pipe.execute()
+        except (RedisError, OSError):
+            return due
+        return [item for item, ok in zip(due, removed) if ok]
+
+    async def _delete(self, due: List[Tuple[int, int]]) -> None:
+        by_chat = defaultdict(list)
+        for chat_id, message_id in await self._claim(due):
+            by_chat[chat_id].append(message_id)
+        for chat_id, message_ids in by_chat.items():
+            # deleteMessages принимает до 100 сообщений за раз
+            for i in range(0, len(message_ids), 100):
+                try:
+                    await self.bot.delete_messages(chat_id, message_ids[i : i + 100])
+                except TelegramAPIError as e:
+                    logger.debug("Ephemeral messages in %s not deleted: %s", chat_id, e)
+
+
+ephemeral = EphemeralMessages()
+
+
+def send_ephemeral(chat_id: int, text: str, ttl: float = 1) -> None:
+    """
+    Fire-and-forget: sends a message that disappears after ttl seconds.
+    """
+    ephemeral.send(chat_id, text, ttl)
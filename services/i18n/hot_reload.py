@@ -0,0 +1,21 @@
+import asyncio
+import logging
+
+from services.i18n.translations import Translator
+
+logger = logging.getLogger(__name__)
+
+
+async def run_locale_watcher(translator: Translator, interval: float = 2) -> None:
+    """
+    Background task: polls locale files by mtime and hot-reloads the changed ones.
+
+    :param translator: Translator whose bundles are swapped.
+    :param interval: Pause between checks in seconds.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(translator.reload)
+        except Exception:
+            logger.exception("Locale hot reload failed")
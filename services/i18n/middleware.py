@@ -26,7 +26,7 @@ def _tg_lang(update: Update) -> Optional[str]:
 class LocaleMiddleware(BaseMiddleware):
     def __init__(self, translator: Translator, locale_repo):
         self.tr = translator
-        self.repo = locale_repo  # services.LocaleRepo
+        self.repo = locale_repo  # services.LocaleRepo / CachedLocaleRepo
 
     async def __call__(
         self,
@@ -40,6 +40,8 @@ class LocaleMiddleware(BaseMiddleware):
             uid = event.message.from_user.id
         elif event.callback_query and event.callback_query.from_user:
             uid = event.callback_query.from_user.id
+        elif event.inline_query and event.inline_query.from_user:
+            uid = event.inline_query.from_user.id
 
         saved = None
         if uid:
@@ -0,0 +1,109 @@
+# i18n/plurals.py
+"""
+CLDR plural rules (cardinal, integer counts) compiled into one function per
+locale. Lookup is a single dict access regardless of the number of locales.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, Tuple
+
+PluralRule = Callable[[int], str]
+
+
+def _one_other(n: int) -> str:
+    # en, de, kk, ...
+    return "one" if n == 1 else "other"
+
+
+def _east_slavic(n: int) -> str:
+    # ru, uk, be
+    n10, n100 = n % 10, n % 100
+    if n10 == 1 and n100 != 11:
+        return "one"
+    if 2 <= n10 <= 4 and not 12 <= n100 <= 14:
+        return "few"
+    return "many"
+
+
+def _polish(n: int) -> str:
+    n10, n100 = n % 10, n % 100
+    if n == 1:
+        return "one"
+    if 2 <= n10 <= 4 and not 12 <= n100 <= 14:
+        return "few"
+    return "many"
+
+
+def _other(n: int) -> str:
+    # языки без форм множественного числа
+    return "other"
+
+
+# семейство правил -> (функция, категории, которые она возвращает)
+_FAMILIES: Dict[str, Tuple[PluralRule, Tuple[str, ...]]] = {
+    "one_other": (_one_other, ("one", "other")),
+    "east_slavic": (_east_slavic, ("one", "few", "many")),
+    "polish": (_polish, ("one", "few", "many")),
+    "other": (_other, ("other",)),
+}
+
+# локаль -> семейство правил; новая локаль добавляется строкой в таблицу
+PLURAL_TABLE: Dict[str, str] = {
+    "en": "one_other",
+    "de": "one_other",
+    "kk": "one_other",
+    "ru": "east_slavic",
+    "uk": "east_slavic",
+    "be": "east_slavic",
+    "pl": "polish",
+}
+
+_compiled: Dict[str, Tuple[PluralRule, Tuple[str, ...]]] = {}
+
+
+def _compile(locale: str) -> Tuple[PluralRule, Tuple[str, ...]]:
+    rule, categories = _FAMILIES[PLURAL_TABLE.get(locale, "one_other")]
+
+    def plural(n: int) -> str:
+        return rule(abs(int(n)))
+
+    _compiled[locale] = (plural, categories)
+    return _compiled[locale]
+
+
+def plural_rule(locale: str) -> PluralRule:
+    """
+    Returns the compiled plural function for a locale (English rules if unknown).
+    """
+    return (_compiled.get(locale) or _compile(locale))[0]
+
+
+def plural_categories(locale: str) -> Tuple[str, ...]:
+    """
+    Returns plural categories used by the locale, e.g. ("one", "few", "many").
+    """
+    return (_compiled.get(locale) or _compile(locale))[1]
+
+
+def register_plural_rule(
+    locale: str, rule: PluralRule, categories: Tuple[str, ...]
+) -> None:
+    """
+    Registers a custom rule for a locale that does not fit the built-in families.
+    """
+    family = f"custom:{locale}"
+    _FAMILIES[family] = (rule, categories)
+    PLURAL_TABLE[locale] = family
+    _compiled.pop(locale, None)
+
+
+def sample_counts(locale: str, limit: int = 200) -> Dict[str, int]:
+    """
+    Returns the smallest count for every plural category of the locale.
+    """
+    rule = plural_rule(locale)
+    samples: Dict[str, int] = {}
+    for n in range(limit):
+        samples.setdefault(rule(n), n)
+    return samples
@@ -2,9 +2,17 @@
 from __future__ import annotations
 
 import json
+import logging
 from pathlib import Path
+from string import Formatter
 from typing import Any, Callable, Dict, Optional
 
+from services.i18n.plurals import plural_categories, plural_rule, sample_counts
+
+_FORMATTER = Formatter()
+
+logger = logging.getLogger(__name__)
+
 
 class _SafeDict(dict):
     def __missing__(self, key):
@@ -12,47 +20,259 @@ class _SafeDict(dict):
         return "{" + key + "}"
 
 
-def _russian_plural(n: int) -> str:
-    n = abs(int(n))
-    n100 = n % 100
-    n10 = n % 10
-    if 11 <= n100 <= 14:
-        return "many"
-    if n10 == 1:
-        return "one"
-    if 2 <= n10 <= 4:
-        return "few"
-    return "many"
+class _Template:
+    """
+    Translation string pre-parsed once with string.Formatter.
+    render() gives the same result as str.format_map(_SafeDict(vars)),
+    but skips re-parsing; templates without placeholders are returned as is.
+    """
+
+    __slots__ = ("raw", "parts", "simple")
+
+    def __init__(self, raw: str):
+        self.raw = raw
+        self.parts = None
+        self.simple = True
+        try:
+            parsed = list(_FORMATTER.parse(raw))
+        except ValueError:
+            # битый шаблон — format_map всё равно упадёт и вернёт строку как есть
+            return
+        if all(field is None for _, field, _, _ in parsed) and not (
+            "{" in raw or "}" in raw
+        ):
+            return
+        self.parts = tuple(parsed)
+        # сложные поля ({a.b}, {0}, вложенные спецификаторы) отдаём format_map
+        self.simple = all(
+            field is None or (field.isidentifier() and "{" not in (spec or ""))
+            for _, field, spec, _ in parsed
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self.raw)
+
+    def render(self, vars: Dict[str, Any]) -> str:
+        if self.parts is None:
+            return self.raw
+        if not self.simple:
+            return self._render_slow(vars)
+        out = []
+        for literal, field, spec, conversion in self.parts:
+            if literal:
+                out.append(literal)
+            if field is None:
+                continue
+            if field not in vars:
+                if spec or conversion:
+                    return self._render_slow(vars)
+                out.append("{" + field + "}")
+                continue
+            value = vars[field]
+            if conversion:
+                value = _FORMATTER.convert_field(value, conversion)
+            try:
+                out.append(format(value, spec) if spec else str(value))
+            except Exception:
+                return self.raw
+        return "".join(out)
+
+    def _render_slow(self, vars: Dict[str, Any]) -> str:
+        try:
+            return self.raw.format_map(_SafeDict(vars))
+        except Exception:
+            return self.raw
+
+    def check(self, vars: Dict[str, Any]) -> None:
+        """
+        Formats every placeholder present in vars the way render() does,
+        but raises instead of falling back to the raw string.
+        Placeholders missing from vars are skipped: they are passed at runtime.
+        """
+        for _, field, spec, conversion in _FORMATTER.parse(self.raw):
+            if field is None:
+                continue
+            name = field.partition(".")[0].partition("[")[0]
+            if name not in vars:
+                continue
+            value, _ = _FORMATTER.get_field(field, (), vars)
+            if conversion:
+                value = _FORMATTER.convert_field(value, conversion)
+            # вложенные спецификаторы ({x:{width}}) зависят от других переменных
+            if spec and "{" not in spec:
+                format(value, spec)
+
+
+class _PluralEntry:
+    """
+    Compiled plural key: plural form -> template.
+    """
+
+    __slots__ = ("forms", "default")
+
+    def __init__(self, forms: Dict[str, Any]):
+        self.forms = {form: _Template(str(val)) for form, val in forms.items()}
+        # если по ключу лежит объект для плюрализации — translate берёт "other"
+        self.default = (
+            self.forms.get("other")
+            or self.forms.get("many")
+            or self.forms.get("one")
+            or next(iter(self.forms.values()), _Template(""))
+        )
+
+    def pick(self, form: str) -> Optional[_Template]:
+        return (
+            self.forms.get(form)
+            or self.forms.get("other")
+            or self.forms.get("many")
+            or self.forms.get("one")
+        )
+
+
+def _compile_value(val: Any):
+    if isinstance(val, dict):
+        return _PluralEntry(val)
+    return _Template(str(val))
 
 
-def _english_plural(n: int) -> str:
-    return "one" if abs(int(n)) == 1 else "other"
+def _placeholders(val: Any) -> set:
+    """
+    Returns placeholder names used by a translation value (all plural forms).
+    Raises ValueError for a malformed template.
+    """
+    values = val.values() if isinstance(val, dict) else (val,)
+    return {
+        field
+        for v in values
+        for _, field, _, _ in _FORMATTER.parse(str(v))
+        if field is not None
+    }
 
 
 class Translator:
     def __init__(
         self,
         locales_dir: Path,
-        default_locale: str = "russ",
-        supported: tuple[str, ...] = ("russ", "en"),
+        default_locale: str = "ru",
+        supported: tuple[str, ...] = ("ru", "en"),
     ):
         self.locales_dir = Path(locales_dir)
         self.default = default_locale
         self.supported = set(supported)
         self._cache: Dict[str, Dict[str, Any]] = {}
+        self._mtimes: Dict[str, int] = {}
+        # скомпилированные бандлы: локаль -> ключ -> _Template/_PluralEntry
+        self._bundles: Dict[str, Dict[str, Any]] = {}
+        self._tr: Dict[str, Callable[..., str]] = {}
+        self._trn: Dict[str, Callable[..., str]] = {}
+
+    def compile(self) -> None:
+        """
+        Loads all supported locales and builds flat bundles with default-locale
+        fallbacks merged in and every string pre-parsed.
+        Call once at startup; otherwise locales are compiled on first use.
+        """
+        for locale in self.supported | {self.default}:
+            self._bundle(self.normalize(locale))
+
+    def _bundle(self, locale: str) -> Dict[str, Any]:
+        bundle = self._bundles.get(locale)
+        if bundle is None:
+            bundle = self._compile_bundle(
+                self._load(self.default), self._load(locale), locale
+            )
+            self._bundles[locale] = bundle
+        return bundle
+
+    def _compile_bundle(
+        self, default: Dict[str, Any], data: Dict[str, Any], locale: str
+    ) -> Dict[str, Any]:
+        merged = dict(default) if locale != self.default else {}
+        merged.update(data)
+        return {key: _compile_value(val) for key, val in merged.items()}
+
+    def _path(self, locale: str) -> Path:
+        return self.locales_dir / locale / f"{locale}.json"
+
+    def _mtime(self, locale: str) -> int:
+        try:
+            return self._path(locale).stat().st_mtime_ns
+        except FileNotFoundError:
+            return 0
 
     def _load(self, locale: str) -> Dict[str, Any]:
         locale = self.normalize(locale)
         if locale in self._cache:
             return self._cache[locale]
-        path = self.locales_dir / locale / f"{locale}.json"
+        self._mtimes[locale] = self._mtime(locale)
         try:
-            data = json.loads(path.read_text(encoding="utf-8"))
+            data = json.loads(self._path(locale).read_text(encoding="utf-8"))
         except FileNotFoundError:
             data = {}
         self._cache[locale] = data
         return data
 
+    def reload(self) -> list[str]:
+        """
+        Re-reads locale files changed since the last load and atomically swaps
+        in recompiled bundles. A changed file is rejected (the old bundle keeps
+        being served) if it is not valid JSON or a key gains placeholders
+        that the previous version did not have — callers would not pass them.
+
+        :return: Reloaded locales.
+        """
+        fresh: Dict[str, Dict[str, Any]] = {}
+        mtimes: Dict[str, int] = {}
+        for locale in {self.normalize(loc) for loc in self.supported}:
+            mtime = self._mtime(locale)
+            if mtime == self._mtimes.get(locale):
+                continue
+            try:
+                data = json.loads(self._path(locale).read_text(encoding="utf-8"))
+                if not isinstance(data, dict):
+                    raise ValueError("top level must be an object")
+                self._check_placeholders(locale, data)
+            except FileNotFoundError:
+                continue
+            except ValueError as e:
+                logger.error(
+                    "Locale %s not reloaded, keeping the old one: %s", locale, e
+                )
+                # не повторяем ошибку на каждом опросе, ждём следующего сохранения
+                self._mtimes[locale] = mtime
+                continue
+            fresh[locale] = data
+            mtimes[locale] = mtime
+        if not fresh:
+            return []
+        cache = {**self._cache, **fresh}
+        default = cache.get(self.default, {})
+        try:
+            bundles = {
+                locale: self._compile_bundle(default, data, locale)
+                for locale, data in cache.items()
+            }
+        except Exception:
+            logger.exception("Locale bundles not recompiled, keeping the old ones")
+            return []
+        # подменяем всё разом; закэшированные tr/trn держат ссылки на старые бандлы
+        self._cache, self._bundles, self._tr, self._trn = cache, bundles, {}, {}
+        self._mtimes.update(mtimes)
+        logger.info("Reloaded locales: %s", ", ".join(sorted(fresh)))
+        return sorted(fresh)
+
+    def _check_placeholders(self, locale: str, data: Dict[str, Any]) -> None:
+        previous = self._cache.get(locale, {})
+        added = []
+        for key, val in data.items():
+            fields = _placeholders(val)
+            if key in previous:
+                extra = fields - _placeholders(previous[key])
+                if extra:
+                    added.append(f"{key}: {{{', '.join(sorted(extra))}}}")
+        if added:
+            raise ValueError("new placeholders in " + "; ".join(added))
+
     def normalize(self, locale: Optional[str]) -> str:
         if not locale:
             return self.default
@@ -74,70 +294,83 @@ class Translator:
 
     def for_locale(self, locale: Optional[str]) -> Callable[[str], str]:
         loc = self.normalize(locale)
+        tr = self._tr.get(loc)
+        if tr is None:
+            bundle = self._bundle(loc)
 
-        def tr(key: str, **vars: Any) -> str:
-            return self.translate(key, loc, **vars)
+            def tr(key: str, **vars: Any) -> str:
+                entry = bundle.get(key)
+                if entry is None:
+                    return f"[{key}]"
+                if entry.__class__ is _PluralEntry:
+                    entry = entry.default
+                return entry.render(vars)
 
+            self._tr[loc] = tr
         return tr
 
     def for_locale_plural(self, locale: Optional[str]) -> Callable[[str, int], str]:
         loc = self.normalize(locale)
+        trn = self._trn.get(loc)
+        if trn is None:
 
-        def trn(key: str, count: int, **vars: Any) -> str:
-            return self.translate_plural(key, count, loc, **vars)
+            def trn(key: str, count: int, **vars: Any) -> str:
+                return self.translate_plural(key, count, loc, **vars)
 
+            self._trn[loc] = trn
         return trn
 
     def translate(self, key: str, locale: Optional[str], **vars: Any) -> str:
-        loc = self.normalize(locale)
-        val = self._resolve(key, loc)
-        if val is None:
+        entry = self._bundle(self.normalize(locale)).get(key)
+        if entry is None:
             # падать из-за пропущенного перевода — удовольствие для мазохистов
             return f"[{key}]"
-        if isinstance(val, dict):
-            # если по ключу лежит объект для плюрализации — берём "other"
-            val = (
-                val.get("other")
-                or val.get("many")
-                or val.get("one")
-                or next(iter(val.values()))
-            )
-        try:
-            return str(val).format_map(_SafeDict(vars))
-        except Exception:
-            return str(val)
+        if isinstance(entry, _PluralEntry):
+            entry = entry.default
+        return entry.render(vars)
 
     def translate_plural(
         self, key: str, count: int, locale: Optional[str], **vars: Any
     ) -> str:
         loc = self.normalize(locale)
-        bundle = self._resolve(key, loc)
-        if not isinstance(bundle, dict):
+        entry = self._bundle(loc).get(key)
+        if not isinstance(entry, _PluralEntry):
             # если разработчик забыл оформить plural-ключ, отдадим обычный translate
             return self.translate(key, loc, **vars)
-        form = self._plural_form(loc, count)
-        val = (
-            bundle.get(form)
-            or bundle.get("other")
-            or bundle.get("many")
-            or bundle.get("one")
-        )
-        try:
-            return str(val).format_map(_SafeDict({"count": count, **vars}))
-        except Exception:
-            return str(val)
+        template = entry.pick(self._plural_form(loc, count))
+        if template is None:
+            return "None"
+        return template.render({"count": count, **vars})
 
     def _plural_form(self, locale: str, n: int) -> str:
-        return _russian_plural(n) if locale == "russ" else _english_plural(n)
-
-    def _resolve(self, key: str, locale: str) -> Any:
-        # 1) локаль пользователя
-        d = self._load(locale)
-        if key in d:
-            return d[key]
-        # 2) дефолтная локаль
-        if locale != self.default:
-            base = self._load(self.default)
-            if key in base:
-                return base[key]
-        return None
+        return plural_rule(locale)(n)
+
+    def self_test(self) -> list[str]:
+        """
+        Checks every key of every compiled bundle: plural keys must have an
+        explicit form for each plural category of the locale, and every
+        template must render (plural forms with a sample count).
+
+        :return: List of problems (empty if everything is fine).
+        """
+        self.compile()
+        problems = []
+        for locale, bundle in self._bundles.items():
+            samples = sample_counts(locale)
+            for key, entry in bundle.items():
+                if not isinstance(entry, _PluralEntry):
+                    try:
+                        entry.check({})
+                    except Exception as e:
+                        problems.append(f"{locale}:{key} {e!r}")
+                    continue
+                missing = [c for c in plural_categories(locale) if c not in entry.forms]
+                if missing:
+                    problems.append(f"{locale}:{key} missing forms {missing}")
+                for category, count in samples.items():
+                    template = entry.pick(category)
+                    try:
+                        template.check({"count": count})
+                    except Exception as e:
+                        problems.append(f"{locale}:{key} [{category}] {e!r}")
+        return problems
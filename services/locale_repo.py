@@ -1,8 +1,13 @@
 from __future__ import annotations
 
-from typing import Optional
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from redis.exceptions import RedisError
 
 from database.models import User, UserLocale
+from services.cache_bus import publish_invalidation
 
 
 class LocaleRepo:
@@ -16,3 +21,104 @@ class LocaleRepo:
         # гарантируем наличие User (если регистрируешь пользователей отдельно — можешь убрать это)
         await User.get_or_create(id=user_id, defaults={"full_name": "", "address": ""})
         await UserLocale.update_or_create(defaults={"locale": locale}, user_id=user_id)
+
+
+class CachedLocaleRepo(LocaleRepo):
+    """
+    LocaleRepo with a bounded in-process TTL/LRU cache and an optional
+    Redis second tier. Users without a saved locale are cached too,
+    so a locale lookup costs at most one SQL query per TTL.
+
+    :param max_size: Maximum number of users kept in memory.
+    :param ttl: Lifetime of a cached value in seconds.
+    :param redis: Optional redis.asyncio client (e.g. RedisStorage.redis).
+    :param redis_ttl: Lifetime of a value in Redis in seconds.
+    """
+
+    REDIS_KEY = "locale:{user_id}"
+
+    def __init__(
+        self,
+        max_size: int = 10_000,
+        ttl: float = 300,
+        redis=None,
+        redis_ttl: int = 86_400,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.redis = redis
+        self.redis_ttl = redis_ttl
+        self._cache: OrderedDict[int, Tuple[float, Optional[str]]] = OrderedDict()
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    def _remember(self, user_id: int, locale: Optional[str]) -> None:
+        self._cache[user_id] = (time.monotonic() + self.ttl, locale)
+        self._cache.move_to_end(user_id)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    async def _redis_call(self, method: str, *args, **kwargs):
+        # Redis — только ускоритель: при его недоступности идём в БД
+        if self.redis is None:
+            return None
+        try:
+            return await getattr(self.redis, method)(*args, **kwargs)
+        except (RedisError, OSError):
+            return None
+
+    async def get(self, user_id: int) -> Optional[str]:
+        cached = self._cache.get(user_id)
+        if cached is not None:
+            expires_at, locale = cached
+            if expires_at > time.monotonic():
+                self._cache.move_to_end(user_id)
+                self.hits += 1
+                return locale
+            del self._cache[user_id]
+
+        key = self.REDIS_KEY.format(user_id=user_id)
+        value = await self._redis_call("get", key)
+        if value is not None:
+            # пустая строка — пользователь без сохранённой локали
+            locale = (value.decode() if isinstance(value, bytes) else value) or None
+            self.redis_hits += 1
+            self._remember(user_id, locale)
+            return locale
+
+        self.misses += 1
+        locale = await super().get(user_id)
+        self._remember(user_id, locale)
+        await self._redis_call("set", key, locale or "", ex=self.redis_ttl)
+        return locale
+
+    async def set(self, user_id: int, locale: str) -> None:
+        await super().set(user_id, locale)
+        self._remember(user_id, locale)
+        # сначала пишем в Redis, иначе соседний процесс может перечитать старое значение
+        await self._redis_call(
+            "set", self.REDIS_KEY.format(user_id=user_id), locale, ex=self.redis_ttl
+        )
+        publish_invalidation("locale", str(user_id))
+
+    def invalidate(self, user_id: int) -> None:
+        """
+        Drops a user from the in-process cache.
+        """
+        self._cache.pop(user_id, None)
+
+    def stats(self) -> dict:
+        """
+        Returns cache counters: hits, redis_hits, misses, size and hit_rate.
+        """
+        total = self.hits + self.redis_hits + self.misses
+        return {
+            "hits": self.hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "size": len(self._cache),
+            "hit_rate": (
+                round((self.hits + self.redis_hits) / total, 3) if total else 0.0
+            ),
+        }
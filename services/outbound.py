@@ -0,0 +1,357 @@
+"""
+Outbound Telegram requests with rate limiting.
+
+The sender is a request middleware of the bot session, so every API call
+of this process goes through it: handler replies (message.answer,
+edit_text, callback.answer...), notifications and broadcasts alike.
+Requests are queued in priority lanes and sent by one dispatcher task that
+respects a global token bucket (≈30 req/s) and a per-chat bucket (≈1 msg/s
+for methods that create messages). A chat that is not ready does not block
+other chats. TelegramRetryAfter pauses only the affected chat and the
+request is retried.
+
+Handler calls go to the CUSTOMER lane; submit() picks the lane explicitly.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, Deque, Dict, Optional
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import GetUpdates, SendChatAction, TelegramMethod
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """
+    Lanes in the order they are served.
+    """
+
+    CUSTOMER = 0
+    ADMIN = 1
+    BULK = 2
+
+
+# полоса запросов текущей задачи; submit() задаёт её для своего запроса
+_lane: ContextVar[Priority] = ContextVar("outbound_lane", default=Priority.CUSTOMER)
+# long polling держит соединение до 30 с — в очередь его не ставим
+BYPASS_METHODS = (GetUpdates,)
+
+
+class TokenBucket:
+    """
+    :param rate: Tokens added per second.
+    :param capacity: Maximum burst.
+    """
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def ready_in(self, now: float) -> float:
+        """
+        Returns seconds until a token is available (0 — right now).
+        """
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now: float) -> None:
+        self._refill(now)
+        self.tokens -= 1
+
+    def block(self, seconds: float, now: float) -> None:
+        """
+        Makes the bucket empty for the next `seconds` (retry_after).
+        """
+        self._refill(now)
+        self.tokens = min(self.tokens, 0) - seconds * self.rate
+
+    def paused_for(self, now: float) -> float:
+        """
+        Returns seconds until the retry_after pause ends (0 — not paused).
+        """
+        self._refill(now)
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    @property
+    def full(self) -> bool:
+        return self.tokens >= self.capacity
+
+
+def _creates_message(method: TelegramMethod) -> bool:
+    name = type(method).__name__
+    return name.startswith(("Send", "Copy", "Forward")) and not isinstance(
+        method, SendChatAction
+    )
+
+
+class _Job:
+    __slots__ = (
+        "make_request",
+        "bot",
+        "method",
+        "priority",
+        "chat_id",
+        "limited",
+        "future",
+        "enqueued_at",
+        "attempts",
+    )
+
+    def __init__(
+        self,
+        make_request: NextRequestMiddlewareType,
+        bot: Bot,
+        method: TelegramMethod,
+        priority: Priority,
+        future: asyncio.Future,
+    ):
+        self.make_request = make_request
+        self.bot = bot
+        self.method = method
+        self.priority = priority
+        self.chat_id = getattr(method, "chat_id", None)
+        # лимит чата (1 сообщение/с) тратят только новые сообщения;
+        # правки, удаления и т.п. лишь ждут окончания паузы retry_after
+        self.limited = self.chat_id is not None and _creates_message(method)
+        self.future = future
+        self.enqueued_at = time.monotonic()
+        self.attempts = 0
+
+
+class OutboundSender(BaseRequestMiddleware):
+    """
+    :param global_rate: Requests per second for the whole bot (this process).
+    :param chat_rate: Requests per second for one chat.
+    :param max_in_flight: Concurrent HTTP requests.
+    :param max_retries: Attempts after TelegramRetryAfter before giving up.
+
+    Register it with configure(); until run() is started (and after it stops)
+    requests bypass the queue.
+    """
+
+    # сколько заданий просматривать в полосе в поиске готового чата
+    SCAN_LIMIT = 200
+
+    def __init__(
+        self,
+        global_rate: float = 30,
+        chat_rate: float = 1,
+        max_in_flight: int = 30,
+        max_retries: int = 5,
+    ):
+        self.bot: Optional[Bot] = None
+        self.global_bucket = TokenBucket(global_rate, global_rate)
+        self.chat_rate = chat_rate
+        self.max_retries = max_retries
+        self._chats: Dict[Any, TokenBucket] = {}
+        self._lanes: Dict[Priority, Deque[_Job]] = {p: deque() for p in Priority}
+        self._wake = asyncio.Event()
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._tasks = set()
+        self._running = False
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.bypassed = 0
+
+    def configure(
+        self, bot: Bot, global_rate: float = None, chat_rate: float = None
+    ) -> None:
+        """
+        Sets the bot, registers the sender as its session request middleware
+        and, optionally, overrides the limits.
+        """
+        self.bot = bot
+        if self not in bot.session.middleware:
+            bot.session.middleware(self)
+        if global_rate:
+            self.global_bucket = TokenBucket(global_rate, global_rate)
+        if chat_rate:
+            self.chat_rate = chat_rate
+
+    def submit(
+        self, method: TelegramMethod, priority: Priority = Priority.CUSTOMER
+    ) -> asyncio.Future:
+        """
+        Sends a request in the given lane. The returned future resolves
+        with the API result or the final exception.
+        """
+        return asyncio.ensure_future(self._call(method, priority))
+
+    async def _call(self, method: TelegramMethod, priority: Priority) -> Any:
+        # своя задача — своя копия контекста, полоса не утечёт к вызывающему
+        _lane.set(priority)
+        return await self.bot(method)
+
+    async def __call__(
+        self, make_request: NextRequestMiddlewareType, bot: Bot, method: TelegramMethod
+    ) -> Any:
+        if not self._running or isinstance(method, BYPASS_METHODS):
+            self.bypassed += 1
+            return await make_request(bot, method)
+        future = asyncio.get_running_loop().create_future()
+        priority = _lane.get()
+        self._lanes[priority].append(_Job(make_request, bot, method, priority, future))
+        self._wake.set()
+        return await future
+
+    def submit_nowait(
+        self, method: TelegramMethod, priority: Priority = Priority.CUSTOMER
+    ) -> asyncio.Future:
+        """
+        Fire-and-forget variant of submit(): failures are logged.
+        """
+        future = self.submit(method, priority)
+        future.add_done_callback(self._log_failure)
+        return future
+
+    @staticmethod
+    def _log_failure(future: asyncio.Future) -> None:
+        if not future.cancelled() and future.exception():
+            logger.warning("Outbound request failed: %r", future.exception())
+
+    def _chat_bucket(self, chat_id) -> TokenBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            if len(self._chats) > 10_000:
+                # выкидываем полностью восстановившиеся корзины
+                self._chats = {c: b for c, b in self._chats.items() if not b.full}
+            bucket = self._chats[chat_id] = TokenBucket(self.chat_rate, 1)
+        return bucket
+
+    def _pick(self, now: float):
+        """
+        Returns (lane, job, 0) for the first job whose chat is ready,
+        or (None, None, wait) with the time until one may be ready.
+        """
+        wait = None
+        for lane in self._lanes.values():
+            for i, job in enumerate(lane):
+                if i >= self.SCAN_LIMIT:
+                    break
+                delay = self._chat_delay(job, now)
+                if delay == 0:
+                    return lane, job, 0.0
+                wait = delay if wait is None else min(wait, delay)
+        return None, None, wait
+
+    def _chat_delay(self, job: _Job, now: float) -> float:
+        if job.chat_id is None:
+            return 0.0
+        bucket = self._chat_bucket(job.chat_id)
+        return bucket.ready_in(now) if job.limited else bucket.paused_for(now)
+
+    async def run(self) -> None:
+        """
+        Background task: sends queued requests within the rate limits.
+        """
+        self._running = True
+        try:
+            await self._dispatch()
+        finally:
+            self._running = False
+            # процесс останавливается: ждущим запросам больше некому ответить
+            for lane in self._lanes.values():
+                while lane:
+                    lane.popleft().future.cancel()
+
+    async def _dispatch(self) -> None:
+        while True:
+            now = time.monotonic()
+            lane, job, wait = self._pick(now)
+            if job is None:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            global_wait = self.global_bucket.ready_in(now)
+            if global_wait:
+                # после паузы выбираем заново: могло прийти более срочное
+                await asyncio.sleep(global_wait)
+                continue
+            await self._in_flight.acquire()
+            lane.remove(job)
+            now = time.monotonic()
+            self.global_bucket.take(now)
+            if job.limited:
+                self._chat_bucket(job.chat_id).take(now)
+            task = asyncio.create_task(self._execute(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _execute(self, job: _Job) -> None:
+        try:
+            started = time.monotonic()
+            result = await job.make_request(job.bot, job.method)
+        except TelegramRetryAfter as e:
+            if job.chat_id is None:
+                self.global_bucket.block(e.retry_after, time.monotonic())
+            else:
+                self._chat_bucket(job.chat_id).block(e.retry_after, time.monotonic())
+            job.attempts += 1
+            if job.attempts <= self.max_retries:
+                self.retried += 1
+                # возвращаем в начало своей полосы, чат пропустится до конца паузы
+                self._lanes[job.priority].appendleft(job)
+                self._wake.set()
+            else:
+                self._fail(job, e)
+        except Exception as e:
+            self._fail(job, e)
+        else:
+            wait = started - job.enqueued_at
+            self.sent += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+            if not job.future.done():
+                job.future.set_result(result)
+        finally:
+            self._in_flight.release()
+
+    def _fail(self, job: _Job, error: Exception) -> None:
+        self.failed += 1
+        if not job.future.done():
+            job.future.set_exception(error)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Metrics: queue depth per lane, sent/failed/retried counters (all API
+        calls of the process), requests that bypassed the queue, average and
+        maximum time spent in the queue (seconds).
+        """
+        return {
+            "queued": {p.name.lower(): len(lane) for p, lane in self._lanes.items()},
+            "in_flight": len(self._tasks),
+            "sent": self.sent,
+            "failed": self.failed,
+            "retried": self.retried,
+            "bypassed": self.bypassed,
+            "wait_avg": round(self.wait_total / self.sent, 3) if self.sent else 0.0,
+            "wait_max": round(self.wait_max, 3),
+        }
+
+
+outbound = OutboundSender()
@@ -0,0 +1,222 @@
+"""
+In-memory search index over the active catalog for customer search.
+
+The index is built from the catalog snapshot and synced incrementally:
+after an admin change only products whose name or description changed
+(or that appeared/disappeared) are re-indexed. Lookups never touch the
+database.
+
+Two structures are kept:
+- word prefix -> product IDs (names and descriptions), used for the main
+  "every word is a prefix of some word of the product" match;
+- trigram -> product IDs, used as a fallback for typos and word fragments.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+from database.models import Product
+from services.catalog_cache import CatalogSnapshot, get_catalog
+
+# Длиннее префиксы не индексируем: дальше слово отсекается сравнением на лету
+MAX_PREFIX = 12
+# Доля совпавших триграмм запроса, с которой товар считается похожим
+TRIGRAM_THRESHOLD = 0.5
+# Не больше стольких результатов на один запрос
+MAX_RESULTS = 200
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def normalize(text: str) -> str:
+    return text.lower().replace("ё", "е")
+
+
+def words(text: str) -> List[str]:
+    return _WORD_RE.findall(normalize(text))
+
+
+def trigrams(text: str) -> Set[str]:
+    result = set()
+    for word in words(text):
+        padded = f" {word} "
+        result.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+class _Entry:
+    __slots__ = ("key", "name", "name_words", "prefixes", "trigrams")
+
+    def __init__(self, product: Product):
+        self.key = (product.name, product.description)
+        self.name = normalize(product.name)
+        self.name_words = words(product.name)
+        all_words = self.name_words + words(product.description or "")
+        self.prefixes = {
+            word[:n]
+            for word in all_words
+            for n in range(1, min(len(word), MAX_PREFIX) + 1)
+        }
+        self.trigrams = trigrams(f"{product.name} {product.description or ''}")
+
+
+class ProductIndex:
+    """
+    :param cache_size: Number of recent queries whose ranked results are kept
+        for paging (inline mode asks for the next page with an offset).
+    """
+
+    def __init__(self, cache_size: int = 256):
+        self.version = -1
+        self.cache_size = cache_size
+        self._entries: Dict[int, _Entry] = {}
+        self._prefix: Dict[str, Set[int]] = {}
+        self._trigram: Dict[str, Set[int]] = {}
+        self._products: Dict[int, Product] = {}
+        self._results: "OrderedDict[str, List[int]]" = OrderedDict()
+
+    def sync(self, snapshot: CatalogSnapshot) -> int:
+        """
+        Brings the index up to date with a catalog snapshot.
+        :return: Number of re-indexed products.
+        """
+        if snapshot.version == self.version:
+            return 0
+        changed = 0
+        for product_id in self._entries.keys() - snapshot.products_by_id.keys():
+            self._remove(product_id)
+            changed += 1
+        for product_id, product in snapshot.products_by_id.items():
+            entry = self._entries.get(product_id)
+            if entry is None or entry.key != (product.name, product.description):
+                if entry is not None:
+                    self._remove(product_id)
+                self._add(product)
+                changed += 1
+        # цена/остаток могли поменяться без переиндексации — объекты берём свежие
+        self._products = dict(snapshot.products_by_id)
+        self._results.clear()
+        self.version = snapshot.version
+        return changed
+
+    def _add(self, product: Product) -> None:
+        entry = _Entry(product)
+        self._entries[product.id] = entry
+        for prefix in entry.prefixes:
+            self._prefix.setdefault(prefix, set()).add(product.id)
+        for gram in entry.trigrams:
+            self._trigram.setdefault(gram, set()).add(product.id)
+
+    def _remove(self, product_id: int) -> None:
+        entry = self._entries.pop(product_id)
+        for index, keys in (
+            (self._prefix, entry.prefixes),
+            (self._trigram, entry.trigrams),
+        ):
+            for key in keys:
+                ids = index.get(key)
+                if ids is not None:
+                    ids.discard(product_id)
+                    if not ids:
+                        del index[key]
+
+    def _match_prefix(self, terms: List[str]) -> Set[int]:
+        found: Optional[Set[int]] = None
+        for term in sorted(terms, key=len, reverse=True):
+            ids = self._prefix.get(term[:MAX_PREFIX], set())
+            if len(term) > MAX_PREFIX:
+                ids = {
+                    i
+                    for i in ids
+                    if any(w.startswith(term) for w in self._all_words(i))
+                }
+            found = ids if found is None else found & ids
+            if not found:
+                return set()
+        return found or set()
+
+    def _all_words(self, product_id: int) -> List[str]:
+        product = self._products[product_id]
+        return words(f"{product.name} {product.description or ''}")
+
+    def _rank(self, ids: Set[int], terms: List[str], query: str) -> List[int]:
+        def key(product_id: int) -> tuple:
+            entry = self._entries[product_id]
+            in_name = sum(
+                any(w.startswith(term) for w in entry.name_words) for term in terms
+            )
+            return (
+                not entry.name.startswith(query),
+                -in_name,
+                len(entry.name),
+                -product_id,
+            )
+
+        return sorted(ids, key=key)
+
+    def _fuzzy(self, query: str) -> List[int]:
+        grams = trigrams(query)
+        if not grams:
+            return []
+        scores: Dict[int, int] = {}
+        for gram in grams:
+            for product_id in self._trigram.get(gram, ()):
+                scores[product_id] = scores.get(product_id, 0) + 1
+        need = len(grams) * TRIGRAM_THRESHOLD
+        matched = [(s, i) for i, s in scores.items() if s >= need]
+        matched.sort(key=lambda item: (-item[0], -item[1]))
+        return [product_id for _, product_id in matched]
+
+    def search(self, query: str) -> List[int]:
+        """
+        Returns ranked product IDs for a query (at most MAX_RESULTS).
+        Products whose name starts with the query go first, then products
+        with more query words in the name; typo fallback is used when
+        nothing matches by prefix.
+        """
+        query = normalize(query.strip())
+        cached = self._results.get(query)
+        if cached is not None:
+            self._results.move_to_end(query)
+            return cached
+        terms = words(query)
+        if not terms:
+            return []
+        ids = self._match_prefix(terms)
+        result = self._rank(ids, terms, query) if ids else self._fuzzy(query)
+        result = result[:MAX_RESULTS]
+        self._results[query] = result
+        if len(self._results) > self.cache_size:
+            self._results.popitem(last=False)
+        return result
+
+    def page(
+        self, query: str, offset: int, limit: int
+    ) -> Tuple[List[Product], Optional[int], int]:
+        """
+        :return: Products of the page, offset of the next page (None on the
+            last page) and the total number of results.
+        """
+        ids = self.search(query)
+        chunk = [self._products[i] for i in ids[offset : offset + limit]]
+        next_offset = offset + limit if offset + limit < len(ids) else None
+        return chunk, next_offset, len(ids)
+
+
+product_index = ProductIndex()
+
+
+async def search_catalog(
+    query: str, offset: int = 0, limit: int = 10
+) -> Tuple[List[Product], Optional[int], int]:
+    """
+    Searches active products, syncing the index with the catalog first.
+    :return: Products of the page, next offset (None if there is no more)
+        and the total number of results.
+    """
+    snapshot = await get_catalog()
+    product_index.sync(snapshot)
+    return product_index.page(query, offset, limit)
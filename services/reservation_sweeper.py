@@ -0,0 +1,22 @@
+import asyncio
+import logging
+
+from database.crud import release_expired_reservations
+
+logger = logging.getLogger(__name__)
+
+
+async def run_reservation_sweeper(interval: float = 30) -> None:
+    """
+    Background task: periodically returns the stock of expired reservations.
+
+    :param interval: Pause between sweeps in seconds.
+    """
+    while True:
+        try:
+            released = await release_expired_reservations()
+            if released:
+                logger.info("Released %s expired stock reservations", released)
+        except Exception:
+            logger.exception("Failed to release expired stock reservations")
+        await asyncio.sleep(interval)
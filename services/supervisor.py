@@ -0,0 +1,71 @@
+import logging
+import multiprocessing
+import signal
+import time
+from multiprocessing.connection import wait
+from typing import Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+def run_supervisor(
+    target: Callable[[int], None],
+    workers: int,
+    restart_delay: float = 1,
+    stop_timeout: float = 30,
+) -> None:
+    """
+    Runs `workers` copies of target(worker_id) in separate processes and
+    restarts the ones that die. On SIGINT/SIGTERM the workers get SIGTERM and
+    are given stop_timeout seconds to shut down gracefully, then killed.
+
+    :param target: Picklable function (module level) that runs one worker.
+    :param workers: Number of worker processes.
+    """
+    # spawn: у каждого воркера свой event loop, бот и пул соединений с БД
+    ctx = multiprocessing.get_context("spawn")
+    processes: Dict[int, multiprocessing.Process] = {}
+    stopping = False
+
+    def start(worker_id: int) -> None:
+        process = ctx.Process(
+            target=target, args=(worker_id,), name=f"bot-worker-{worker_id}"
+        )
+        process.start()
+        processes[worker_id] = process
+        logger.info("Started worker %s (pid %s)", worker_id, process.pid)
+
+    def stop(signum, frame) -> None:
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    for worker_id in range(workers):
+        start(worker_id)
+
+    while not stopping:
+        wait([p.sentinel for p in processes.values()], timeout=restart_delay)
+        for worker_id, process in list(processes.items()):
+            if stopping or process.is_alive():
+                continue
+            logger.warning(
+                "Worker %s exited with code %s, restarting",
+                worker_id,
+                process.exitcode,
+            )
+            # не перезапускаем в цикле без паузы, если воркер падает сразу
+            time.sleep(restart_delay)
+            if not stopping:
+                start(worker_id)
+
+    logger.info("Stopping %s workers", len(processes))
+    for process in processes.values():
+        if process.is_alive():
+            process.terminate()
+    for process in processes.values():
+        process.join(stop_timeout)
+        if process.is_alive():
+            logger.warning("Worker %s did not stop in time, killing", process.name)
+            process.kill()
+            process.join()
@@ -0,0 +1,315 @@
+"""
+Optional Redis Streams queue between the webhook receiver and the handlers.
+
+The receiver only validates the request and appends the raw update to one of
+N partition streams (chosen by chat ID, so one chat always lands in the same
+stream). A partition is consumed by the single process holding its Redis
+lease, on any number of hosts: the owner reads it with XREADGROUP, feeds the
+updates to the dispatcher one by one (per-chat ordering) and XACKs them after
+processing. Unacknowledged updates of a dead owner are taken over with
+XAUTOCLAIM by the next one (at-least-once), a full partition makes the
+receiver answer 429 (backpressure).
+"""
+
+import asyncio
+import json
+import logging
+import os
+import secrets
+import socket
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+from aiogram import Bot, Dispatcher
+from aiogram.methods import TelegramMethod
+from aiohttp import web
+from redis.exceptions import RedisError, ResponseError
+
+logger = logging.getLogger(__name__)
+
+
+def update_chat_id(update: Dict[str, Any]) -> int:
+    """
+    Returns the chat (or user) ID an update belongs to, 0 if there is none.
+    """
+    for key, event in update.items():
+        if key == "update_id" or not isinstance(event, dict):
+            continue
+        chat = event.get("chat") or (event.get("message") or {}).get("chat")
+        if chat:
+            return chat["id"]
+        user = event.get("from") or event.get("user")
+        if user:
+            return user["id"]
+    return 0
+
+
+class UpdateQueue:
+    """
+    :param redis: redis.asyncio client.
+    :param partitions: Number of partition streams.
+    :param max_len: Partition length at which the receiver starts refusing updates.
+    :param lease: Partition lease in seconds, the owner renews it every lease / 3.
+    """
+
+    # продлеваем и отпускаем аренду, только если она всё ещё наша
+    _RENEW = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("pexpire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+    _RELEASE = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+    def __init__(
+        self,
+        redis,
+        partitions: int = 16,
+        max_len: int = 10_000,
+        prefix: str = "demo_shop:updates",
+        group: str = "handlers",
+        lease: float = 15,
+    ):
+        self.redis = redis
+        self.partitions = partitions
+        self.max_len = max_len
+        self.prefix = prefix
+        self.group = group
+        self.lease = lease
+        # имя владельца аренды и консьюмера в группе, уникальное для процесса
+        self.consumer = f"{socket.gethostname()}:{os.getpid()}:{secrets.token_hex(4)}"
+
+    def stream(self, partition: int) -> str:
+        return f"{self.prefix}:{partition}"
+
+    def owner_key(self, partition: int) -> str:
+        return f"{self.stream(partition)}:owner"
+
+    def partition(self, chat_id: int) -> int:
+        return chat_id % self.partitions
+
+    async def push(self, update: Dict[str, Any]) -> bool:
+        """
+        Appends an update to its partition.
+
+        :return: False if the partition is full and the update was not queued.
+        """
+        stream = self.stream(self.partition(update_chat_id(update)))
+        if await self.redis.xlen(stream) >= self.max_len:
+            return False
+        await self.redis.xadd(stream, {"update": json.dumps(update)})
+        return True
+
+    async def consume(
+        self, dp: Dispatcher, bot: Bot, preferred: Iterable[int] = (), **kwargs
+    ) -> None:
+        """
+        Background task: takes partition leases and consumes the owned
+        partitions concurrently, each partition strictly in order.
+
+        Preferred partitions are taken as soon as they are free, the others
+        only after they have stayed free for a whole lease (their owner is gone
+        and nobody who prefers them showed up). A partition whose lease could
+        not be renewed in time is dropped, so a chat is never handled by two
+        processes at once.
+
+        :param preferred: Partitions this process should normally own.
+        """
+
+        def start(partition: int) -> asyncio.Task:
+            return asyncio.create_task(self._consume(dp, bot, partition, **kwargs))
+
+        preferred = set(preferred)
+        owned: Dict[int, asyncio.Task] = {}
+        renewed: Dict[int, float] = {}
+        free_since: Dict[int, float] = {}
+        try:
+            while True:
+                try:
+                    await self._renew(owned, renewed, start)
+                    await self._acquire(owned, renewed, free_since, preferred, start)
+                except (RedisError, OSError):
+                    logger.warning("Update queue: Redis error while leasing partitions")
+                # после двух неудачных продлений бросаем партицию до истечения аренды
+                deadline = time.monotonic() - self.lease * 2 / 3
+                for partition in [p for p in owned if renewed[p] < deadline]:
+                    logger.warning(
+                        "Update queue: lease of partition %s expired", partition
+                    )
+                    owned.pop(partition).cancel()
+                await asyncio.sleep(self.lease / 3)
+        finally:
+            for task in owned.values():
+                task.cancel()
+            await asyncio.gather(*owned.values(), return_exceptions=True)
+            await asyncio.gather(
+                *(self._release(p) for p in owned), return_exceptions=True
+            )
+
+    async def _renew(
+        self,
+        owned: Dict[int, asyncio.Task],
+        renewed: Dict[int, float],
+        start: Callable[[int], asyncio.Task],
+    ) -> None:
+        for partition, task in list(owned.items()):
+            key = self.owner_key(partition)
+            ttl = int(self.lease * 1000)
+            if not await self.redis.eval(self._RENEW, 1, key, self.consumer, ttl):
+                logger.warning(
+                    "Update queue: lost the lease of partition %s", partition
+                )
+                owned.pop(partition).cancel()
+                continue
+            renewed[partition] = time.monotonic()
+            if task.done():
+                # консьюмер упал с неожиданной ошибкой, аренда всё ещё наша
+                logger.error(
+                    "Update queue: consumer of partition %s crashed, restarting",
+                    partition,
+                    exc_info=task.exception(),
+                )
+                owned[partition] = start(partition)
+
+    async def _acquire(
+        self,
+        owned: Dict[int, asyncio.Task],
+        renewed: Dict[int, float],
+        free_since: Dict[int, float],
+        preferred: Set[int],
+        start: Callable[[int], asyncio.Task],
+    ) -> None:
+        now = time.monotonic()
+        for partition in range(self.partitions):
+            if partition in owned:
+                continue
+            key = self.owner_key(partition)
+            if partition not in preferred:
+                if await self.redis.exists(key):
+                    free_since.pop(partition, None)
+                    continue
+                if now - free_since.setdefault(partition, now) < self.lease:
+                    continue
+            ttl = int(self.lease * 1000)
+            if await self.redis.set(key, self.consumer, nx=True, px=ttl):
+                free_since.pop(partition, None)
+                renewed[partition] = now
+                owned[partition] = start(partition)
+                logger.info(
+                    "Update queue: partition %s taken by %s", partition, self.consumer
+                )
+
+    async def _release(self, partition: int) -> None:
+        await self.redis.eval(
+            self._RELEASE, 1, self.owner_key(partition), self.consumer
+        )
+
+    async def _adopt_pending(self, stream: str) -> None:
+        """
+        Claims the updates delivered to previous owners of the partition but
+        never acknowledged (they died mid-batch) and forgets those consumers.
+        """
+        start_id = "0-0"
+        while True:
+            response = await self.redis.xautoclaim(
+                stream,
+                self.group,
+                self.consumer,
+                min_idle_time=0,
+                start_id=start_id,
+                count=100,
+            )
+            start_id = response[0]
+            if start_id in (b"0-0", "0-0"):
+                break
+        for info in await self.redis.xinfo_consumers(stream, self.group):
+            name = info["name"]
+            if isinstance(name, bytes):
+                name = name.decode()
+            if name != self.consumer and not info["pending"]:
+                await self.redis.xgroup_delconsumer(stream, self.group, name)
+
+    async def _ensure_group(self, stream: str) -> None:
+        try:
+            await self.redis.xgroup_create(stream, self.group, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def _consume(
+        self,
+        dp: Dispatcher,
+        bot: Bot,
+        partition: int,
+        batch: int = 10,
+        block_ms: int = 5000,
+        retry_delay: float = 1,
+    ) -> None:
+        stream = self.stream(partition)
+        # сначала забираем и дочитываем то, что было выдано, но не подтверждено
+        last_id = "0"
+        adopted = False
+        while True:
+            try:
+                if not adopted:
+                    await self._ensure_group(stream)
+                    await self._adopt_pending(stream)
+                    adopted = True
+                response = await self.redis.xreadgroup(
+                    self.group,
+                    self.consumer,
+                    {stream: last_id},
+                    count=batch,
+                    block=block_ms if last_id == ">" else None,
+                )
+                entries = response[0][1] if response else []
+                if last_id == "0" and not entries:
+                    last_id = ">"
+                    continue
+                for message_id, fields in entries:
+                    await self._process(dp, bot, fields)
+                    await self.redis.xack(stream, self.group, message_id)
+                    await self.redis.xdel(stream, message_id)
+            except (RedisError, OSError):
+                logger.warning("Update queue %s: Redis error, retrying", stream)
+                last_id = "0"
+                adopted = False
+                await asyncio.sleep(retry_delay)
+
+    @staticmethod
+    async def _process(dp: Dispatcher, bot: Bot, fields: Dict) -> None:
+        raw = fields.get(b"update") or fields.get("update")
+        try:
+            update = json.loads(raw)
+            result = await dp.feed_raw_update(bot, update)
+            if isinstance(result, TelegramMethod):
+                await dp.silent_call_request(bot, result)
+        except Exception:
+            # сбойный апдейт подтверждаем, иначе он будет повторяться бесконечно
+            logger.exception("Failed to process queued update")
+
+
+class QueueRequestHandler:
+    """
+    Webhook endpoint that only checks the secret token and enqueues the update.
+    """
+
+    def __init__(self, queue: UpdateQueue, secret_token: Optional[str] = None):
+        self.queue = queue
+        self.secret_token = secret_token
+
+    async def __call__(self, request: web.Request) -> web.Response:
+        if self.secret_token and not secrets.compare_digest(
+            request.headers.get("X-Telegram-Bot-Api-Secret-Token", ""),
+            self.secret_token,
+        ):
+            return web.Response(body="Unauthorized", status=401)
+        if not await self.queue.push(await request.json()):
+            # Telegram повторит доставку позже
+            return web.Response(status=429, headers={"Retry-After": "1"})
+        return web.json_response({})
@@ -0,0 +1,100 @@
+import asyncio
+import logging
+from typing import Optional
+
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+
+from services.update_queue import QueueRequestHandler, UpdateQueue
+
+logger = logging.getLogger(__name__)
+
+
+class LimitedRequestHandler(SimpleRequestHandler):
+    """
+    Webhook handler that processes updates in background tasks, but not more
+    than `concurrency` at a time. When all slots are busy the HTTP response
+    is delayed, so Telegram (or the load balancer) backs off instead of the
+    process piling up unbounded tasks.
+
+    On shutdown the handler waits for updates still being processed (at most
+    shutdown_timeout seconds) before closing the bot session. Its close hook
+    runs before the dispatcher shutdown hooks, so handlers keep the database.
+    """
+
+    def __init__(
+        self,
+        *args,
+        concurrency: Optional[int] = None,
+        shutdown_timeout: float = 20,
+        **kwargs,
+    ):
+        super().__init__(*args, handle_in_background=True, **kwargs)
+        self._slots = asyncio.Semaphore(concurrency) if concurrency else None
+        self.shutdown_timeout = shutdown_timeout
+
+    async def close(self) -> None:
+        tasks = set(self._background_feed_update_tasks)
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=self.shutdown_timeout)
+            if pending:
+                logger.warning(
+                    "%s updates still processing at shutdown, cancelling", len(pending)
+                )
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+        await super().close()
+
+    async def _handle_request_background(
+        self, bot: Bot, request: web.Request
+    ) -> web.Response:
+        if self._slots is None:
+            return await super()._handle_request_background(bot, request)
+        await self._slots.acquire()
+        try:
+            update = await request.json(loads=bot.session.json_loads)
+        except Exception:
+            self._slots.release()
+            raise
+        task = asyncio.create_task(self._background_feed_update(bot, update))
+        self._background_feed_update_tasks.add(task)
+        task.add_done_callback(self._background_feed_update_tasks.discard)
+        task.add_done_callback(lambda _: self._slots.release())
+        return web.json_response({}, dumps=bot.session.json_dumps)
+
+
+def build_webhook_app(
+    dp: Dispatcher,
+    bot: Bot,
+    path: str,
+    secret_token: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    queue: Optional[UpdateQueue] = None,
+) -> web.Application:
+    """
+    Builds an aiohttp application that receives updates on `path`.
+    Dispatcher startup/shutdown hooks are bound to the application lifecycle.
+
+    :param secret_token: Expected X-Telegram-Bot-Api-Secret-Token header value.
+    :param concurrency: Maximum number of updates processed at once (None — no limit).
+    :param queue: If set, updates are only pushed to the Redis queue
+        and processed by its consumers.
+    """
+    app = web.Application()
+    if queue is not None:
+        app.router.add_post(path, QueueRequestHandler(queue, secret_token))
+
+        async def close_session(_: web.Application) -> None:
+            # после on_shutdown: консьюмеры очереди к этому моменту остановлены
+            await bot.session.close()
+
+        app.on_cleanup.append(close_session)
+    else:
+        LimitedRequestHandler(
+            dispatcher=dp, bot=bot, secret_token=secret_token, concurrency=concurrency
+        ).register(app, path=path)
+    app.router.add_get("/health", lambda _: web.Response(text="ok"))
+    setup_application(app, dp, bot=bot)
+    return app